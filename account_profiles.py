@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hesap Profilleri - Türk Siyasi Lider Analiz Sistemi
+
+Hesap bazında lider bahsetme ve sentiment dağılımlarını çalıştırmalar
+arasında biriktiren SQLite deposu. Parti yetkilileri ve haber kaynakları
+gibi yüksek hacimli hesapların duruşu çoğunlukla neredeyse sabittir;
+yeterli geçmişi olan hesaplarda sınıflandırma veya sentiment çağrısı bu
+öncül (prior) ile kısa devre edilebilir.
+
+Profillere yalnızca LLM'den gelen etiketler yazılır; böylece kısa devre
+sonuçları kendi kendini besleyen bir döngü oluşturmaz. Öncülü olan hesapların
+satırlarından her k'da biri yine de LLM'e gönderilir (yeniden doğrulama);
+LLM öncülle çelişirse o hesabın öncülü düşürülür.
+
+Kullanım:
+python account_profiles.py report --db account_profiles.db --leader RTE --top 20
+"""
+
+import os
+import sys
+import time
+import zlib
+import sqlite3
+import argparse
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_DB_PATH = os.getenv('ACCOUNT_PROFILES_DB', 'account_profiles.db')
+
+SENTIMENT_FIELDS = {1: 'positive', 0: 'neutral', -1: 'negative'}
+
+# Tampondaki satır sayısı bu değere ulaşınca otomatik yazılır
+AUTO_FLUSH_ROWS = 200
+
+# Öncülü olan satırların 1/k'sı yeniden doğrulama için LLM'e gider
+DEFAULT_REVALIDATE_EVERY = 20
+
+# Bellekte tutulan en fazla hesap profili (en az yakın zamanda kullanılan atılır)
+DEFAULT_CACHE_SIZE = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    account TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS account_leaders (
+    account TEXT NOT NULL,
+    leader TEXT NOT NULL,
+    mentions INTEGER NOT NULL DEFAULT 0,
+    positive INTEGER NOT NULL DEFAULT 0,
+    neutral INTEGER NOT NULL DEFAULT 0,
+    negative INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (account, leader)
+);
+CREATE INDEX IF NOT EXISTS idx_account_leaders_leader ON account_leaders (leader, mentions DESC);
+CREATE INDEX IF NOT EXISTS idx_accounts_rows ON accounts (rows DESC);
+"""
+
+
+def _empty_profile() -> Dict:
+    return {'rows': 0, 'leaders': {}}
+
+
+def _empty_counts() -> Dict:
+    return {'mentions': 0, 'positive': 0, 'neutral': 0, 'negative': 0}
+
+
+class AccountProfileStore:
+    """
+    Hesap bazında lider/sentiment dağılımları
+
+    Okumalar sınırlı (LRU) bellek içi önbellekten yapılır (hesap başına bir
+    kez SQLite'tan yüklenir); yazmalar tamponlanıp tek transaction'da eklenir.
+
+    >>> import os, tempfile
+    >>> store = AccountProfileStore(os.path.join(tempfile.mkdtemp(), 'p.db'), min_rows=3, purity=0.75,
+    ...                             revalidate_every=0)
+    >>> for _ in range(3):
+    ...     store.record('@a', {'IS_RTE': 1, 'IS_EI': 0})
+    >>> store.prior_classification('@a', ['RTE', 'EI'])['IS_RTE']
+    1
+    >>> store.record('@a', {'IS_RTE': 0, 'IS_EI': 0})  # yeniden doğrulama öncülle çelişiyor
+    >>> store.prior_classification('@a', ['RTE', 'EI']) is None
+    True
+    >>> store.revalidation_stats()
+    {'revalidated': 1, 'dropped_priors': 1}
+    >>> store.cache_size = 2
+    >>> store.flush()
+    >>> for account in ('@x', '@y', '@z'):
+    ...     _ = store.get_profile(account)
+    >>> list(store._cache)
+    ['@y', '@z']
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, min_rows: int = 50,
+                 purity: float = 0.97, revalidate_every: int = DEFAULT_REVALIDATE_EVERY,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Depo başlatıcı
+
+        Args:
+            db_path: SQLite veritabanı dosya yolu
+            min_rows: Kısa devre için gereken minimum geçmiş satır/bahsetme sayısı
+            purity: Kısa devre için gereken baskın oran (0.5-1.0)
+            revalidate_every: Öncülü olan satırların kaçta biri LLM'e gönderilir (0 = hiçbiri)
+            cache_size: Bellekte tutulan en fazla hesap profili
+        """
+        self.db_path = db_path
+        self.min_rows = min_rows
+        self.purity = purity
+        self.revalidate_every = revalidate_every
+        self.cache_size = max(int(cache_size), 1)
+
+        self._lock = threading.Lock()
+        self._cache: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._pending: Dict[str, Dict] = {}
+        self._pending_rows = 0
+        # LLM'in çeliştiği öncüller: (hesap, '') sınıflandırma, (hesap, kod) sentiment
+        self._dropped: set = set()
+        self._revalidated = 0
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Autocommit modunda yeni bir bağlantı aç"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _load(self, account: str) -> Dict:
+        """Hesap profilini önbellekten veya veritabanından getir (lock altında çağrılır)"""
+        profile = self._cache.get(account)
+        if profile is not None:
+            self._cache.move_to_end(account)
+            return profile
+
+        profile = _empty_profile()
+        with self._connect() as conn:
+            row = conn.execute("SELECT rows FROM accounts WHERE account = ?", (account,)).fetchone()
+            if row:
+                profile['rows'] = row['rows']
+                for leader_row in conn.execute(
+                        "SELECT * FROM account_leaders WHERE account = ?", (account,)):
+                    profile['leaders'][leader_row['leader']] = {
+                        field: leader_row[field] for field in _empty_counts()
+                    }
+
+        self._cache[account] = profile
+        self._evict()
+        return profile
+
+    def _evict(self):
+        """
+        Önbellek sınırı aşıldıysa en eski profilleri at (lock altında çağrılır)
+
+        Yazılmamış güncellemesi olan hesaplar atılmaz; yeniden yüklendiklerinde
+        tampondaki sayılar kaybolurdu.
+        """
+        excess = len(self._cache) - self.cache_size
+        if excess <= 0:
+            return
+        for account in [account for account in self._cache if account not in self._pending][:excess]:
+            del self._cache[account]
+
+    def get_profile(self, account: str) -> Dict:
+        """
+        Hesabın birikmiş dağılımı
+
+        Returns:
+            {'rows', 'leaders': {kod: {mentions, positive, neutral, negative}}}
+        """
+        with self._lock:
+            profile = self._load(account)
+            return {'rows': profile['rows'],
+                    'leaders': {code: dict(c) for code, c in profile['leaders'].items()}}
+
+    def record(self, account: str, classification: Optional[Dict] = None,
+               sentiments: Optional[Dict[str, int]] = None):
+        """
+        LLM etiketlerini hesabın profiline ekle
+
+        Args:
+            account: Hesap adı
+            classification: IS_* etiketleri (None = sınıflandırma LLM'den gelmedi)
+            sentiments: Lider kodu -> LLM sentiment'i
+        """
+        if not account or (classification is None and not sentiments):
+            return
+
+        with self._lock:
+            profile = self._load(account)
+            self._check_priors(account, profile, classification, sentiments)
+            delta = self._pending.setdefault(account, _empty_profile())
+
+            targets = (profile, delta)
+            if classification is not None:
+                for target in targets:
+                    target['rows'] += 1
+                for key, value in classification.items():
+                    if key.startswith('IS_') and value == 1:
+                        for target in targets:
+                            target['leaders'].setdefault(key[3:], _empty_counts())['mentions'] += 1
+
+            for code, sentiment in (sentiments or {}).items():
+                field = SENTIMENT_FIELDS.get(sentiment)
+                if field:
+                    for target in targets:
+                        target['leaders'].setdefault(code, _empty_counts())[field] += 1
+
+            self._pending_rows += 1
+            should_flush = self._pending_rows >= AUTO_FLUSH_ROWS
+
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Tamponlanan güncellemeleri tek transaction'da yaz"""
+        with self._lock:
+            pending, self._pending, self._pending_rows = self._pending, {}, 0
+
+        if not pending:
+            return
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(
+                    "INSERT INTO accounts (account, rows, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(account) DO UPDATE SET rows = rows + excluded.rows, "
+                    "updated_at = excluded.updated_at",
+                    [(account, delta['rows'], now) for account, delta in pending.items()]
+                )
+                conn.executemany(
+                    "INSERT INTO account_leaders (account, leader, mentions, positive, neutral, negative) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(account, leader) DO UPDATE SET "
+                    "mentions = mentions + excluded.mentions, positive = positive + excluded.positive, "
+                    "neutral = neutral + excluded.neutral, negative = negative + excluded.negative",
+                    [(account, code, c['mentions'], c['positive'], c['neutral'], c['negative'])
+                     for account, delta in pending.items() for code, c in delta['leaders'].items()]
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+    def _check_priors(self, account: str, profile: Dict, classification: Optional[Dict],
+                      sentiments: Optional[Dict[str, int]]):
+        """LLM etiketi mevcut öncülle çelişiyorsa öncülü düşür (lock altında çağrılır)"""
+        if classification is not None and (account, '') not in self._dropped:
+            codes = [key[3:] for key in classification if key.startswith('IS_')]
+            prior = self._classification_prior(profile, codes)
+            if prior is not None:
+                self._revalidated += 1
+                if any(prior[f'IS_{code}'] != classification[f'IS_{code}'] for code in codes):
+                    self._dropped.add((account, ''))
+
+        for code, sentiment in (sentiments or {}).items():
+            if (account, code) in self._dropped:
+                continue
+            prior = self._sentiment_prior(profile, code)
+            if prior is not None:
+                self._revalidated += 1
+                if prior != sentiment:
+                    self._dropped.add((account, code))
+
+    def should_revalidate(self, account: str, text: str) -> bool:
+        """
+        Satır, öncül olsa bile yeniden doğrulama için LLM'e gitmeli mi
+
+        Seçim hesap ve metnin özetiyle yapılır; aynı satır için tekrarlanan
+        çağrılar (batch ön hazırlığı ve tekil işlem) aynı cevabı alır.
+
+        Args:
+            account: Hesap adı
+            text: Satırın (hazırlanmış) metni
+
+        Returns:
+            Satır yeniden doğrulanacaksa True
+        """
+        if self.revalidate_every <= 0:
+            return False
+        return zlib.crc32(f'{account}\x00{text}'.encode('utf-8')) % self.revalidate_every == 0
+
+    def _classification_prior(self, profile: Dict, leader_codes: Iterable[str]) -> Optional[Dict]:
+        rows = profile['rows']
+        if rows < self.min_rows:
+            return None
+
+        classification = {}
+        for code in leader_codes:
+            rate = profile['leaders'].get(code, _empty_counts())['mentions'] / rows
+            if rate >= self.purity:
+                classification[f'IS_{code}'] = 1
+            elif rate <= 1.0 - self.purity:
+                classification[f'IS_{code}'] = 0
+            else:
+                return None
+        return classification
+
+    def _sentiment_prior(self, profile: Dict, leader_code: str) -> Optional[int]:
+        counts = profile['leaders'].get(leader_code)
+        if not counts:
+            return None
+        total = counts['positive'] + counts['neutral'] + counts['negative']
+        if total < self.min_rows:
+            return None
+        for value, field in SENTIMENT_FIELDS.items():
+            if counts[field] / total >= self.purity:
+                return value
+        return None
+
+    def prior_classification(self, account: str, leader_codes: Iterable[str],
+                             text: Optional[str] = None) -> Optional[Dict]:
+        """
+        Hesabın bahsetme davranışı neredeyse sabitse sınıflandırma öncülü
+
+        Her lider için bahsetme oranı ≥ purity veya ≤ 1 - purity olmalıdır.
+
+        Args:
+            account: Hesap adı
+            leader_codes: Lider kodları
+            text: Satır metni (verilirse yeniden doğrulama örneklemesi uygulanır)
+
+        Returns:
+            IS_* sözlüğü veya None (öncül yeterince kesin değil, düşürülmüş
+            veya satır yeniden doğrulamaya seçilmiş)
+        """
+        if text is not None and self.should_revalidate(account, text):
+            return None
+
+        with self._lock:
+            if (account, '') in self._dropped:
+                return None
+            profile = self._load(account)
+            classification = self._classification_prior(profile, leader_codes)
+            rows = profile['rows']
+
+        if classification is None:
+            return None
+        classification['reasoning'] = f"Hesap öncülü ({rows} geçmiş kayıt)"
+        return classification
+
+    def prior_sentiment(self, account: str, leader_code: str, text: Optional[str] = None) -> Optional[int]:
+        """
+        Hesabın lidere karşı tutumu neredeyse sabitse sentiment öncülü
+
+        Args:
+            account: Hesap adı
+            leader_code: Lider kodu
+            text: Satır metni (verilirse yeniden doğrulama örneklemesi uygulanır)
+
+        Returns:
+            Baskın sentiment veya None
+        """
+        if text is not None and self.should_revalidate(account, text):
+            return None
+
+        with self._lock:
+            if (account, leader_code) in self._dropped:
+                return None
+            return self._sentiment_prior(self._load(account), leader_code)
+
+    def revalidation_stats(self) -> Dict:
+        """Öncülü olan hesaplarda LLM ile karşılaştırılan etiket ve düşürülen öncül sayısı"""
+        with self._lock:
+            return {'revalidated': self._revalidated, 'dropped_priors': len(self._dropped)}
+
+    def top_accounts(self, leader: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """
+        En yüksek hacimli hesapların özet dağılımları (indeks üzerinden)
+
+        Args:
+            leader: Lider kodu (None = toplam satıra göre sırala)
+            limit: Döndürülecek hesap sayısı
+
+        Returns:
+            Hesap satırları
+        """
+        self.flush()
+        with self._connect() as conn:
+            if leader:
+                rows = conn.execute(
+                    "SELECT l.*, a.rows FROM account_leaders l JOIN accounts a USING (account) "
+                    "WHERE l.leader = ? ORDER BY l.mentions DESC LIMIT ?", (leader, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT a.account, a.rows, l.leader, l.mentions, l.positive, l.neutral, l.negative "
+                    "FROM (SELECT * FROM accounts ORDER BY rows DESC LIMIT ?) a "
+                    "LEFT JOIN account_leaders l USING (account) ORDER BY a.rows DESC",
+                    (limit,)
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def main():
+    """Komut satırı arayüzü"""
+    parser = argparse.ArgumentParser(description='Hesap profilleri')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help=f'SQLite dosyası (default: {DEFAULT_DB_PATH})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    report = subparsers.add_parser('report', help='Hesap bazında özet dağılımlar')
+    report.add_argument('--leader', help='Lider kodu (ör. RTE); verilmezse en aktif hesaplar')
+    report.add_argument('--top', type=int, default=20, help='Gösterilecek satır (default: 20)')
+
+    args = parser.parse_args()
+
+    store = AccountProfileStore(args.db)
+    rows = store.top_accounts(args.leader, args.top)
+    if not rows:
+        print("Kayıt yok")
+        return
+
+    print(f"{'Hesap':<30} {'Kayıt':>7} {'Lider':<5} {'Bahs.':>6} {'Poz.':>5} {'Nötr':>5} {'Neg.':>5}")
+    for row in rows:
+        print(f"{row['account'][:30]:<30} {row['rows']:>7} {row.get('leader') or '-':<5} "
+              f"{row.get('mentions') or 0:>6} {row.get('positive') or 0:>5} "
+              f"{row.get('neutral') or 0:>5} {row.get('negative') or 0:>5}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+Akan Özet İstatistikler - Türk Siyasi Lider Analiz Sistemi
+
+Sonuçlar geldikçe lider bazında bahsetme ve sentiment sayaçlarını artımlı
+olarak güncelleyen hafif toplayıcılar. İş kuyruğu ve web arayüzü, tüm sonuç
+listesini yeniden taramadan kısmi özet gösterebilmek için bunları kullanır.
+Girdide zaman sütunu varsa TrendAggregator aynı sayaçları saatlik
+zaman dilimlerine ayırır; günlük seyir saatlik dilimlerden türetilir.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from leaders import DEFAULT_REGISTRY
+
+# Varsayılan lider kodu -> sentiment sütunu (analizörü import etmeden)
+SENTIMENT_COLUMNS = DEFAULT_REGISTRY.sentiment_columns
+
+SENTIMENT_LABELS = {1: 'positive', 0: 'neutral', -1: 'negative'}
+
+
+class LeaderAggregator:
+    """Lider bazında artımlı bahsetme/sentiment sayaçları"""
+
+    def __init__(self, leaders: Iterable[str] = SENTIMENT_COLUMNS, state: Optional[Dict] = None):
+        """
+        Toplayıcı başlatıcı
+
+        Args:
+            leaders: Lider kodları veya kod -> sentiment sütunu sözlüğü
+            state: Daha önce to_dict() ile alınmış durum (devam etmek için)
+        """
+        if isinstance(leaders, dict):
+            self.columns = dict(leaders)
+        else:
+            self.columns = {code: SENTIMENT_COLUMNS.get(code, f'{code}_SENTIMENT') for code in leaders}
+
+        self.rows = 0
+        self.leaders = {
+            code: {'mentions': 0, 'positive': 0, 'neutral': 0, 'negative': 0}
+            for code in leaders
+        }
+
+        if state:
+            self.rows = state.get('rows', 0)
+            for code, counts in state.get('leaders', {}).items():
+                if code in self.leaders:
+                    self.leaders[code].update(counts)
+
+    def add(self, result: Dict):
+        """Tek bir sonucu sayaçlara ekle"""
+        self.rows += 1
+        for code, counts in self.leaders.items():
+            if result.get(f'IS_{code}') != 1:
+                continue
+            counts['mentions'] += 1
+
+            label = SENTIMENT_LABELS.get(result.get(self.columns[code]))
+            if label:
+                counts[label] += 1
+
+    def add_many(self, results: Iterable[Dict]):
+        """Birden fazla sonucu sayaçlara ekle"""
+        for result in results:
+            self.add(result)
+
+    def to_dict(self) -> Dict:
+        """JSON'a yazılabilir durum"""
+        return {'rows': self.rows, 'leaders': self.leaders}
+
+
+# Zaman dilimi çözünürlükleri (saklama saatliktir, günlük tablo toplanarak üretilir)
+TREND_GRANULARITIES = ('hour', 'day')
+
+# Trend tablosu sütunları (uzun biçim: dilim x lider)
+TREND_COLUMNS = ['bucket', 'leader', 'rows', 'mentions', 'positive', 'neutral', 'negative', 'net_sentiment']
+
+# ISO 8601 dışında tanınan biçimler (Türkçe gün.ay.yıl ve Twitter API created_at)
+TIMESTAMP_FORMATS = (
+    '%d.%m.%Y %H:%M:%S',
+    '%d.%m.%Y %H:%M',
+    '%d.%m.%Y',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y',
+    '%a %b %d %H:%M:%S %z %Y',
+)
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """
+    Zaman sütunu değerini datetime'a çevir
+
+    Tüm değerler UTC'ye normalize edilir ve dilimler UTC'dir: saat dilimi
+    içeren değerler (ISO ofseti, 'Z', Twitter created_at, tz'li datetime)
+    UTC'ye çevrilir, saat dilimi içermeyenler UTC kabul edilir. Sayılar Unix
+    zamanı (saniye veya milisaniye) kabul edilir. Yerel saatle yazılmış
+    (ör. İstanbul) bir sütun ofsetle (+03:00) verilmezse 3 saat kaymış görünür.
+
+    Args:
+        value: Hücre değeri (string, datetime, date veya sayı)
+
+    Returns:
+        Saat dilimsiz (UTC) datetime veya tanınmayan/boş değerde None
+
+    >>> parse_timestamp('2024-05-01T13:30:00+03:00')
+    datetime.datetime(2024, 5, 1, 10, 30)
+    >>> parse_timestamp('1714559400.0'), parse_timestamp('1714559400000')
+    (datetime.datetime(2024, 5, 1, 10, 30), datetime.datetime(2024, 5, 1, 10, 30))
+    >>> parse_timestamp('01.05.2024 10:30')  # saat dilimsiz: UTC kabul edilir
+    datetime.datetime(2024, 5, 1, 10, 30)
+    >>> parse_timestamp('Wed May 01 10:30:00 +0000 2024') == parse_timestamp(1714559400) \\
+    ...     == parse_timestamp(datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc))
+    True
+    """
+    if value is None or value != value:  # None, NaN veya NaT
+        return None
+
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        parsed = datetime(value.year, value.month, value.day)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        parsed = _from_epoch(value)
+    else:
+        text = str(value).strip()
+        if not text:
+            return None
+        if text.replace('.', '', 1).isdigit():  # okuyucular sayıları string bırakır
+            parsed = _from_epoch(float(text))
+        else:
+            parsed = _parse_text(text)
+
+    if parsed is None:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _from_epoch(seconds: float) -> Optional[datetime]:
+    """Unix zamanı (saniye veya milisaniye) -> UTC datetime"""
+    if seconds > 1e11:
+        seconds /= 1000
+    try:
+        return datetime.fromtimestamp(seconds, timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def _parse_text(text: str) -> Optional[datetime]:
+    """ISO 8601 veya TIMESTAMP_FORMATS biçimindeki metni ayrıştır"""
+    try:
+        return datetime.fromisoformat(text[:-1] + '+00:00' if text.endswith('Z') else text)
+    except ValueError:
+        pass
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+# Sentiment değeri -> sayaç listesindeki sıra
+SENTIMENT_INDEX = {1: 1, 0: 2, -1: 3}
+
+
+def _empty_counts() -> List[int]:
+    return [0, 0, 0, 0]  # mentions, positive, neutral, negative
+
+
+class TrendAggregator:
+    """
+    Zaman dilimi ve lider bazında artımlı bahsetme/sentiment sayaçları
+
+    Dilimler UTC'dir (bkz. parse_timestamp); saat dilimli ve dilimsiz
+    değerler aynı kurala göre yerleşir.
+
+    >>> trends = TrendAggregator(['RTE'])
+    >>> trends.add({'IS_RTE': 1, 'RTE_SENTIMENT': 1}, '2024-05-01T13:30:00+03:00')
+    True
+    >>> trends.add({'IS_RTE': 1, 'RTE_SENTIMENT': -1}, '2024-05-01 10:45')
+    True
+    >>> [(row['bucket'], row['mentions'], row['net_sentiment']) for row in trends.table()]
+    [('2024-05-01 10:00', 2, 0.0)]
+    """
+
+    def __init__(self, leaders: Iterable[str] = SENTIMENT_COLUMNS, state: Optional[Dict] = None):
+        """
+        Toplayıcı başlatıcı
+
+        Args:
+            leaders: Lider kodları veya kod -> sentiment sütunu sözlüğü
+            state: Daha önce to_dict() ile alınmış durum (devam etmek için)
+        """
+        if isinstance(leaders, dict):
+            self.columns = dict(leaders)
+        else:
+            self.columns = {code: SENTIMENT_COLUMNS.get(code, f'{code}_SENTIMENT') for code in leaders}
+
+        self.rows = 0
+        self.unparsed = 0
+        # 'YYYY-MM-DDTHH' -> {'rows': n, 'leaders': {kod: [bahsetme, pozitif, nötr, negatif]}}
+        self.buckets: Dict[str, Dict] = {}
+
+        if state:
+            self.rows = state.get('rows', 0)
+            self.unparsed = state.get('unparsed', 0)
+            for key, bucket in state.get('buckets', {}).items():
+                self.buckets[key] = {
+                    'rows': bucket.get('rows', 0),
+                    'leaders': {code: list(counts) for code, counts in bucket.get('leaders', {}).items()
+                                if code in self.columns}
+                }
+
+    def add(self, result: Dict, timestamp) -> bool:
+        """
+        Tek bir sonucu zaman dilimine ekle
+
+        Args:
+            result: Analiz sonucu
+            timestamp: Girdideki zaman sütunu değeri
+
+        Returns:
+            Zaman tanındıysa True (tanınmayan satırlar yalnızca sayılır)
+        """
+        self.rows += 1
+        parsed = parse_timestamp(timestamp)
+        if parsed is None:
+            self.unparsed += 1
+            return False
+
+        key = f'{parsed.year:04d}-{parsed.month:02d}-{parsed.day:02d}T{parsed.hour:02d}'
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = {'rows': 0, 'leaders': {}}
+        bucket['rows'] += 1
+
+        for code, column in self.columns.items():
+            if result.get(f'IS_{code}') != 1:
+                continue
+            counts = bucket['leaders'].get(code)
+            if counts is None:
+                counts = bucket['leaders'][code] = _empty_counts()
+            counts[0] += 1
+
+            index = SENTIMENT_INDEX.get(result.get(column))
+            if index:
+                counts[index] += 1
+        return True
+
+    def to_dict(self) -> Dict:
+        """JSON'a yazılabilir durum"""
+        return {'rows': self.rows, 'unparsed': self.unparsed, 'buckets': self.buckets}
+
+    def table(self, granularity: str = 'hour') -> List[Dict]:
+        """Trend tablosu satırları (bkz. trend_table)"""
+        return trend_table(self.to_dict(), granularity, list(self.columns))
+
+    def summary(self) -> Dict:
+        """Rapor için kısa özet"""
+        keys = sorted(self.buckets)
+        return {
+            'rows': self.rows,
+            'unparsed_rows': self.unparsed,
+            'hour_buckets': len(keys),
+            'day_buckets': len({key[:10] for key in keys}),
+            'first': _bucket_label(keys[0], 'hour') if keys else None,
+            'last': _bucket_label(keys[-1], 'hour') if keys else None
+        }
+
+
+def _bucket_label(key: str, granularity: str) -> str:
+    """Saklama anahtarını tablo etiketine çevir"""
+    return key[:10] if granularity == 'day' else f'{key[:10]} {key[11:13]}:00'
+
+
+def trend_table(state: Optional[Dict], granularity: str = 'hour',
+                leaders: Optional[List[str]] = None) -> List[Dict]:
+    """
+    TrendAggregator durumundan kompakt trend tablosu üret
+
+    Sonuçlar yeniden taranmaz; günlük tablo saatlik dilimler toplanarak
+    elde edilir. Yalnızca bahsetme olan (dilim, lider) çiftleri yer alır.
+
+    Args:
+        state: TrendAggregator.to_dict() çıktısı
+        granularity: 'hour' veya 'day'
+        leaders: Lider sırası (None = durumdaki sıra)
+
+    Returns:
+        TREND_COLUMNS sütunlu, dilim sırasına göre satırlar
+    """
+    if granularity not in TREND_GRANULARITIES:
+        raise ValueError(f"Geçersiz zaman çözünürlüğü: {granularity}")
+
+    merged: Dict[str, Dict] = {}
+    for key in sorted((state or {}).get('buckets', {})):
+        bucket = state['buckets'][key]
+        label = _bucket_label(key, granularity)
+        target = merged.get(label)
+        if target is None:
+            target = merged[label] = {'rows': 0, 'leaders': {}}
+        target['rows'] += bucket.get('rows', 0)
+        for code, counts in bucket.get('leaders', {}).items():
+            total = target['leaders'].setdefault(code, _empty_counts())
+            for i, value in enumerate(counts):
+                total[i] += value
+
+    rows = []
+    for label, bucket in merged.items():
+        order = leaders or list(bucket['leaders'])
+        for code in order:
+            counts = bucket['leaders'].get(code)
+            if not counts or not counts[0]:
+                continue
+            mentions, positive, neutral, negative = counts
+            rows.append({
+                'bucket': label,
+                'leader': code,
+                'rows': bucket['rows'],
+                'mentions': mentions,
+                'positive': positive,
+                'neutral': neutral,
+                'negative': negative,
+                'net_sentiment': round((positive - negative) / mentions, 4)
+            })
+    return rows
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yerel Analiz Sunucusu - Türk Siyasi Lider Analiz Sistemi
+
+Uzun ömürlü tek bir PoliticalAnalysisSystem örneğini (sıcak bağlantı
+havuzu, zamanlayıcı, logging ve sonuç önbelleği) yerel bir HTTP API
+üzerinden paylaşır. Diğer araçlar her çağrıda analizörü yeniden kurmak
+yerine bu servise istek gönderir.
+
+Uç noktalar:
+- POST /analyze  {"text": "...", "account_name": "@x"} -> {"result": {...}}
+- POST /jobs     {"records": [{"ACCOUNT_NAME", "TEXT"}, ...]}, {"input_file": "x.csv"}
+                 veya NDJSON kayıt satırları -> sonuçlar NDJSON olarak akıtılır
+- GET  /health   servis ve API kullanım istatistikleri
+
+Farklı istemcilerden gelen tekil /analyze istekleri kısa bir pencerede
+toplanıp çok satırlı tek prompt'la işlenir (bkz. coalescer.py).
+
+Kullanım:
+python analysis_server.py YOUR_API_KEY --port 8765
+curl -s localhost:8765/analyze -d '{"text": "Mansur Yavaş hizmet ediyor"}'
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Tekil isteklerin batch'e toplanması için beklenen süre (ms)
+DEFAULT_BATCH_WAIT_MS = 10
+# Sonuç önbelleğindeki en fazla kayıt (hesap, metin)
+DEFAULT_CACHE_SIZE = 10000
+# /analyze yanıtı için en uzun bekleme (saniye)
+DEFAULT_ANALYZE_TIMEOUT = 120
+# İstek gövdesi sınırı
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+NDJSON_TYPES = ('application/x-ndjson', 'application/jsonl', 'application/json-seq')
+
+
+class ResultCache:
+    """(hesap, metin) -> sonuç için thread-safe LRU önbellek"""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[Dict]:
+        """Önbellekteki sonucu döndür (yoksa None)"""
+        with self._lock:
+            result = self._items.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: Tuple[str, str], result: Dict):
+        """Sonucu ekle, sınır aşılırsa en eskiyi at"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = result
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class AnalysisService:
+    """
+    Sıcak analizör etrafında istek toplayıcı
+
+    /analyze istekleri analizörün birleştiricisine bırakılır (bkz.
+    coalescer.py): ilk istekten sonra batch_wait_ms kadar (veya max_batch
+    dolana kadar) toplanan istekler çok satırlı tek prompt'la işlenir ve
+    her çağıranın Future'ı tamamlanır.
+    """
+
+    def __init__(self, api_key: str, config: Optional[Dict] = None,
+                 batch_wait_ms: float = DEFAULT_BATCH_WAIT_MS, max_batch: Optional[int] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Servis başlatıcı
+
+        Args:
+            api_key: Google Gemini API anahtarı
+            config: PoliticalAnalysisSystem konfigürasyonu
+            batch_wait_ms: Tekil istekleri toplama penceresi (ms)
+            max_batch: Çok satırlı prompt başına en fazla istek (None = analizör varsayılanı)
+            cache_size: Sonuç önbelleği boyutu (0 = kapalı)
+        """
+        from political_analyzer import PoliticalAnalysisSystem
+
+        config = dict(config or {})
+        config.setdefault('save_progress', False)
+        config['coalesce_wait_ms'] = batch_wait_ms
+        if max_batch:
+            config['coalesce_max_items'] = max_batch
+        self.analyzer = PoliticalAnalysisSystem(api_key, **config)
+        self.logger = self.analyzer.logger
+        self.cache = ResultCache(cache_size)
+
+        self.counters = {'requests': 0, 'jobs': 0, 'job_rows': 0, 'errors': 0}
+        self._counter_lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _count(self, **increments):
+        with self._counter_lock:
+            for key, value in increments.items():
+                self.counters[key] += value
+
+    def _cacheable(self, result: Dict) -> bool:
+        """API hatasıyla üretilmiş (yedek) sonuçlar önbelleğe alınmaz"""
+        if result.get('CLASSIFICATION_SOURCE') == 'fallback':
+            return False
+        return all(result.get(column) != 'lexicon_fallback'
+                   for column in self.analyzer.leader_registry.source_columns.values())
+
+    def submit(self, text: str, account_name: str = '') -> Future:
+        """
+        Tek metni işleme kuyruğuna bırak
+
+        Args:
+            text: İçerik metni
+            account_name: Hesap adı
+
+        Returns:
+            Sonucu (veya işlenemediyse None) taşıyan Future
+        """
+        self._count(requests=1)
+        key = (account_name, text)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            future: Future = Future()
+            future.set_result(cached)
+            return future
+
+        def remember(done: Future):
+            result = None if done.exception() else done.result()
+            if result is None:
+                self._count(errors=1)
+            elif self._cacheable(result):
+                self.cache.put(key, result)
+
+        future = self.analyzer.analyze_coalesced(account_name, text)
+        future.add_done_callback(remember)
+        return future
+
+    def analyze(self, text: str, account_name: str = '',
+                timeout: Optional[float] = DEFAULT_ANALYZE_TIMEOUT) -> Optional[Dict]:
+        """Tek metni işle ve sonucu bekle"""
+        return self.submit(text, account_name).result(timeout)
+
+    def iter_job(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Kayıtları batch'ler halinde işle ve sonuçları geldikçe üret
+
+        Çağıran üretici tüketmeyi bırakırsa (ör. istemci bağlantıyı
+        kapatırsa) kalan batch'ler işlenmez.
+
+        Args:
+            records: ACCOUNT_NAME/TEXT içeren kayıtlar
+
+        Yields:
+            {'index', 'result'} satırları, en sonda {'done', 'rows', 'errors', 'aggregates'}
+        """
+        from aggregates import LeaderAggregator
+
+        self._count(jobs=1)
+        aggregator = LeaderAggregator(self.analyzer.sentiment_columns)
+        batch_size = self.analyzer.config['batch_size']
+        index = errors = 0
+        batch: List[Dict] = []
+
+        def run(batch: List[Dict], offset: int) -> Iterator[Dict]:
+            nonlocal errors
+            results = self.analyzer.process_batch_parallel(batch, with_positions=True)
+            errors += len(batch) - len(results)
+            self._count(job_rows=len(batch))
+            for position, result in results:
+                aggregator.add(result)
+                yield {'index': offset + position, 'result': dict(result)}
+
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield from run(batch, index)
+                index += len(batch)
+                batch = []
+        if batch:
+            yield from run(batch, index)
+            index += len(batch)
+
+        yield {'done': True, 'rows': index, 'errors': errors, 'aggregates': aggregator.to_dict()}
+
+    def stats(self) -> Dict:
+        """Servis istatistikleri"""
+        with self._counter_lock:
+            counters = dict(self.counters)
+        return {
+            'uptime_sec': round(time.time() - self.started_at, 1),
+            'service': counters,
+            'coalescer': self.analyzer.coalescer.stats(),
+            'hedging': self.analyzer.hedger.stats() if self.analyzer.hedger is not None else None,
+            'cache': {'size': len(self.cache), 'hits': self.cache.hits, 'misses': self.cache.misses},
+            'api_usage': self.analyzer.usage.to_dict()['total']
+        }
+
+    def close(self):
+        """Birleştiriciyi durdur ve devam eden batch'lerin bitmesini bekle"""
+        self.analyzer.coalescer.close()
+
+
+def _iter_ndjson(lines: Iterable[bytes]) -> Iterator[Dict]:
+    """NDJSON satırlarını kayıtlara çevir (boş satırlar atlanır)"""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """HTTP uç noktaları (servis, sunucu nesnesi üzerinden paylaşılır)"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'PoliticalAnalysisServer/1.0'
+
+    @property
+    def service(self) -> AnalysisService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        self.service.logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False, default=dict).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> Optional[bytes]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {'error': f'İstek gövdesi en fazla {MAX_BODY_BYTES} bayt olabilir'})
+            return None
+        return self.rfile.read(length)
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/health':
+            self._send_json(200, {'status': 'ok', **self.service.stats()})
+        else:
+            self._send_json(404, {'error': f'Bilinmeyen uç nokta: {self.path}'})
+
+    def do_POST(self):
+        path = self.path.rstrip('/')
+        if path not in ('/analyze', '/jobs'):
+            self._send_json(404, {'error': f'Bilinmeyen uç nokta: {self.path}'})
+            return
+
+        body = self._read_body()
+        if body is None:
+            return
+
+        try:
+            if path == '/analyze':
+                self._handle_analyze(body)
+            else:
+                self._handle_job(body)
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f'Geçersiz istek: {e}'})
+
+    def _handle_analyze(self, body: bytes):
+        payload = json.loads(body or b'{}')
+        text = str(payload.get('text') or payload.get('TEXT') or '')
+        account_name = str(payload.get('account_name') or payload.get('ACCOUNT_NAME') or '')
+        if not text.strip():
+            raise ValueError("'text' boş olamaz")
+
+        try:
+            result = self.service.analyze(text, account_name,
+                                          timeout=payload.get('timeout', DEFAULT_ANALYZE_TIMEOUT))
+        except FutureTimeoutError:
+            self._send_json(504, {'error': 'Analiz zaman aşımına uğradı'})
+            return
+        except Exception as e:
+            self._send_json(502, {'error': f'Analiz hatası: {e}'})
+            return
+
+        if result is None:
+            self._send_json(502, {'error': 'İçerik işlenemedi'})
+        else:
+            self._send_json(200, {'result': dict(result)})
+
+    def _job_records(self, body: bytes) -> Iterable[Dict]:
+        content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip()
+        if content_type in NDJSON_TYPES:
+            return _iter_ndjson(body.splitlines())
+
+        payload = json.loads(body or b'{}')
+        if isinstance(payload, list):
+            return payload
+        if payload.get('input_file'):
+            from file_readers import iter_record_chunks
+
+            input_file = payload['input_file']
+            if not os.path.exists(input_file):
+                raise ValueError(f"Girdi dosyası bulunamadı: {input_file}")
+            return (record for chunk in iter_record_chunks(input_file) for record in chunk)
+        return payload['records']
+
+    def _handle_job(self, body: bytes):
+        records = self._job_records(body)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        try:
+            for line in self.service.iter_job(records):
+                self._write_chunk(json.dumps(line, ensure_ascii=False, default=dict).encode('utf-8') + b'\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.service.logger.info("İş akışı istemci tarafından kapatıldı")
+            self.close_connection = True
+            return
+        except Exception as e:
+            # Başlık gönderildi; hata son satır olarak bildirilir
+            self.service.logger.error(f"İş akışı hatası: {e}")
+            self._write_chunk(json.dumps({'done': False, 'error': str(e)}, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._write_chunk(b'')
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """Servisi handler'lara taşıyan çok thread'li HTTP sunucusu"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: AnalysisService):
+        self.service = service
+        super().__init__(address, AnalysisRequestHandler)
+
+
+def main():
+    """Komut satırı arayüzü"""
+    parser = argparse.ArgumentParser(description='🇹🇷 Siyasi Analiz Yerel Sunucusu')
+    parser.add_argument('api_key', nargs='?', default=os.getenv('GOOGLE_API_KEY'),
+                        help='Google Gemini API anahtarı (default: GOOGLE_API_KEY)')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Dinlenecek adres (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--batch-size', type=int, default=5, help='/jobs batch boyutu (default: 5)')
+    parser.add_argument('--workers', type=int, default=3, help='Batch başına thread sayısı (default: 3)')
+    parser.add_argument('--rate-limit', type=float, default=1.5, help='Rate limit saniye (default: 1.5)')
+    parser.add_argument('--max-concurrent', type=int, default=4,
+                        help='API anahtarı başına eşzamanlı istek limiti (default: 4)')
+    parser.add_argument('--batch-wait-ms', type=float, default=DEFAULT_BATCH_WAIT_MS,
+                        help=f'Tekil istekleri toplama penceresi, ms (default: {DEFAULT_BATCH_WAIT_MS})')
+    parser.add_argument('--max-batch', type=int, help='Çok satırlı prompt başına en fazla /analyze isteği (default: 8)')
+    parser.add_argument('--speculative-sentiment', action='store_true',
+                        help='Adı kesin geçen liderlerin sentiment isteğini sınıflandırmayla paralel başlat')
+    parser.add_argument('--hedge-requests', action='store_true',
+                        help='Gözlenen p95 gecikmesini aşan çağrıların kopyasını gönder (bütçe: --hedge-budget)')
+    parser.add_argument('--hedge-budget', type=float, default=5.0, metavar='PCT',
+                        help='Kopya isteklerin toplam isteklere oranı için üst sınır, yüzde (default: 5)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f'Sonuç önbelleği boyutu, 0 = kapalı (default: {DEFAULT_CACHE_SIZE})')
+    args = parser.parse_args()
+
+    if not args.api_key:
+        print("❌ API anahtarı gerekli (argüman veya GOOGLE_API_KEY)")
+        sys.exit(1)
+
+    service = AnalysisService(args.api_key, {
+        'batch_size': args.batch_size,
+        'max_workers': args.workers,
+        'rate_limit_sec': args.rate_limit,
+        'max_concurrent_requests': args.max_concurrent,
+        'speculative_sentiment': args.speculative_sentiment,
+        'hedge_requests': args.hedge_requests,
+        'hedge_budget_pct': args.hedge_budget
+    }, batch_wait_ms=args.batch_wait_ms, max_batch=args.max_batch, cache_size=args.cache_size)
+
+    server = AnalysisServer((args.host, args.port), service)
+    print(f"🚀 Analiz sunucusu http://{args.host}:{args.port} adresinde (Ctrl+C ile durdurun)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Sunucu durduruluyor...")
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
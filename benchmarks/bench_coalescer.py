@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İstek birleştirici yük benchmark'ı
+
+Eşzamanlı tekil istekleri doğrudan process_single_content ile ve
+birleştirici (analyze_coalesced) üzerinden işler; API yerine sabit
+gecikmeli sahte yanıt kullanılır. Çağrı sayısı, saniyedeki istek ve
+p50/p95 gecikme karşılaştırılır.
+
+Kullanım:
+python benchmarks/bench_coalescer.py [--clients 16] [--requests 200] [--latency-ms 300]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import political_analyzer  # noqa: E402
+from political_analyzer import PoliticalAnalysisSystem  # noqa: E402
+
+TEXTS = [
+    "Mansur Yavaş'la harika bir proje yaptık! Teşekkürler.",
+    "Erdoğan bugün yeni yatırımları açıkladı.",
+    "İmamoğlu ve Özgür Özel mitingde konuştu.",
+    "Bugün hava çok güzel.",
+]
+
+
+def fake_api(latency: float, calls: list, lock: threading.Lock, slots: threading.Semaphore):
+    """
+    Sabit gecikmeli, çok satırlı prompt'ları da yanıtlayan sahte istek fonksiyonu
+
+    Gerçek zamanlayıcı atlandığı için anahtar başına eşzamanlılık sınırı
+    semaforla taklit edilir.
+    """
+    def detect(text):
+        return {'RTE': 'Erdoğan' in text, 'ÖÖ': 'Özel' in text,
+                'MY': 'Yavaş' in text, 'EI': 'İmamoğlu' in text}
+
+    def make_api_request(self, prompt, retries=0, priority=None, response_schema=None,
+                         stage='other', leader_codes=()):
+        with lock:
+            calls.append(stage)
+        with slots:
+            time.sleep(latency)
+        rows = [json.loads(line) for line in prompt.splitlines() if line.startswith('{"id"')]
+        if stage == 'classification_batch':
+            return json.dumps([{'id': row['id'], **{f'IS_{c}': int(v) for c, v in detect(row['text']).items()},
+                                'reasoning': ''} for row in rows])
+        if stage == 'multi_sentiment_batch':
+            return json.dumps([{'id': row['id'], **{code: 1 for code in row['leaders']}} for row in rows])
+        if stage == 'classification':
+            text = prompt.split('İçerik: "', 1)[1]
+            return json.dumps({**{f'IS_{c}': int(v) for c, v in detect(text).items()}, 'reasoning': ''})
+        if stage == 'multi_sentiment':
+            return json.dumps({code: 1 for code in leader_codes})
+        return '1'
+
+    return make_api_request
+
+
+def run(label, analyze, clients, total, calls):
+    latencies = []
+    lock = threading.Lock()
+
+    def one(i):
+        started = time.perf_counter()
+        analyze('@bench', f"{TEXTS[i % len(TEXTS)]} #{i}")
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    calls.clear()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"  {label:<14} {len(calls):>6} çağrı  {total / elapsed:8.1f} istek/s  "
+          f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='İstek birleştirici benchmark')
+    parser.add_argument('--clients', type=int, default=16, help='Eşzamanlı istemci (default: 16)')
+    parser.add_argument('--requests', type=int, default=200, help='Toplam istek (default: 200)')
+    parser.add_argument('--latency-ms', type=float, default=300, help='Sahte API gecikmesi (default: 300)')
+    parser.add_argument('--max-items', type=int, default=8, help='Prompt başına en fazla kayıt (default: 8)')
+    parser.add_argument('--wait-ms', type=float, default=10, help='Toplama penceresi (default: 10)')
+    parser.add_argument('--max-concurrent', type=int, default=4,
+                        help='API anahtarı başına eşzamanlı istek limiti (default: 4)')
+    args = parser.parse_args()
+
+    calls, lock = [], threading.Lock()
+    political_analyzer.PoliticalAnalysisSystem.make_api_request = fake_api(
+        args.latency_ms / 1000, calls, lock, threading.BoundedSemaphore(args.max_concurrent))
+    analyzer = PoliticalAnalysisSystem('bench', rate_limit_sec=0, save_progress=False, log_file=None,
+                                       log_level='WARNING', coalesce_max_items=args.max_items,
+                                       coalesce_wait_ms=args.wait_ms)
+
+    print(f"\n{args.clients} istemci, {args.requests} istek, API gecikmesi {args.latency_ms:.0f} ms:")
+    run("doğrudan", analyzer.process_single_content, args.clients, args.requests, calls)
+    run("birleştirici", lambda a, t: analyzer.analyze_coalesced(a, t).result(),
+        args.clients, args.requests, calls)
+    print(f"\nBirleştirici: {analyzer.coalescer.stats()}")
+    analyzer.coalescer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kopya istek (hedging) kuyruk gecikmesi benchmark'ı
+
+HTTP oturumu yerine çağrıların küçük bir kısmı uzun süre asılı kalan
+sahte bir oturum kullanılır; aynı istek akışı kopya istekler kapalı ve
+açıkken make_api_request üzerinden işlenir. p50/p95/p99 gecikme, toplam
+süre ve kopya bütçesi kullanımı karşılaştırılır.
+
+Kullanım:
+python benchmarks/bench_hedging.py [--requests 600] [--slow-rate 0.02] [--slow-ms 3000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from political_analyzer import PoliticalAnalysisSystem  # noqa: E402
+
+
+class FakeResponse:
+    """Gemini yanıtı taklidi"""
+
+    status_code = 200
+
+    def json(self):
+        return {'candidates': [{'content': {'parts': [{'text': '1'}]}}],
+                'usageMetadata': {'promptTokenCount': 120, 'candidatesTokenCount': 1}}
+
+    def close(self):
+        pass
+
+
+def fake_post(fast: float, slow: float, slow_rate: float, seed: int):
+    """Çağrıların slow_rate kadarı slow, kalanı fast saniye süren post fonksiyonu"""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def post(url, json=None, headers=None, timeout=None):
+        with lock:
+            delay = slow if rng.random() < slow_rate else fast * rng.uniform(0.8, 1.5)
+        time.sleep(min(delay, timeout or delay))
+        return FakeResponse()
+
+    return post
+
+
+def run(label, args, hedge):
+    analyzer = PoliticalAnalysisSystem(f'bench-{label}', rate_limit_sec=0, save_progress=False, log_file=None,
+                                       log_level='WARNING', max_concurrent_requests=args.max_concurrent,
+                                       hedge_requests=hedge, hedge_budget_pct=args.budget)
+    analyzer.session.post = fake_post(args.fast_ms / 1000, args.slow_ms / 1000, args.slow_rate, args.seed)
+
+    latencies = []
+    lock = threading.Lock()
+
+    def one(_):
+        started = time.perf_counter()
+        analyzer.make_api_request('bench', stage='sentiment')
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        list(executor.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(q):
+        return latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000
+
+    print(f"  {label:<10} toplam {elapsed:6.2f} s  p50 {pct(0.5):7.1f} ms  p95 {pct(0.95):7.1f} ms  "
+          f"p99 {pct(0.99):7.1f} ms  max {latencies[-1] * 1000:7.1f} ms")
+    if analyzer.hedger is not None:
+        print(f"  {'':<10} {analyzer.hedger.stats()}")
+        analyzer.hedger.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kopya istek benchmark')
+    parser.add_argument('--requests', type=int, default=600, help='Toplam istek (default: 600)')
+    parser.add_argument('--clients', type=int, default=4, help='Eşzamanlı istemci (default: 4)')
+    parser.add_argument('--max-concurrent', type=int, default=8,
+                        help='API anahtarı başına eşzamanlı istek limiti (default: 8)')
+    parser.add_argument('--fast-ms', type=float, default=40, help='Normal çağrı gecikmesi (default: 40)')
+    parser.add_argument('--slow-ms', type=float, default=3000, help='Asılı kalan çağrı gecikmesi (default: 3000)')
+    parser.add_argument('--slow-rate', type=float, default=0.02, help='Asılı kalan çağrı oranı (default: 0.02)')
+    parser.add_argument('--budget', type=float, default=5.0, help='Kopya bütçesi, yüzde (default: 5)')
+    parser.add_argument('--seed', type=int, default=7, help='Rastgelelik tohumu (default: 7)')
+    args = parser.parse_args()
+
+    print(f"\n{args.requests} istek, {args.clients} istemci, "
+          f"%{args.slow_rate * 100:g} çağrı {args.slow_ms:.0f} ms asılı:")
+    run('kapalı', args, hedge=False)
+    run('hedging', args, hedge=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLI başlangıç süresi benchmark'ı (-X importtime)
+
+`import political_analyzer` ve `political_analyzer.py --help` çağrılarını
+ayrı process'lerde tekrar tekrar çalıştırır; medyan import süresini,
+en pahalı modülleri ve ağır bağımlılıkların (pandas, numpy, requests,
+tqdm, colorama) başlangıçta yüklenip yüklenmediğini raporlar.
+
+Kullanım:
+python benchmarks/bench_import_time.py [--runs 7] [--top 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'political_analyzer.py')
+
+# Başlangıçta yüklenmemesi gereken ağır bağımlılıklar
+HEAVY_MODULES = ('pandas', 'numpy', 'requests', 'tqdm', 'colorama')
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime çıktısını ayrıştır
+
+    Returns:
+        (modül -> kümülatif µs, üst düzey modül -> kümülatif µs)
+    """
+    cumulative, top_level = {}, {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cum_us, name = line.split('|')
+        module = name.strip()
+        cumulative[module] = int(cum_us)
+        # Alt modüller üst modülün altında iki boşluk içeride listelenir
+        if len(name) - len(name.lstrip()) == 1:
+            top_level[module] = int(cum_us)
+    return cumulative, top_level
+
+
+def import_run():
+    """Tek bir `import political_analyzer` ölçümü"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import political_analyzer'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(result.stderr)
+
+
+def help_run():
+    """Tek bir `political_analyzer.py --help` çağrısının duvar saati (saniye)"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, SCRIPT, '--help'], cwd=ROOT,
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI başlangıç süresi benchmark')
+    parser.add_argument('--runs', type=int, default=7, help='Tekrar sayısı (default: 7)')
+    parser.add_argument('--top', type=int, default=10, help='Listelenecek modül sayısı (default: 10)')
+    args = parser.parse_args()
+
+    runs = [import_run() for _ in range(args.runs)]
+    totals = [top['political_analyzer'] for _, top in runs]
+    cumulative = runs[-1][0]
+
+    print(f"\nimport political_analyzer ({args.runs} tekrar):")
+    print(f"  {'medyan':<38} {statistics.median(totals) / 1000:8.1f} ms")
+    print(f"  {'en iyi':<38} {min(totals) / 1000:8.1f} ms")
+
+    print(f"\nEn pahalı {args.top} modül (kümülatif, son tekrar):")
+    own = {name: us for name, us in cumulative.items() if name != 'political_analyzer'}
+    for name, us in sorted(own.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {name:<38} {us / 1000:8.1f} ms")
+
+    print("\nAğır bağımlılıklar:")
+    for name in HEAVY_MODULES:
+        loaded = name in cumulative
+        print(f"  {name:<38} {'yüklendi' if loaded else 'ertelendi':>8}")
+
+    help_times = [help_run() for _ in range(args.runs)]
+    print(f"\npolitical_analyzer.py --help: medyan {statistics.median(help_times) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
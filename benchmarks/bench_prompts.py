@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prompt oluşturma ve yanıt ayrıştırma mikro-benchmark'ı
+
+Eski satır içi yaklaşımı (her çağrıda f-string + `import re` + regex) yeni
+şablon kayıt defteri ve önceden derlenmiş ayrıştırıcılarla karşılaştırır.
+
+Kullanım:
+python benchmarks/bench_prompts.py [--number 20000]
+"""
+
+import os
+import sys
+import json
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompts import get_prompt, parse_json_object, parse_sentiment  # noqa: E402
+
+TEXT = ("Ata tohumlarımızı hasat ettik! 11 Ekim'de Ankara Büyükşehir Belediye Başkanımız "
+        "Mansur Yavaş'la birlikte ektiğimiz arpa, buğday ve çörek otunun bereketini topladık.")
+ACCOUNT = "@burcukoksal03"
+CLASSIFICATION_RESPONSE = ('{"IS_RTE": 0, "IS_ÖÖ": 0, "IS_MY": 1, "IS_EI": 0, '
+                           '"reasoning": "Mansur Yavaş doğrudan anılıyor"}')
+SENTIMENT_RESPONSE = "1\n"
+
+# Satır içi eski prompt'la aynı metin: sabit lider listeli v1
+CLASSIFICATION_TEMPLATE = get_prompt('classification', 'v1')
+SENTIMENT_TEMPLATE = get_prompt('sentiment')
+
+
+def legacy_classification_prompt(text, account_name):
+    # Eski davranış: her çağrıda şablonun tamamı f-string ile kurulur
+    return f'''
+Sen bir Türk siyasi analiz uzmanısın. Aşağıdaki sosyal medya içeriğini ya da haber metnini analiz ederek, bu içeriğin hangi siyasi lideri ilgilendirdiğini belirle.
+
+Liderler:
+- RTE: Recep Tayyip Erdoğan (AK Parti, Cumhurbaşkanı, AKP Genel Başkanı)
+- OO: Özgür Özel (CHP Genel Başkanı, Muhalefet Lideri)
+- MY: Mansur Yavaş (Ankara Büyükşehir Belediye Başkanı, CHP)
+- EI: Ekrem İmamoğlu (İstanbul Büyükşehir Belediye Başkanı, CHP Cumhurbaşkanı Adayı, CHP)
+
+Kurallar:
+1. İçerik bir lideri doğrudan bahsediyorsa, o lidere +1 ver
+2. İçerik bir liderin görevinden bahsediyorsa, o lidere +1 ver
+3. Diğer tüm liderlere 0 ver.
+4. Eğer hiçbir lider açık şekilde ilgili değilse, hepsine 0 ver
+5. Birden fazla lider ilgiliyse, hepsine +1 ilgisiz olanlara 0 ver.
+
+İçerik: "{text}"
+Hesap: "{account_name}"
+
+Sonucu sadece JSON formatında ver:
+{{
+    "IS_RTE": 1 veya 0,
+    "IS_ÖÖ": 1 veya 0,
+    "IS_MY": 1 veya 0,
+    "IS_EI": 1 veya 0,
+    "reasoning": "Kısa açıklama"
+}}
+'''
+
+
+def legacy_sentiment_prompt(text, account_name, leader_name):
+    return f'''
+Sen bir politik sentiment analiz uzmanısın. 
+
+Aşağıdaki sosyal medya içeriği ya da haberi "{leader_name}" hakkındaki duygusal tonunu "{leader_name}" lidere göre siyasi bir uzman gibi analiz et.
+Bu haber ya da medya içeriği bu liderle ilgili pozitif bir algı mı negatif bir algı mı?
+
+İçerik: "{text}"
+Hesap: "{account_name}"
+
+Sentiment kategorileri:
+- 1: Pozitif (övgü, destek, beğeni)
+- 0: Nötr (tarafsız bahsetme, objektif, yalnızca bahsetme)
+- -1: Negatif (eleştiri, saldırı, olumsuz)
+
+Sadece sayısal değeri ver (1, 0, veya -1):
+'''
+
+
+def legacy_parse_classification(response):
+    import re
+    json_match = re.search(r'\{.*\}', response, re.DOTALL)
+    if json_match:
+        return json.loads(json_match.group())
+    return None
+
+
+def legacy_parse_sentiment(response):
+    import re
+    number_match = re.search(r'-?[01]', response.strip())
+    if number_match:
+        return int(number_match.group())
+    return None
+
+
+def measure(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    per_call_us = seconds / number * 1e6
+    print(f"  {label:<38} {per_call_us:8.3f} µs/çağrı")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prompt/ayrıştırıcı mikro-benchmark')
+    parser.add_argument('--number', type=int, default=20000, help='Tekrar sayısı (default: 20000)')
+    args = parser.parse_args()
+
+    cases = [
+        ("Sınıflandırma prompt'u",
+         lambda: legacy_classification_prompt(TEXT, ACCOUNT),
+         lambda: CLASSIFICATION_TEMPLATE.render(text=TEXT, account_name=ACCOUNT)),
+        ("Sentiment prompt'u",
+         lambda: legacy_sentiment_prompt(TEXT, ACCOUNT, "Mansur Yavaş"),
+         lambda: SENTIMENT_TEMPLATE.render(text=TEXT, account_name=ACCOUNT, leader_name="Mansur Yavaş")),
+        ("Sınıflandırma yanıtı ayrıştırma",
+         lambda: legacy_parse_classification(CLASSIFICATION_RESPONSE),
+         lambda: parse_json_object(CLASSIFICATION_RESPONSE)),
+        ("Sentiment yanıtı ayrıştırma",
+         lambda: legacy_parse_sentiment(SENTIMENT_RESPONSE),
+         lambda: parse_sentiment(SENTIMENT_RESPONSE)),
+    ]
+
+    total_legacy = total_new = 0.0
+    for title, legacy, new in cases:
+        print(f"\n{title}:")
+        legacy_us = measure("eski (satır içi)", legacy, args.number)
+        new_us = measure("yeni (kayıt defteri)", new, args.number)
+        print(f"  {'fark':<38} {legacy_us - new_us:+8.3f} µs/çağrı")
+        total_legacy += legacy_us
+        total_new += new_us
+
+    print(f"\nToplam (bir sınıflandırma + bir sentiment çağrısı): "
+          f"{total_legacy:.3f} → {total_new:.3f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+İstek Birleştirici - Türk Siyasi Lider Analiz Sistemi
+
+Eşzamanlı gelen tekil istekleri (web arayüzü "Tek Metin" modu, yerel
+sunucunun /analyze uç noktası) birkaç milisaniye veya en fazla N istek
+dolana kadar toplayıp tek bir dağıtım çağrısıyla işler; her sonucu
+çağıranın Future'ına geri dağıtır.
+
+Kuyrukta tek istek varken pencere yalnızca max_wait_ms kadar bekletir;
+yük altında ise batch'ler pencere dolmadan max_items'a ulaşıp hemen
+dağıtılır. Böylece düşük yükte gecikme, yüksek yükte çağrı sayısı düşer.
+"""
+
+import time
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence
+
+DEFAULT_MAX_ITEMS = 8
+DEFAULT_MAX_WAIT_MS = 10
+DEFAULT_CONCURRENCY = 2
+
+
+class RequestCoalescer:
+    """Tekil istekleri mikro-batch'lere toplayan dağıtıcı"""
+
+    def __init__(self, dispatch: Callable[[List[Any]], Sequence[Any]],
+                 max_items: int = DEFAULT_MAX_ITEMS, max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 concurrency: int = DEFAULT_CONCURRENCY, name: str = 'coalescer'):
+        """
+        Birleştirici başlatıcı
+
+        Args:
+            dispatch: Öğe listesini alıp aynı sırada, aynı uzunlukta sonuç döndüren fonksiyon
+            max_items: Batch başına en fazla öğe
+            max_wait_ms: İlk öğeden sonra batch'i toplama penceresi (ms)
+            concurrency: Aynı anda çalışan dağıtım sayısı
+            name: Thread adlarının öneki
+        """
+        self.dispatch = dispatch
+        self.max_items = max(int(max_items), 1)
+        self.max_wait = max(max_wait_ms, 0) / 1000
+
+        self._pending: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {'submitted': 0, 'batches': 0, 'dispatched': 0, 'max_batch': 0,
+                       'full_batches': 0, 'wait_sec': 0.0, 'errors': 0}
+
+        self._executor = ThreadPoolExecutor(max_workers=max(concurrency, 1),
+                                            thread_name_prefix=f'{name}-dispatch')
+        self._collector = threading.Thread(target=self._collect_loop, name=f'{name}-collector',
+                                           daemon=True)
+        self._collector.start()
+
+    def submit(self, item: Any) -> Future:
+        """
+        Öğeyi sıradaki batch'e ekle
+
+        Args:
+            item: dispatch fonksiyonuna iletilecek öğe
+
+        Returns:
+            Öğenin sonucunu taşıyan Future
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Birleştirici kapatıldı")
+            self._stats['submitted'] += 1
+        self._pending.put((item, future, time.monotonic()))
+        return future
+
+    def _collect_loop(self):
+        """Bekleyen öğeleri pencere/boyut sınırıyla batch'lere topla"""
+        while True:
+            entry = self._pending.get()
+            if entry is None:
+                return
+
+            batch = [entry]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.max_items:
+                # Kuyrukta bekleyenler pencereyi beklemeden alınır
+                try:
+                    entry = self._pending.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        entry = self._pending.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            self._executor.submit(self._run, batch)
+            if stop:
+                return
+
+    def _run(self, batch: List[tuple]):
+        """Batch'i dağıt ve sonuçları Future'lara yaz"""
+        started = time.monotonic()
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['dispatched'] += len(batch)
+            self._stats['max_batch'] = max(self._stats['max_batch'], len(batch))
+            self._stats['full_batches'] += len(batch) >= self.max_items
+            self._stats['wait_sec'] += sum(started - queued for _, _, queued in batch)
+
+        try:
+            results = self.dispatch([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Dağıtım {len(batch)} öğe için {len(results)} sonuç döndürdü")
+        except Exception as e:
+            with self._lock:
+                self._stats['errors'] += len(batch)
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def stats(self) -> Dict:
+        """Batch boyutu ve kuyrukta bekleme istatistikleri"""
+        with self._lock:
+            stats = dict(self._stats)
+        dispatched = stats['dispatched']
+        stats['avg_batch'] = round(dispatched / stats['batches'], 2) if stats['batches'] else 0
+        stats['avg_wait_ms'] = round(stats.pop('wait_sec') / dispatched * 1000, 2) if dispatched else 0
+        stats['pending'] = self._pending.qsize()
+        return stats
+
+    def close(self):
+        """Yeni öğe kabul etme, kuyruktakileri dağıt ve bitmelerini bekle"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._pending.put(None)
+        self._collector.join()
+        self._executor.shutdown(wait=True)
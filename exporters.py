@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Sonuç Dışa Aktarma - Türk Siyasi Lider Analiz Sistemi
+
+Sonuçları satır satır akıtarak CSV/Excel dosyalarına yazan yardımcılar.
+Excel yazımı xlsxwriter'ın constant_memory modunu kullanır (yoksa openpyxl
+write_only moduna düşer); böylece bellek kullanımı satır sayısından
+bağımsız kalır.
+"""
+
+import csv
+import itertools
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from leaders import load_leaders
+
+# Özet sayfasında kullanılan kısa lider adları
+LEADER_SHORT_NAMES = load_leaders().short_names
+
+SUMMARY_COLUMNS = ['Lider', 'Bahsetme', 'Pozitif', 'Nötr', 'Negatif', 'Pozitif %']
+
+
+def summary_rows(aggregates: Optional[Dict]) -> List[List]:
+    """Akan özetten Excel özet sayfası satırları"""
+    rows = []
+    for code, counts in (aggregates or {}).get('leaders', {}).items():
+        mentions = counts.get('mentions', 0)
+        if mentions > 0:
+            pos = counts.get('positive', 0)
+            rows.append([
+                LEADER_SHORT_NAMES.get(code, code),
+                mentions,
+                pos,
+                counts.get('neutral', 0),
+                counts.get('negative', 0),
+                round(pos / mentions * 100, 1)
+            ])
+    return rows
+
+
+def trend_sheet_rows(aggregates: Optional[Dict], granularity: str = 'day') -> List[List]:
+    """Akan özetteki trend sayaçlarından Excel trend sayfası satırları (başlık dahil)"""
+    trends = (aggregates or {}).get('trends')
+    if not trends:
+        return []
+
+    from aggregates import TREND_COLUMNS, trend_table
+
+    table = trend_table(trends, granularity)
+    return [TREND_COLUMNS] + [[row[col] for col in TREND_COLUMNS] for row in table] if table else []
+
+
+def _split_header(rows: Iterable[Dict]) -> Tuple[List[str], Iterator[Dict]]:
+    """İlk satırdan sütunları al, satır akışını bozmadan geri ver"""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return [], iter(())
+    return list(first.keys()), itertools.chain([first], rows)
+
+
+def write_csv_stream(file_obj, rows: Iterable[Dict], columns: Optional[List[str]] = None):
+    """
+    Sonuçları satır satır CSV'ye yaz
+
+    Args:
+        file_obj: Metin modunda açılmış dosya
+        rows: Sonuç satırları (dict)
+        columns: Sütun sırası (None = ilk satırın anahtarları)
+    """
+    header, rows = _split_header(rows)
+    writer = csv.DictWriter(file_obj, fieldnames=columns or header, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def write_excel_stream(target, rows: Iterable[Dict], aggregates: Optional[Dict] = None,
+                       columns: Optional[List[str]] = None, granularity: str = 'day'):
+    """
+    Sonuçları ve özet sayfasını sabit bellekle Excel'e yaz
+
+    Args:
+        target: Dosya yolu veya binary dosya nesnesi
+        rows: Sonuç satırları (dict)
+        aggregates: Akan özet (LeaderAggregator.to_dict() yapısında, varsa 'trends' ile)
+        columns: Sütun sırası (None = ilk satırın anahtarları)
+        granularity: Trend sayfasının zaman dilimi ('hour' / 'day')
+    """
+    header, rows = _split_header(rows)
+    columns = columns or header
+    summary = summary_rows(aggregates)
+    trend = trend_sheet_rows(aggregates, granularity)
+
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+
+    if xlsxwriter:
+        # Metinler formül/URL olarak yorumlanmasın (tweet'ler '=' veya link içerebilir)
+        workbook = xlsxwriter.Workbook(target, {
+            'constant_memory': True,
+            'strings_to_formulas': False,
+            'strings_to_urls': False
+        })
+        sheet = workbook.add_worksheet('Sonuçlar')
+        sheet.write_row(0, 0, columns)
+        for row_num, row in enumerate(rows, start=1):
+            sheet.write_row(row_num, 0, [row.get(col) for col in columns])
+
+        if summary:
+            summary_sheet = workbook.add_worksheet('Özet')
+            summary_sheet.write_row(0, 0, SUMMARY_COLUMNS)
+            for row_num, row in enumerate(summary, start=1):
+                summary_sheet.write_row(row_num, 0, row)
+
+        if trend:
+            trend_sheet = workbook.add_worksheet('Trend')
+            for row_num, row in enumerate(trend):
+                trend_sheet.write_row(row_num, 0, row)
+
+        workbook.close()
+        return
+
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sonuçlar')
+    sheet.append(columns)
+    for row in rows:
+        sheet.append([row.get(col) for col in columns])
+
+    if summary:
+        summary_sheet = workbook.create_sheet('Özet')
+        summary_sheet.append(SUMMARY_COLUMNS)
+        for row in summary:
+            summary_sheet.append(row)
+
+    if trend:
+        trend_sheet = workbook.create_sheet('Trend')
+        for row in trend:
+            trend_sheet.append(row)
+
+    workbook.save(target)
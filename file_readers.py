@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Girdi Okuyucuları - Türk Siyasi Lider Analiz Sistemi
+
+CSV ve Excel dosyalarını tamamını belleğe almadan parça parça okuyan
+yardımcılar. Sütun kontrolü yalnızca başlık satırında yapılır; böylece
+yüzlerce MB'lık dosyalarda işlem ilk parça okunur okunmaz başlayabilir.
+"""
+
+import io
+import os
+import csv
+from typing import Dict, Iterator, List, Optional
+
+REQUIRED_COLUMNS = ['ACCOUNT_NAME', 'TEXT']
+EXCEL_EXTENSIONS = ('xlsx', 'xlsm')
+
+
+def get_file_ext(file_name: str) -> str:
+    """Dosya uzantısını küçük harfle döndür"""
+    return str(file_name).lower().rsplit('.', 1)[-1]
+
+
+def validate_columns(columns: List[str]):
+    """
+    Gerekli sütunları kontrol et
+
+    Args:
+        columns: Başlık satırındaki sütun isimleri
+
+    Raises:
+        ValueError: Eksik sütun varsa
+    """
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+    if missing_columns:
+        raise ValueError(f"Eksik sütunlar: {missing_columns}")
+
+
+def _clean_records(records: List[Dict]) -> List[Dict]:
+    """Boş TEXT satırlarını at, TEXT'i string'e çevir"""
+    cleaned = []
+    for record in records:
+        text = record.get('TEXT')
+        if text is None or text != text:  # None veya NaN
+            continue
+        text = str(text)
+        if not text.strip():
+            continue
+        record['TEXT'] = text
+        cleaned.append(record)
+    return cleaned
+
+
+def iter_csv_chunks(source, chunksize: int = 1000) -> Iterator[List[Dict]]:
+    """
+    CSV dosyasını kayıt parçaları halinde oku
+
+    Değerler iter_csv_chunks_light ile aynı şekilde string olarak okunur:
+    "NA"/"null" gibi metinler boş değere, "007" sayıya çevrilmez. Böylece
+    çıktı small_input_rows eşiğine göre değişmez.
+
+    Args:
+        source: Dosya yolu veya dosya nesnesi
+        chunksize: Parça başına satır sayısı
+
+    Yields:
+        Temizlenmiş kayıt listeleri
+
+    >>> data = 'ACCOUNT_NAME,TEXT\\n@a,NA\\n@b,null\\n@c,N/A\\n,007\\n@e,\\n'.encode('utf-8')
+    >>> pandas_rows = [r for chunk in iter_csv_chunks(io.BytesIO(data)) for r in chunk]
+    >>> light_rows = [r for chunk in iter_csv_chunks_light(io.BytesIO(data)) for r in chunk]
+    >>> pandas_rows == light_rows, [(r['ACCOUNT_NAME'], r['TEXT']) for r in pandas_rows]
+    (True, [('@a', 'NA'), ('@b', 'null'), ('@c', 'N/A'), ('', '007')])
+    """
+    import pandas as pd
+
+    for i, chunk in enumerate(pd.read_csv(source, encoding='utf-8', chunksize=chunksize,
+                                          dtype=str, keep_default_na=False)):
+        chunk.columns = chunk.columns.str.strip()
+        if i == 0:
+            validate_columns(list(chunk.columns))
+
+        records = _clean_records(chunk.to_dict('records'))
+        if records:
+            yield records
+
+
+def iter_csv_chunks_light(source, chunksize: int = 1000) -> Iterator[List[Dict]]:
+    """
+    CSV dosyasını pandas'sız, csv modülüyle parça parça oku
+
+    Küçük girdilerde pandas'ın import maliyetinden kaçınmak için kullanılır.
+    Kayıtlar iter_csv_chunks ile aynıdır: değerler string kalır, UTF-8 BOM
+    atlanır, eksik alanlı satırlar boş string ile tamamlanır.
+
+    Args:
+        source: Dosya yolu veya dosya nesnesi
+        chunksize: Parça başına satır sayısı
+
+    Yields:
+        Temizlenmiş kayıt listeleri
+    """
+    is_path = isinstance(source, (str, os.PathLike))
+    f = open(source, 'r', encoding='utf-8-sig', newline='') if is_path else \
+        io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("Boş CSV dosyası")
+        columns = [column.strip() for column in header]
+        validate_columns(columns)
+
+        chunk = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < len(columns):
+                row += [''] * (len(columns) - len(row))
+            chunk.append(dict(zip(columns, row)))
+            if len(chunk) >= chunksize:
+                records = _clean_records(chunk)
+                if records:
+                    yield records
+                chunk = []
+
+        records = _clean_records(chunk)
+        if records:
+            yield records
+    finally:
+        if is_path:
+            f.close()
+        else:
+            f.detach()
+
+
+def iter_excel_chunks(source, chunksize: int = 1000) -> Iterator[List[Dict]]:
+    """
+    Excel (.xlsx) dosyasını openpyxl read_only modunda akıtarak oku
+
+    Args:
+        source: Dosya yolu veya dosya nesnesi
+        chunksize: Parça başına satır sayısı
+
+    Yields:
+        Temizlenmiş kayıt listeleri
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("Boş Excel dosyası")
+
+        columns = ['' if cell is None else str(cell).strip() for cell in header]
+        validate_columns(columns)
+
+        chunk = []
+        for row in rows:
+            chunk.append(dict(zip(columns, row)))
+            if len(chunk) >= chunksize:
+                records = _clean_records(chunk)
+                if records:
+                    yield records
+                chunk = []
+
+        records = _clean_records(chunk)
+        if records:
+            yield records
+    finally:
+        workbook.close()
+
+
+def iter_record_chunks(source, file_ext: Optional[str] = None,
+                       chunksize: int = 1000, light: bool = False) -> Iterator[List[Dict]]:
+    """
+    Dosya türüne göre uygun okuyucuyla kayıt parçaları üret
+
+    Args:
+        source: Dosya yolu veya dosya nesnesi
+        file_ext: Dosya uzantısı (None = yoldan çıkar)
+        chunksize: Parça başına satır sayısı
+        light: CSV'yi pandas yerine csv modülüyle oku
+
+    Yields:
+        Temizlenmiş kayıt listeleri
+    """
+    file_ext = file_ext or get_file_ext(source)
+
+    if file_ext == 'csv' and light:
+        yield from iter_csv_chunks_light(source, chunksize)
+    elif file_ext == 'csv':
+        yield from iter_csv_chunks(source, chunksize)
+    elif file_ext in EXCEL_EXTENSIONS:
+        yield from iter_excel_chunks(source, chunksize)
+    elif file_ext == 'xls':
+        # Eski format akıtılamaz; xlrd ile tamamı okunup parçalanır
+        import pandas as pd
+
+        df = pd.read_excel(source)
+        df.columns = df.columns.str.strip()
+        validate_columns(list(df.columns))
+        for start in range(0, len(df), chunksize):
+            records = _clean_records(df.iloc[start:start + chunksize].to_dict('records'))
+            if records:
+                yield records
+    else:
+        raise ValueError(f"Desteklenmeyen format: {file_ext}")
+
+
+def iter_record_batches(source, batch_size: int, skip: int = 0,
+                        file_ext: Optional[str] = None,
+                        chunksize: int = 1000, light: bool = False) -> Iterator[List[Dict]]:
+    """
+    Kayıtları batch_size boyutunda batch'ler halinde üret
+
+    Args:
+        source: Dosya yolu veya dosya nesnesi
+        batch_size: Batch boyutu
+        skip: Atlanacak (daha önce işlenmiş) kayıt sayısı
+        file_ext: Dosya uzantısı (None = yoldan çıkar)
+        chunksize: Okuma parçası boyutu
+        light: CSV'yi pandas yerine csv modülüyle oku
+
+    Yields:
+        Kayıt batch'leri
+    """
+    pending = []
+    for records in iter_record_chunks(source, file_ext, max(chunksize, batch_size), light):
+        if skip:
+            dropped = min(skip, len(records))
+            records = records[dropped:]
+            skip -= dropped
+
+        pending.extend(records)
+        start = 0
+        while len(pending) - start >= batch_size:
+            yield pending[start:start + batch_size]
+            start += batch_size
+        pending = pending[start:]
+
+    if pending:
+        yield pending
+
+
+def estimate_total_rows(source, file_ext: Optional[str] = None) -> Optional[int]:
+    """
+    Kayıtları belleğe almadan toplam kayıt sayısını tahmin et
+
+    Excel için sayfa boyut bilgisi kullanılır; CSV için kayıtlar C tabanlı
+    csv modülüyle sayılır (boş TEXT satırları da sayıma dahildir).
+
+    Args:
+        source: Dosya yolu veya binary dosya nesnesi
+        file_ext: Dosya uzantısı (None = yoldan çıkar)
+
+    Returns:
+        Tahmini kayıt sayısı veya None
+    """
+    file_ext = file_ext or get_file_ext(source)
+
+    try:
+        if file_ext in EXCEL_EXTENSIONS:
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(source, read_only=True)
+            try:
+                max_row = workbook.active.max_row
+            finally:
+                workbook.close()
+            return max(max_row - 1, 0) if max_row else None
+
+        if file_ext == 'csv':
+            # Tırnak içindeki satır sonları (çok satırlı tweet'ler) kayıt sayılmasın
+            is_path = isinstance(source, (str, os.PathLike))
+            f = open(source, 'rb') if is_path else source
+            try:
+                text_stream = io.TextIOWrapper(f, encoding='utf-8', errors='replace', newline='')
+                try:
+                    rows = sum(1 for _ in csv.reader(text_stream))
+                finally:
+                    text_stream.detach()
+            finally:
+                if is_path:
+                    f.close()
+                else:
+                    f.seek(0)
+            return max(rows - 1, 0)
+    except Exception:
+        pass
+
+    return None
@@ -0,0 +1,840 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yerel İş Kuyruğu - Türk Siyasi Lider Analiz Sistemi
+
+SQLite tabanlı iş kuyruğu ve worker daemon'u. CLI ve web arayüzü işleri
+kuyruğa gönderir; uzun ömürlü worker process'leri sıcak bir
+PoliticalAnalysisSystem örneğini (ve bağlantı havuzunu) tekrar kullanarak
+işleri sırayla yürütür.
+
+Kullanım:
+python job_queue.py worker YOUR_API_KEY --workers 2
+python job_queue.py submit input.csv output.csv
+python job_queue.py status JOB_ID
+python job_queue.py requeue [JOB_ID]
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import sqlite3
+import argparse
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_DB_PATH = os.getenv('ANALYSIS_QUEUE_DB', 'analysis_jobs.db')
+
+# Öncelik sınıfları (yüksek değer önce alınır)
+PRIORITY_INTERACTIVE = 10
+PRIORITY_BULK = 0
+
+# İş durumları
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_CANCELLED = 'cancelled'
+FINAL_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+# Çalışan işin worker'ı bu kadar süre heartbeat yazmazsa iş yeniden kuyruğa alınır
+DEFAULT_LEASE_SEC = 120
+
+# Worker'ın sıcak analizörü üzerinde iş bazında değiştirilebilen ayarlar (her kullanımda
+# config'ten okunanlar; lider listesi, yerel model gibi başlangıçta kurulanlar hariç)
+JOB_CONFIG_OVERRIDES = ('batch_size', 'rate_limit_sec', 'max_workers', 'max_retries', 'max_input_tokens',
+                        'normalize_text', 'json_mode', 'sentiment_engine', 'lexicon_confidence',
+                        'local_confidence', 'multi_target_sentiment', 'small_input_rows', 'timestamp_column',
+                        'trend_granularity')
+
+# İlk sürümden sonra jobs tablosuna eklenen sütunlar (migration)
+ADDED_JOB_COLUMNS = {
+    'aggregates': 'TEXT',
+    'heartbeat_at': 'REAL',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    input_file TEXT,
+    output_file TEXT,
+    account_name TEXT,
+    text TEXT,
+    config TEXT,
+    total INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    result_count INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    report TEXT,
+    aggregates TEXT,
+    worker TEXT,
+    heartbeat_at REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, priority DESC, created_at);
+CREATE TABLE IF NOT EXISTS results (
+    job_id TEXT NOT NULL,
+    row_index INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (job_id, row_index)
+);
+"""
+
+
+class JobQueue:
+    """
+    SQLite tabanlı iş kuyruğu
+
+    Her işlem kendi bağlantısını açar; bu sayede aynı kuyruk nesnesi
+    thread'ler ve process'ler arasında güvenle paylaşılabilir.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        Kuyruk başlatıcı
+
+        Args:
+            db_path: SQLite veritabanı dosya yolu
+        """
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+            # Eski veritabanlarına sonradan eklenen sütunlar
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in ADDED_JOB_COLUMNS.items():
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+    @contextmanager
+    def _connect(self):
+        """Autocommit modunda yeni bir bağlantı aç"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Yazma kilidiyle (BEGIN IMMEDIATE) transaction aç"""
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+    def _insert_job(self, **fields) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        fields.update({
+            'id': job_id,
+            'status': STATUS_QUEUED,
+            'created_at': time.time()
+        })
+        columns = ', '.join(fields)
+        placeholders = ', '.join('?' for _ in fields)
+        with self._transaction() as conn:
+            conn.execute(f"INSERT INTO jobs ({columns}) VALUES ({placeholders})",
+                         list(fields.values()))
+        return job_id
+
+    def submit_file(self, input_file: str, output_file: Optional[str] = None,
+                    priority: int = PRIORITY_BULK, config: Optional[Dict] = None) -> str:
+        """
+        Dosya analizi işi gönder
+
+        Args:
+            input_file: Girdi CSV/Excel dosyası (worker tarafından okunabilir olmalı)
+            output_file: Çıktı CSV dosyası (opsiyonel)
+            priority: İş önceliği
+            config: İşe özel ayarlar (ör. batch_size)
+
+        Returns:
+            İş ID'si
+        """
+        return self._insert_job(
+            kind='file',
+            priority=priority,
+            input_file=os.path.abspath(input_file),
+            output_file=os.path.abspath(output_file) if output_file else None,
+            config=json.dumps(config or {})
+        )
+
+    def submit_text(self, account_name: str, text: str,
+                    priority: int = PRIORITY_INTERACTIVE) -> str:
+        """
+        Tek metin analizi işi gönder
+
+        Args:
+            account_name: Hesap adı
+            text: İçerik metni
+            priority: İş önceliği
+
+        Returns:
+            İş ID'si
+        """
+        return self._insert_job(
+            kind='text',
+            priority=priority,
+            account_name=account_name,
+            text=text,
+            total=1,
+            config='{}'
+        )
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """İş kaydını getir"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, limit: int = 50, status: Optional[str] = None) -> List[Dict]:
+        """Son işleri listele"""
+        query = "SELECT * FROM jobs"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def get_results(self, job_id: str, offset: int = 0,
+                    limit: Optional[int] = None) -> List[Dict]:
+        """
+        İş sonuçlarını getir
+
+        Args:
+            job_id: İş ID'si
+            offset: Başlangıç sırası
+            limit: Maksimum kayıt (None = hepsi)
+
+        Returns:
+            Sonuç listesi
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT data FROM results WHERE job_id = ? ORDER BY row_index LIMIT ? OFFSET ?",
+                (job_id, -1 if limit is None else limit, offset)
+            ).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def iter_results(self, job_id: str, chunk_size: int = 1000, with_index: bool = False) -> Iterator:
+        """
+        İş sonuçlarını parça parça akıt (tüm sonuçları belleğe almadan)
+
+        Args:
+            job_id: İş ID'si
+            chunk_size: Her sorguda okunacak kayıt sayısı
+            with_index: (row_index, kayıt) çiftleri döndür
+
+        Yields:
+            Sonuç kayıtları (dosya işlerinde row_index girdi kayıt numarasıdır)
+        """
+        last_index = -1
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT row_index, data FROM results WHERE job_id = ? AND row_index > ? "
+                    "ORDER BY row_index LIMIT ?",
+                    (job_id, last_index, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                data = json.loads(row['data'])
+                yield (row['row_index'], data) if with_index else data
+            last_index = rows[-1]['row_index']
+
+    def claim_next(self, worker_id: str, lease_sec: float = DEFAULT_LEASE_SEC,
+                   min_priority: Optional[int] = None) -> Optional[Dict]:
+        """
+        Sıradaki işi atomik olarak al
+
+        Heartbeat'i lease_sec'ten eski çalışan işler (çökmüş worker) önce
+        yeniden kuyruğa alınır; böylece kaldıkları yerden devam ederler.
+
+        Args:
+            worker_id: İşi alan worker'ın kimliği
+            lease_sec: Heartbeat zaman aşımı (saniye)
+            min_priority: Verilirse yalnızca bu öncelikte veya üstündeki işler alınır
+
+        Returns:
+            Alınan iş veya None
+        """
+        with self._transaction() as conn:
+            self._requeue_stale(conn, lease_sec)
+            query, params = "SELECT * FROM jobs WHERE status = ?", [STATUS_QUEUED]
+            if min_priority is not None:
+                query += " AND priority >= ?"
+                params.append(min_priority)
+            row = conn.execute(query + " ORDER BY priority DESC, created_at LIMIT 1", params).fetchone()
+            if not row:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started_at = COALESCE(started_at, ?), "
+                "heartbeat_at = ? WHERE id = ?",
+                (STATUS_RUNNING, worker_id, now, now, row['id'])
+            )
+        job = self._row_to_job(row)
+        job.update({'status': STATUS_RUNNING, 'worker': worker_id})
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str):
+        """Çalışan işin worker'ı hâlâ canlı"""
+        with self._transaction() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                         (time.time(), job_id, worker_id, STATUS_RUNNING))
+
+    @staticmethod
+    def _requeue_stale(conn, lease_sec: float) -> List[str]:
+        """Heartbeat'i zaman aşımına uğramış çalışan işleri kuyruğa geri al (transaction içinde)"""
+        cutoff = time.time() - lease_sec
+        rows = conn.execute(
+            "SELECT id FROM jobs WHERE status = ? AND COALESCE(heartbeat_at, started_at, created_at) < ?",
+            (STATUS_RUNNING, cutoff)
+        ).fetchall()
+        job_ids = [row['id'] for row in rows]
+        conn.executemany("UPDATE jobs SET status = ?, worker = NULL WHERE id = ? AND status = ?",
+                         [(STATUS_QUEUED, job_id, STATUS_RUNNING) for job_id in job_ids])
+        return job_ids
+
+    def requeue_stale(self, lease_sec: float = DEFAULT_LEASE_SEC) -> List[str]:
+        """
+        Worker'ı çökmüş (heartbeat'i lease_sec'ten eski) işleri yeniden kuyruğa al
+
+        İşler processed sayacından, yani kaydedilmiş son batch'ten devam eder.
+
+        Args:
+            lease_sec: Heartbeat zaman aşımı (saniye)
+
+        Returns:
+            Kuyruğa geri alınan iş ID'leri
+
+        Örnek (python -m doctest job_queue.py):
+            >>> import os, tempfile
+            >>> queue = JobQueue(os.path.join(tempfile.mkdtemp(), 'jobs.db'))
+            >>> job_id = queue.submit_text('@hesap', 'metin')
+            >>> queue.claim_next('worker-1')['id'] == job_id
+            True
+            >>> queue.requeue_stale(lease_sec=60)
+            []
+            >>> queue.requeue_stale(lease_sec=-1) == [job_id]
+            True
+            >>> queue.get_job(job_id)['status'], queue.claim_next('worker-2')['worker']
+            ('queued', 'worker-2')
+        """
+        with self._transaction() as conn:
+            return self._requeue_stale(conn, lease_sec)
+
+    def requeue(self, job_id: str) -> bool:
+        """
+        Çalışan veya başarısız işi elle yeniden kuyruğa al
+
+        Returns:
+            Kuyruğa alındıysa True
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, error = NULL, finished_at = NULL "
+                "WHERE id = ? AND status IN (?, ?)",
+                (STATUS_QUEUED, job_id, STATUS_RUNNING, STATUS_FAILED)
+            )
+        return cursor.rowcount > 0
+
+    def set_total(self, job_id: str, total: int):
+        """Toplam kayıt sayısını güncelle"""
+        with self._transaction() as conn:
+            conn.execute("UPDATE jobs SET total = ? WHERE id = ?", (total, job_id))
+
+    def append_results(self, job_id: str, results: List[Dict], consumed: int, errors: int,
+                       aggregates: Optional[Dict] = None, row_ids: Optional[List[int]] = None):
+        """
+        Batch sonuçlarını kaydet ve ilerlemeyi güncelle
+
+        Args:
+            job_id: İş ID'si
+            results: Batch sonuçları
+            consumed: Bu batch'te tüketilen girdi satırı sayısı
+            errors: Güncel toplam hata sayısı
+            aggregates: Güncel akan özet (LeaderAggregator.to_dict())
+            row_ids: Sonuçların girdi kayıt numaraları (None = sonuç sırası)
+        """
+        with self._transaction() as conn:
+            if row_ids is None:
+                start = conn.execute("SELECT result_count FROM jobs WHERE id = ?",
+                                     (job_id,)).fetchone()['result_count']
+                row_ids = range(start, start + len(results))
+            conn.executemany(
+                "INSERT INTO results (job_id, row_index, data) VALUES (?, ?, ?)",
+                [(job_id, row_id, json.dumps(dict(result), ensure_ascii=False))
+                 for row_id, result in zip(row_ids, results)]
+            )
+            conn.execute(
+                "UPDATE jobs SET processed = processed + ?, result_count = result_count + ?, "
+                "errors = ?, aggregates = COALESCE(?, aggregates) WHERE id = ?",
+                (consumed, len(results), errors,
+                 json.dumps(aggregates, ensure_ascii=False) if aggregates else None, job_id)
+            )
+
+    def finish(self, job_id: str, report: Optional[Dict] = None):
+        """İşi tamamlandı olarak işaretle"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, report = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (STATUS_DONE, json.dumps(report or {}, ensure_ascii=False), time.time(),
+                 job_id, STATUS_RUNNING)
+            )
+
+    def fail(self, job_id: str, error: str):
+        """İşi başarısız olarak işaretle"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (STATUS_FAILED, error, time.time(), job_id)
+            )
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Bekleyen veya çalışan işi iptal et
+
+        Returns:
+            İptal edildiyse True
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status IN (?, ?)",
+                (STATUS_CANCELLED, time.time(), job_id, STATUS_QUEUED, STATUS_RUNNING)
+            )
+        return cursor.rowcount > 0
+
+    def is_cancelled(self, job_id: str) -> bool:
+        """İş iptal edilmiş mi?"""
+        job = self.get_job(job_id)
+        return job is None or job['status'] == STATUS_CANCELLED
+
+    def wait(self, job_id: str, timeout: Optional[float] = None,
+             poll_interval: float = 0.5) -> Optional[Dict]:
+        """
+        İş bitene kadar bekle
+
+        Args:
+            job_id: İş ID'si
+            timeout: Maksimum bekleme süresi (saniye)
+            poll_interval: Yoklama aralığı (saniye)
+
+        Returns:
+            Son iş kaydı (timeout durumunda güncel kayıt)
+        """
+        deadline = time.time() + timeout if timeout else None
+        while True:
+            job = self.get_job(job_id)
+            if job is None or job['status'] in FINAL_STATUSES:
+                return job
+            if deadline and time.time() >= deadline:
+                return job
+            time.sleep(poll_interval)
+
+    @staticmethod
+    def _row_to_job(row) -> Dict:
+        job = dict(row)
+        job['config'] = json.loads(job['config']) if job.get('config') else {}
+        job['report'] = json.loads(job['report']) if job.get('report') else None
+        job['aggregates'] = json.loads(job['aggregates']) if job.get('aggregates') else None
+        return job
+
+
+class JobWorker:
+    """
+    Kuyruktan iş alıp yürüten worker
+
+    Her worker tek bir sıcak PoliticalAnalysisSystem örneği tutar ve işleri
+    sırayla çalıştırır.
+    """
+
+    def __init__(self, queue: JobQueue, api_key: str, config: Optional[Dict] = None,
+                 worker_id: Optional[str] = None, poll_interval: float = 1.0,
+                 lease_sec: float = DEFAULT_LEASE_SEC):
+        """
+        Worker başlatıcı
+
+        Args:
+            queue: İş kuyruğu
+            api_key: Google Gemini API anahtarı
+            config: PoliticalAnalysisSystem konfigürasyonu
+            worker_id: Worker kimliği
+            poll_interval: Boş kuyrukta bekleme süresi (saniye)
+            lease_sec: Heartbeat zaman aşımı; heartbeat bunun üçte birinde yazılır
+        """
+        from political_analyzer import PoliticalAnalysisSystem
+
+        self.queue = queue
+        self.worker_id = worker_id or f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.poll_interval = poll_interval
+        self.lease_sec = lease_sec
+        self.analyzer = PoliticalAnalysisSystem(api_key, **(config or {}))
+        self.logger = self.analyzer.logger
+
+    def run_forever(self, stop_event: Optional[threading.Event] = None):
+        """Durdurulana kadar kuyruktan iş al"""
+        self.logger.info(f"Worker {self.worker_id} başladı")
+        while not (stop_event and stop_event.is_set()):
+            if not self.run_once():
+                time.sleep(self.poll_interval)
+
+    def run_once(self) -> bool:
+        """
+        Sıradaki işi çalıştır
+
+        Returns:
+            Bir iş çalıştırıldıysa True
+        """
+        job = self.queue.claim_next(self.worker_id, self.lease_sec)
+        if not job:
+            return False
+        self._run_job(job)
+        return True
+
+    def _run_job(self, job: Dict):
+        """Alınmış işi heartbeat ve işe özel ayarlarla çalıştır"""
+        # İş sürdükçe heartbeat yaz; process çökerse iş lease sonunda yeniden kuyruğa alınır
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(job['id'], stop_heartbeat),
+                                     name=f"{self.worker_id}-heartbeat", daemon=True)
+        heartbeat.start()
+
+        # İşe özel ayarları yalnızca bu iş süresince uygula
+        overrides = {key: job['config'][key] for key in JOB_CONFIG_OVERRIDES
+                     if job['config'].get(key) is not None}
+        saved_config = {key: self.analyzer.config[key] for key in overrides}
+        self.analyzer.config.update(overrides)
+        self.analyzer.reset_stats()
+
+        try:
+            if job['kind'] == 'text':
+                self._run_text_job(job)
+            else:
+                self._run_file_job(job)
+        except Exception as e:
+            self.logger.error(f"İş {job['id']} başarısız: {e}")
+            self.queue.fail(job['id'], str(e))
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+            self.analyzer.config.update(saved_config)
+
+    def _run_interactive_jobs(self):
+        """
+        Bekleyen etkileşimli işleri dosya işinin batch'leri arasında çalıştır
+
+        Uzun bir dosya işi sürerken gelen tek metin istekleri işin bitmesini
+        beklemez; dosya işinin sayaçları bu sırada kenara alınır.
+        """
+        while True:
+            job = self.queue.claim_next(self.worker_id, self.lease_sec, min_priority=PRIORITY_INTERACTIVE)
+            if not job:
+                return
+            self.logger.info(f"Etkileşimli iş {job['id']} dosya işi arasında çalıştırılıyor")
+            with self.analyzer.suspended_stats():
+                self._run_job(job)
+
+    def _heartbeat_loop(self, job_id: str, stop: threading.Event):
+        """İş bitene kadar periyodik heartbeat yaz"""
+        while not stop.wait(self.lease_sec / 3):
+            try:
+                self.queue.heartbeat(job_id, self.worker_id)
+            except sqlite3.Error as e:
+                self.logger.warning(f"Heartbeat yazılamadı ({job_id}): {e}")
+
+    def _run_text_job(self, job: Dict):
+        from aggregates import LeaderAggregator
+
+        # Tek metin istekleri API slotlarını etkileşimli sınıftan alır
+        saved_priority = self.analyzer.config['priority']
+        self.analyzer.config['priority'] = 'interactive'
+        try:
+            result = self.analyzer.process_single_content(job['account_name'] or '', job['text'] or '')
+        finally:
+            self.analyzer.config['priority'] = saved_priority
+        results = [result] if result else []
+        aggregator = LeaderAggregator(self.analyzer.sentiment_columns)
+        aggregator.add_many(results)
+        self.queue.append_results(job['id'], results, 1, self.analyzer.stats['errors'],
+                                  aggregator.to_dict())
+        self.queue.finish(job['id'], self.analyzer.generate_report(results))
+
+    def _run_file_job(self, job: Dict):
+        from aggregates import LeaderAggregator, TrendAggregator
+        from file_readers import iter_record_batches, estimate_total_rows, get_file_ext
+        from result_records import ResultStore
+
+        # Dosya akıtılarak okunur; toplam önce tahmin edilir, sonunda kesinleşir
+        estimated_total = estimate_total_rows(job['input_file'])
+        self.queue.set_total(job['id'], estimated_total or 0)
+        batch_size = self.analyzer.config['batch_size']
+
+        # Küçük CSV'ler process_file'daki gibi pandas'sız okunur ve yazılır
+        light = (get_file_ext(job['input_file']) == 'csv' and estimated_total is not None
+                 and estimated_total <= self.analyzer.config['small_input_rows'])
+
+        # Sonuçlar sütunsal depoda girdi kayıt numarasıyla tutulur; metinler
+        # CSV yazılırken girdiden okunur. Yeniden kuyruğa alınan işler
+        # kaldıkları yerden devam eder, önceki sonuçlar kuyruktan akıtılır.
+        start_index = job['processed']
+        store = ResultStore(self.analyzer.record_layout, keep_text=False)
+        if start_index:
+            for row_id, result in self.queue.iter_results(job['id'], with_index=True):
+                store.append(result, row_id)
+        aggregator = LeaderAggregator(self.analyzer.sentiment_columns, job['aggregates'])
+        consumed = start_index
+
+        # Zaman sütunu verildiyse trend sayaçları akan özetle birlikte saklanır
+        timestamp_column = self.analyzer.config['timestamp_column']
+        trends = None
+        if timestamp_column:
+            trends = TrendAggregator(self.analyzer.sentiment_columns, (job['aggregates'] or {}).get('trends'))
+
+        for batch in iter_record_batches(job['input_file'], batch_size, skip=start_index, light=light):
+            if self.queue.is_cancelled(job['id']):
+                self.logger.info(f"İş {job['id']} iptal edildi")
+                return
+            if trends is not None and timestamp_column not in batch[0]:
+                raise ValueError(f"Zaman sütunu bulunamadı: {timestamp_column}")
+
+            positioned = self.analyzer.process_batch_parallel(batch, with_positions=True)
+            batch_results = [result for _, result in positioned]
+            row_ids = [consumed + position for position, _ in positioned]
+            store.extend(batch_results, row_ids)
+            aggregator.add_many(batch_results)
+            consumed += len(batch)
+
+            aggregates = aggregator.to_dict()
+            if trends is not None:
+                for position, result in positioned:
+                    trends.add(result, batch[position].get(timestamp_column))
+                aggregates['trends'] = trends.to_dict()
+            self.queue.append_results(job['id'], batch_results, len(batch),
+                                      self.analyzer.stats['errors'], aggregates, row_ids)
+            self._run_interactive_jobs()
+
+        self.queue.set_total(job['id'], consumed)
+        report = self.analyzer.generate_report(store)
+        if trends is not None:
+            report['trends'] = {'timestamp_column': timestamp_column,
+                                'granularity': self.analyzer.config['trend_granularity'],
+                                **trends.summary()}
+        if job['output_file']:
+            self.analyzer.write_csv(job['output_file'], store, input_file=job['input_file'], light=light)
+            if trends is not None:
+                report['trends']['file'] = self.analyzer.write_trends_csv(job['output_file'], trends)
+            report_file = job['output_file'].replace('.csv', '_report.json')
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+        self.queue.finish(job['id'], report)
+
+
+# Process içi arka plan worker'ları ((db, api_key) başına bir grup)
+_background_workers: Dict[tuple, List[threading.Thread]] = {}
+_background_lock = threading.Lock()
+
+
+def start_background_workers(queue: JobQueue, api_key: str, num_workers: int = 2,
+                             config: Optional[Dict] = None) -> List[threading.Thread]:
+    """
+    Aynı process içinde arka plan worker thread'leri başlat
+
+    Tekrarlanan çağrılar (ör. Streamlit rerun) mevcut thread'leri döndürür.
+
+    Args:
+        queue: İş kuyruğu
+        api_key: Google Gemini API anahtarı
+        num_workers: Worker thread sayısı (eşzamanlı iş sayısı)
+        config: PoliticalAnalysisSystem konfigürasyonu
+
+    Returns:
+        Çalışan worker thread'leri
+    """
+    key = (os.path.abspath(queue.db_path), api_key)
+    with _background_lock:
+        threads = [t for t in _background_workers.get(key, []) if t.is_alive()]
+        for n in range(len(threads), num_workers):
+            worker = JobWorker(queue, api_key, config, worker_id=f"bg-{os.getpid()}-{n + 1}")
+            thread = threading.Thread(target=worker.run_forever, name=worker.worker_id, daemon=True)
+            thread.start()
+            threads.append(thread)
+        _background_workers[key] = threads
+    return threads
+
+
+def _worker_main(db_path: str, api_key: str, config: Dict, worker_id: str):
+    """Worker process giriş noktası"""
+    worker = JobWorker(JobQueue(db_path), api_key, config, worker_id)
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def run_workers(db_path: str, api_key: str, num_workers: int = 2,
+                config: Optional[Dict] = None):
+    """
+    Worker process'lerini başlat ve bitmelerini bekle
+
+    Args:
+        db_path: Kuyruk veritabanı yolu
+        api_key: Google Gemini API anahtarı
+        num_workers: Worker process sayısı
+        config: PoliticalAnalysisSystem konfigürasyonu
+    """
+    JobQueue(db_path)  # Şemayı process'ler başlamadan oluştur
+
+    processes = []
+    for n in range(num_workers):
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(db_path, api_key, config or {}, f"worker-{n + 1}"),
+            daemon=True
+        )
+        process.start()
+        processes.append(process)
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+def print_job(job: Dict):
+    """İş durumunu yazdır"""
+    total = job['total'] or 0
+    pct = (job['processed'] / total * 100) if total else 0
+    print(f"🆔 {job['id']}  [{job['status']}]  {job['kind']}")
+    print(f"   İlerleme: {job['processed']}/{total} ({pct:.1f}%)  Hata: {job['errors']}")
+    if job.get('output_file'):
+        print(f"   Çıktı: {job['output_file']}")
+    if job.get('error'):
+        print(f"   Hata mesajı: {job['error']}")
+
+
+def main():
+    """Komut satırı arayüzü"""
+    # Sıcak analizörde sabitlenen ayarlar political_analyzer ile aynı seçeneklerle verilir
+    from political_analyzer import add_worker_arguments, worker_config
+
+    parser = argparse.ArgumentParser(description='🇹🇷 Siyasi Analiz İş Kuyruğu')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help=f'Kuyruk veritabanı (default: {DEFAULT_DB_PATH})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    worker_parser = subparsers.add_parser('worker', help='Worker daemon başlat')
+    worker_parser.add_argument('api_key', nargs='?', default=os.getenv('GOOGLE_API_KEY'),
+                               help='Google Gemini API anahtarı (default: GOOGLE_API_KEY)')
+    worker_parser.add_argument('--workers', type=int, default=2, help='Worker process sayısı (default: 2)')
+    worker_parser.add_argument('--batch-size', type=int, default=5, help='Batch boyutu (default: 5)')
+    worker_parser.add_argument('--threads', type=int, default=3, help='Worker başına thread sayısı (default: 3)')
+    worker_parser.add_argument('--rate-limit', type=float, default=1.5, help='Rate limit saniye (default: 1.5)')
+    worker_parser.add_argument('--max-retries', type=int, default=3, help='Maksimum retry sayısı (default: 3)')
+    add_worker_arguments(worker_parser)
+
+    submit_parser = subparsers.add_parser('submit', help='Dosya işi gönder')
+    submit_parser.add_argument('input_file', help='Girdi CSV veya Excel (.xlsx) dosyası')
+    submit_parser.add_argument('output_file', nargs='?', help='Çıktı CSV dosyası')
+    submit_parser.add_argument('--batch-size', type=int, help='İşe özel batch boyutu')
+    submit_parser.add_argument('--timestamp-column', metavar='COL',
+                               help='Saatlik/günlük lider trendleri için zaman sütunu')
+    submit_parser.add_argument('--trend-granularity', choices=['hour', 'day'],
+                               help='Trend tablosunun zaman çözünürlüğü (default: hour)')
+    submit_parser.add_argument('--wait', action='store_true', help='İş bitene kadar bekle')
+
+    text_parser = subparsers.add_parser('text', help='Tek metin işi gönder ve sonucu bekle')
+    text_parser.add_argument('text', help='İçerik metni')
+    text_parser.add_argument('--account', default='@anonymous', help='Hesap adı')
+    text_parser.add_argument('--timeout', type=float, default=120, help='Bekleme süresi (saniye)')
+
+    status_parser = subparsers.add_parser('status', help='İş durumunu göster')
+    status_parser.add_argument('job_id', nargs='?', help='İş ID (boşsa son işler)')
+
+    cancel_parser = subparsers.add_parser('cancel', help='İşi iptal et')
+    cancel_parser.add_argument('job_id', help='İş ID')
+
+    requeue_parser = subparsers.add_parser(
+        'requeue', help='İşi (boşsa worker\'ı çökmüş tüm işleri) kaldığı yerden devam etmek üzere kuyruğa al')
+    requeue_parser.add_argument('job_id', nargs='?', help='Çalışan veya başarısız iş ID')
+    requeue_parser.add_argument('--stale-after', type=float, default=DEFAULT_LEASE_SEC,
+                                help=f'Heartbeat zaman aşımı, saniye (default: {DEFAULT_LEASE_SEC})')
+
+    args = parser.parse_args()
+    queue = JobQueue(args.db)
+
+    if args.command == 'worker':
+        if not args.api_key:
+            print("❌ API anahtarı gerekli (argüman veya GOOGLE_API_KEY)")
+            sys.exit(1)
+        config = {
+            'batch_size': args.batch_size,
+            'max_workers': args.threads,
+            'rate_limit_sec': args.rate_limit,
+            'max_retries': args.max_retries,
+            'save_progress': False,
+            **worker_config(args)
+        }
+        print(f"🚀 {args.workers} worker başlatılıyor (kuyruk: {args.db})")
+        run_workers(args.db, args.api_key, args.workers, config)
+
+    elif args.command == 'submit':
+        config = {key: value for key, value in (('batch_size', args.batch_size),
+                                                 ('timestamp_column', args.timestamp_column),
+                                                 ('trend_granularity', args.trend_granularity)) if value}
+        job_id = queue.submit_file(args.input_file, args.output_file, config=config)
+        print(f"📥 İş kuyruğa eklendi: {job_id}")
+        if args.wait:
+            print_job(queue.wait(job_id))
+
+    elif args.command == 'text':
+        job_id = queue.submit_text(args.account, args.text)
+        job = queue.wait(job_id, timeout=args.timeout)
+        if job['status'] == STATUS_DONE:
+            print(json.dumps(queue.get_results(job_id), ensure_ascii=False, indent=2))
+        else:
+            print_job(job)
+            sys.exit(1)
+
+    elif args.command == 'status':
+        jobs = [queue.get_job(args.job_id)] if args.job_id else queue.list_jobs(limit=20)
+        for job in jobs:
+            if job:
+                print_job(job)
+
+    elif args.command == 'cancel':
+        print("🛑 İptal edildi" if queue.cancel(args.job_id) else "⚠️  İş iptal edilemedi")
+
+    elif args.command == 'requeue':
+        if args.job_id:
+            print("🔁 Kuyruğa alındı" if queue.requeue(args.job_id) else "⚠️  İş kuyruğa alınamadı")
+        else:
+            job_ids = queue.requeue_stale(args.stale_after)
+            print(f"🔁 {len(job_ids)} iş kuyruğa alındı" + (f": {', '.join(job_ids)}" if job_ids else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Lider Kayıt Defteri - Türk Siyasi Lider Analiz Sistemi
+
+Takip edilen liderlerin tek kaynağı. Prompt'lardaki lider listesi, yanıt
+şemaları, çıktı sütunları ve arayüzdeki isimler buradan üretilir. Varsayılan
+dört lider koda gömülüdür; farklı bir liste JSON dosyasıyla verilebilir
+(ANALYSIS_LEADERS_FILE ortam değişkeni veya leaders_file ayarı):
+
+[
+  {"code": "RTE", "name": "Recep Tayyip Erdoğan",
+   "description": "AK Parti, Cumhurbaşkanı", "short_name": "R.T. Erdoğan",
+   "aliases": ["erdoğan", "tayyip"]},
+  ...
+]
+"""
+
+import os
+import json
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+LEADERS_FILE_ENV = 'ANALYSIS_LEADERS_FILE'
+
+
+class Leader(NamedTuple):
+    """Takip edilen lider"""
+    code: str
+    name: str
+    description: str = ''
+    short_name: str = ''
+    aliases: Tuple[str, ...] = ()
+    sentiment_column: str = ''
+
+
+DEFAULT_LEADERS = [
+    Leader('RTE', 'Recep Tayyip Erdoğan',
+           'AK Parti, Cumhurbaşkanı, AKP Genel Başkanı', 'R.T. Erdoğan',
+           ('erdoğan', 'rte', 'tayyip', 'cumhurbaşkanı')),
+    # Sütun adı geriye dönük uyumluluk için 'İ' ile yazılır
+    Leader('ÖÖ', 'Özgür Özel',
+           'CHP Genel Başkanı, Muhalefet Lideri', 'Ö. Özel',
+           ('özgür özel', 'özgür', "özel'in", "özel'e", "özel'i"), 'ÖÖ_SENTİMENT'),
+    Leader('MY', 'Mansur Yavaş',
+           'Ankara Büyükşehir Belediye Başkanı, CHP', 'M. Yavaş',
+           ('mansur yavaş', 'mansur', "yavaş'ın", "yavaş'a")),
+    Leader('EI', 'Ekrem İmamoğlu',
+           'İstanbul Büyükşehir Belediye Başkanı, CHP Cumhurbaşkanı Adayı, CHP', 'E. İmamoğlu',
+           ('imamoğlu', 'ekrem')),
+]
+
+
+class LeaderRegistry:
+    """Liderlerden prompt bloklarını, şemaları ve sütunları üreten kayıt defteri"""
+
+    def __init__(self, leaders: Iterable[Leader]):
+        """
+        Kayıt defteri başlatıcı
+
+        Args:
+            leaders: Lider tanımları (kodlar benzersiz olmalı)
+
+        Raises:
+            ValueError: Liste boşsa veya kod tekrarlanıyorsa
+        """
+        self.leaders: List[Leader] = []
+        for leader in leaders:
+            self.leaders.append(leader._replace(
+                short_name=leader.short_name or leader.name,
+                aliases=tuple(a.lower() for a in leader.aliases) or (leader.name.split()[-1].lower(),),
+                sentiment_column=leader.sentiment_column or f'{leader.code}_SENTIMENT'
+            ))
+
+        codes = [leader.code for leader in self.leaders]
+        if not codes:
+            raise ValueError("En az bir lider tanımlanmalı")
+        if len(set(codes)) != len(codes):
+            raise ValueError(f"Tekrarlanan lider kodu: {codes}")
+
+        self.by_code = {leader.code: leader for leader in self.leaders}
+
+    def __iter__(self):
+        return iter(self.leaders)
+
+    def __len__(self):
+        return len(self.leaders)
+
+    @property
+    def codes(self) -> List[str]:
+        return [leader.code for leader in self.leaders]
+
+    @property
+    def names(self) -> Dict[str, str]:
+        """Kod -> tam ad"""
+        return {leader.code: leader.name for leader in self.leaders}
+
+    @property
+    def short_names(self) -> Dict[str, str]:
+        """Kod -> kısa ad"""
+        return {leader.code: leader.short_name for leader in self.leaders}
+
+    @property
+    def aliases(self) -> Dict[str, List[str]]:
+        """Kod -> metinde aranan takma adlar"""
+        return {leader.code: list(leader.aliases) for leader in self.leaders}
+
+    @property
+    def sentiment_columns(self) -> Dict[str, str]:
+        """Kod -> sentiment sütunu"""
+        return {leader.code: leader.sentiment_column for leader in self.leaders}
+
+    @property
+    def source_columns(self) -> Dict[str, str]:
+        """Kod -> sentiment kaynağı sütunu"""
+        return {leader.code: f'{leader.code}_SENTIMENT_SOURCE' for leader in self.leaders}
+
+    def output_columns(self) -> List[str]:
+        """CSV çıktısının sütun sırası"""
+        return (['ACCOUNT_NAME', 'TEXT']
+                + [f'IS_{code}' for code in self.codes]
+                + list(self.sentiment_columns.values())
+                + list(self.source_columns.values())
+                + ['CLASSIFICATION_SOURCE'])
+
+    def prompt_block(self) -> str:
+        """Sınıflandırma prompt'undaki lider listesi"""
+        return '\n'.join(
+            f"- {leader.code}: {leader.name}" + (f" ({leader.description})" if leader.description else '')
+            for leader in self.leaders
+        )
+
+    def json_example(self) -> str:
+        """Sınıflandırma prompt'undaki örnek JSON alanları"""
+        return '\n'.join(f'    "IS_{code}": 1 veya 0,' for code in self.codes)
+
+
+def leader_from_dict(data: Dict) -> Leader:
+    """JSON kaydından Leader oluştur"""
+    return Leader(
+        code=str(data['code']),
+        name=str(data['name']),
+        description=str(data.get('description', '')),
+        short_name=str(data.get('short_name', '')),
+        aliases=tuple(data.get('aliases', ())),
+        sentiment_column=str(data.get('sentiment_column', ''))
+    )
+
+
+def load_leaders(path: Optional[str] = None) -> LeaderRegistry:
+    """
+    Lider kayıt defterini yükle
+
+    Args:
+        path: JSON dosyası (None = ortam değişkeni, o da yoksa varsayılan liderler)
+
+    Returns:
+        LeaderRegistry
+    """
+    path = path or os.getenv(LEADERS_FILE_ENV)
+    if not path:
+        return DEFAULT_REGISTRY
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('leaders', [])
+    return LeaderRegistry(leader_from_dict(item) for item in data)
+
+
+DEFAULT_REGISTRY = LeaderRegistry(DEFAULT_LEADERS)
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+Sözlük Tabanlı Sentiment - Türk Siyasi Lider Analiz Sistemi
+
+API gerektirmeyen, Türkçe siyasi söyleme göre hazırlanmış küçük bir
+sözlükle çalışan sentiment motoru. Terimler lider adının geçtiği yerin
+çevresindeki pencerede puanlanır (aynı tweet'te bir lider övülüp diğeri
+eleştirilebilir). Her sonuç bir güven değeriyle döner; analizör yalnızca
+belirsiz satırları Gemini'ye gönderebilir, API hatasında da nötr yerine bu
+motorun sonucunu kullanır.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from leaders import DEFAULT_REGISTRY
+
+# Lider kodu -> metinde aranan takma adlar (küçük harf, kelime dizisi)
+LEADER_ALIASES = DEFAULT_REGISTRY.aliases
+
+# Kelime köklerine göre önekle eşleşen terimler (ekler kelimeye eklenir)
+POSITIVE_PREFIXES = [
+    'başarı', 'başardı', 'teşekkür', 'tebrik', 'destek', 'güzel', 'harika', 'müthiş',
+    'övgü', 'sevgi', 'seviyor', 'helal', 'bravo', 'umut', 'güçlü', 'kazan', 'zafer',
+    'hizmet', 'yatırım', 'müjde', 'iyileş', 'gurur', 'alkış', 'başkanım', 'yanında',
+    'hayırlı', 'kutla', 'takdir', 'değerli', 'mükemmel', 'efsane', 'onurlu', 'dürüst',
+    'adalet', 'mutlu', 'sevindir', 'çözüm', 'kurtar', 'güven',
+]
+NEGATIVE_PREFIXES = [
+    'başarısız', 'yolsuzluk', 'rüşvet', 'hırsız', 'yalan', 'istifa', 'skandal', 'kriz',
+    'eleştir', 'tepki', 'suçla', 'suçlu', 'ihanet', 'diktatör', 'zamlar', 'zamm', 'pahalı',
+    'fakir', 'yoksul', 'beceriksiz', 'rezalet', 'utanç', 'kötü', 'berbat', 'felaket',
+    'kaos', 'baskı', 'zulüm', 'hapis', 'tutuklan', 'gözaltı', 'saldır', 'hakaret',
+    'iftira', 'çöküş', 'yıkım', 'israf', 'sahtekar', 'öfke', 'protesto', 'şikayet',
+    'tehdit', 'umutsuz', 'güvensiz', 'adaletsiz', 'mutsuz', 'despot', 'yetersiz',
+]
+# Kısa/çok anlamlı terimler yalnızca tam kelime olarak eşleşir
+POSITIVE_WORDS = ['iyi', 'dua', 'doğru', 'yaşa', 'sağol']
+NEGATIVE_WORDS = ['zam', 'suç', 'yazık', 'ayıp', 'yuh']
+
+# Kendinden önceki NEGATION_SPAN kelimenin polaritesini çeviren olumsuzlayıcılar
+# (Türkçede olumsuzluk yüklemden sonra gelir: "iyi değil")
+NEGATORS = {'değil', 'yok', 'olmaz', 'olmadı'}
+NEGATION_SPAN = 2
+
+POSITIVE_EMOJI = '👏❤🙏💪👍🇹🇷😍🥰✌'
+NEGATIVE_EMOJI = '😡👎🤮🤬😠💩😤'
+
+# Lider adı çevresinde puanlanan kelime penceresi (her iki yönde)
+WINDOW = 8
+# Farklı cümledeki terimler için mesafeye eklenen ceza
+SENTENCE_PENALTY = 4
+# Takma ad bulunamadığında tüm metnin ağırlığı
+NO_ALIAS_WEIGHT = 0.5
+# |skor| bu eşiğin altındaysa etiket nötr
+POLARITY_MARGIN = 0.34
+
+# Eşleşen takma adın türüne göre bahsetme güveni (bkz. MentionMatcher)
+FULL_NAME_CONFIDENCE = 0.97
+MULTI_WORD_ALIAS_CONFIDENCE = 0.95
+SURNAME_CONFIDENCE = 0.9
+# Kesme işaretli ekli ad ("yavaş'ın") özel isim olarak kullanıldığını gösterir
+SUFFIXED_ALIAS_CONFIDENCE = 0.85
+# Ön ad, kısaltma ve unvanlar tek başına belirsizdir
+SINGLE_WORD_CONFIDENCE = 0.7
+
+_WORD_RE = re.compile(r"\w+(?:'\w+)?")
+_SENTENCE_RE = re.compile(r'[.!?\n]+')
+_TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+
+
+class LexiconResult(NamedTuple):
+    """Sözlük sentiment sonucu"""
+    sentiment: int
+    confidence: float
+    score: float
+
+
+def _build_matcher():
+    """Önek/kelime tablolarını uzundan kısaya sıralı tek listede topla"""
+    entries = [(p, 1) for p in POSITIVE_PREFIXES] + [(p, -1) for p in NEGATIVE_PREFIXES]
+    entries.sort(key=lambda e: len(e[0]), reverse=True)
+    words = {w: 1 for w in POSITIVE_WORDS}
+    words.update({w: -1 for w in NEGATIVE_WORDS})
+    return entries, words
+
+
+_PREFIX_ENTRIES, _EXACT_WORDS = _build_matcher()
+
+
+def tokenize(text: str) -> List[str]:
+    """Türkçe küçük harfe çevirip kelimelere ayır (kesme işaretli ekler korunur)"""
+    return _WORD_RE.findall(str(text).translate(_TURKISH_LOWER).lower())
+
+
+def tokenize_sentences(text: str) -> Tuple[List[str], np.ndarray]:
+    """Kelimeler ve her kelimenin cümle numarası"""
+    tokens: List[str] = []
+    sentence_ids: List[int] = []
+    for i, sentence in enumerate(_SENTENCE_RE.split(str(text))):
+        words = tokenize(sentence)
+        tokens.extend(words)
+        sentence_ids.extend([i] * len(words))
+    return tokens, np.asarray(sentence_ids, dtype=np.int64)
+
+
+def term_polarity(token: str) -> int:
+    """
+    Tek bir kelimenin sözlük polaritesi (-1, 0, 1)
+
+    >>> term_polarity('kötü'), term_polarity('kötüleşti'), term_polarity("istifası")
+    (-1, -1, -1)
+    >>> term_polarity('zam'), term_polarity('zaman')
+    (-1, 0)
+    """
+    stem = token.split("'", 1)[0]
+    value = _EXACT_WORDS.get(stem)
+    if value is not None:
+        return value
+    for prefix, polarity in _PREFIX_ENTRIES:
+        if stem.startswith(prefix):
+            return polarity
+    return 0
+
+
+def _alias_positions(tokens: List[str], aliases: Sequence[str]) -> List[int]:
+    """Takma adların geçtiği kelime indeksleri"""
+    positions = []
+    for alias in aliases:
+        parts = alias.split()
+        n = len(parts)
+        for i in range(len(tokens) - n + 1):
+            if all(tokens[i + k] == parts[k] or tokens[i + k].startswith(parts[k] + "'")
+                   for k in range(n)):
+                positions.append(i)
+    return positions
+
+
+class MentionMatcher:
+    """
+    Takma ad eşleşmesiyle API'siz lider bahsetme tahmini
+
+    Tam ad ve soyadı eşleşmeleri yüksek, ön ad/unvan gibi çok anlamlı tek
+    kelimeler düşük güven alır. Spekülatif sentiment, yalnızca eşik
+    üstündeki liderler için sınıflandırmayı beklemeden istek başlatır.
+    """
+
+    def __init__(self, registry=DEFAULT_REGISTRY):
+        """
+        Eşleştirici başlatıcı
+
+        Args:
+            registry: Lider kayıt defteri (ad ve takma adlar)
+        """
+        self.patterns: Dict[str, List[Tuple[str, float]]] = {}
+        for leader in registry:
+            name = ' '.join(tokenize(leader.name))
+            surname = name.split()[-1]
+            entries = {name: FULL_NAME_CONFIDENCE}
+            for alias in leader.aliases:
+                alias = ' '.join(tokenize(alias))
+                if ' ' in alias:
+                    confidence = MULTI_WORD_ALIAS_CONFIDENCE
+                elif alias == surname:
+                    confidence = SURNAME_CONFIDENCE
+                elif "'" in alias:
+                    confidence = SUFFIXED_ALIAS_CONFIDENCE
+                else:
+                    confidence = SINGLE_WORD_CONFIDENCE
+                entries[alias] = max(entries.get(alias, 0.0), confidence)
+            # Yüksek güvenli kalıplar önce denenir; ilk eşleşme liderin güvenidir
+            self.patterns[leader.code] = sorted(entries.items(), key=lambda e: e[1], reverse=True)
+
+    def confidences(self, text: str) -> Dict[str, float]:
+        """
+        Metinde adı geçen liderler ve bahsetme güvenleri
+
+        Args:
+            text: İçerik metni
+
+        Returns:
+            Lider kodu -> güven (eşleşmeyen liderler yer almaz)
+        """
+        tokens = tokenize(text)
+        found = {}
+        for code, entries in self.patterns.items():
+            for alias, confidence in entries:
+                if _alias_positions(tokens, [alias]):
+                    found[code] = confidence
+                    break
+        return found
+
+    def confident_mentions(self, text: str, threshold: float) -> List[str]:
+        """Güveni eşiğin üstündeki lider kodları"""
+        return [code for code, confidence in self.confidences(text).items() if confidence >= threshold]
+
+
+class LexiconSentimentEngine:
+    """Lider penceresine duyarlı, metni bir kez kelimelere ayırıp tüm liderleri puanlayan sözlük motoru"""
+
+    def __init__(self, aliases: Optional[Dict[str, List[str]]] = None, window: int = WINDOW):
+        """
+        Motor başlatıcı
+
+        Args:
+            aliases: Lider kodu -> takma adlar (None = LEADER_ALIASES)
+            window: Lider adı çevresindeki pencere genişliği
+        """
+        self.aliases = aliases or LEADER_ALIASES
+        self.window = window
+
+    @staticmethod
+    def _distances(sentence_ids: np.ndarray, positions: List[int]) -> np.ndarray:
+        """Her kelimenin en yakın takma ada mesafesi (cümle cezası dahil)"""
+        idx = np.arange(len(sentence_ids))
+        positions = np.asarray(positions)
+        distance = np.abs(idx[:, None] - positions[None, :]) + \
+            SENTENCE_PENALTY * (sentence_ids[:, None] != sentence_ids[positions][None, :])
+        return distance.min(axis=1)
+
+    def _polarity_sums(self, text: str, leader_codes: Sequence[str]) -> np.ndarray:
+        """
+        Pencere içindeki ağırlıklı pozitif/negatif toplamları
+
+        Metin bir kez kelimelere ayrılır; polariteler ve takma ad mesafeleri
+        istenen tüm liderler için aynı kelime dizisinden hesaplanır.
+
+        Args:
+            text: İçerik metni
+            leader_codes: Puanlanacak lider kodları
+
+        Returns:
+            (lider sayısı, 2) boyutlu pozitif/negatif toplamları
+        """
+        tokens, sentence_ids = tokenize_sentences(text)
+        polarities = np.array([term_polarity(t) for t in tokens], dtype=np.float32)
+
+        # Olumsuzlayıcıdan önceki kelimelerin polaritesini çevir
+        for i, token in enumerate(tokens):
+            if token in NEGATORS:
+                polarities[max(i - NEGATION_SPAN, 0):i] *= -1
+
+        # Metinde adı geçen her liderin kelime başına en yakın mesafesi
+        distances = {}
+        for code, aliases in self.aliases.items():
+            positions = _alias_positions(tokens, aliases)
+            if positions:
+                distances[code] = self._distances(sentence_ids, positions)
+
+        emoji_pos = sum(text.count(e) for e in POSITIVE_EMOJI) * 0.5
+        emoji_neg = sum(text.count(e) for e in NEGATIVE_EMOJI) * 0.5
+
+        sums = np.empty((len(leader_codes), 2), dtype=np.float32)
+        for row, leader_code in enumerate(leader_codes):
+            distance = distances.get(leader_code)
+            if distance is not None:
+                weights = np.where(distance <= self.window, 1.0 - distance / (self.window + 1), 0.0)
+
+                # Başka bir liderin adına daha yakın terimler o lidere aittir
+                others = [d for code, d in distances.items() if code != leader_code]
+                if others:
+                    weights[np.min(others, axis=0) < distance] = 0.0
+            else:
+                weights = np.full(len(tokens), NO_ALIAS_WEIGHT)
+
+            weighted = polarities * weights
+            sums[row, 0] = weighted[weighted > 0].sum() + emoji_pos
+            sums[row, 1] = -weighted[weighted < 0].sum() + emoji_neg
+        return sums
+
+    @staticmethod
+    def _results(sums: np.ndarray) -> List[LexiconResult]:
+        """Pozitif/negatif toplamlarından etiket, güven ve skor (vektörel)"""
+        pos, neg = sums[:, 0], sums[:, 1]
+        hits = pos + neg
+
+        score = (pos - neg) / (hits + 1.0)
+        sentiment = np.where(score >= POLARITY_MARGIN, 1, np.where(score <= -POLARITY_MARGIN, -1, 0))
+
+        # Nötr: hiç terim yoksa orta güven, çelişkili terimler varsa düşük güven
+        neutral_conf = 0.5 / (1.0 + np.minimum(pos, neg))
+        confidence = np.where(sentiment != 0, np.abs(score), neutral_conf)
+
+        return [LexiconResult(int(s), round(float(c), 3), round(float(v), 3))
+                for s, c, v in zip(sentiment, confidence, score)]
+
+    def score_leaders(self, text: str, leader_codes: Sequence[str]) -> List[LexiconResult]:
+        """
+        Tek metni birden fazla lider için puanla
+
+        Metin bir kez kelimelere ayrılır; her lider kendi penceresinden
+        puanlanır.
+
+        Args:
+            text: İçerik metni
+            leader_codes: Lider kodları
+
+        Returns:
+            Her lider için LexiconResult (aynı sırada)
+        """
+        if not len(leader_codes):
+            return []
+        return self._results(self._polarity_sums(text, leader_codes))
+
+    def score_batch(self, texts: Sequence[str], leader_codes: Sequence[str]) -> List[LexiconResult]:
+        """
+        Metin/lider çiftlerini toplu puanla
+
+        Aynı metne ait çiftler gruplanır, her metin bir kez kelimelere
+        ayrılır; etiket ve güven hesabı tüm çiftler üzerinde vektöreldir.
+
+        Args:
+            texts: İçerik metinleri
+            leader_codes: Her metin için lider kodu
+
+        Returns:
+            Her çift için LexiconResult
+        """
+        if not len(texts):
+            return []
+
+        groups: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            groups.setdefault(text, []).append(i)
+
+        sums = np.empty((len(texts), 2), dtype=np.float32)
+        for text, rows in groups.items():
+            sums[rows] = self._polarity_sums(text, [leader_codes[i] for i in rows])
+        return self._results(sums)
+
+    def score(self, text: str, leader_code: str) -> LexiconResult:
+        """Tek bir metin/lider çifti için puan"""
+        return self.score_batch([text], [leader_code])[0]
@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+Yerel Lider Sınıflandırıcı - Türk Siyasi Lider Analiz Sistemi
+
+Geçmiş çıktı CSV'lerindeki IS_* etiketlerinden eğitilen, yalnızca NumPy ile
+çalışan hafif bir sınıflandırıcı. Metinler hashing vectorizer ile seyrek
+özelliklere çevrilir, her lider için bir lojistik regresyon (Adagrad ile)
+öğrenilir. Analizör, tüm liderler için emin olunan satırları LLM'e
+göndermeden etiketler; yalnızca belirsiz satırlar classify_by_leader'a gider.
+
+Kullanım:
+  python local_classifier.py train results_*.csv --model local_model.npz
+"""
+
+import re
+import sys
+import zlib
+import argparse
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_N_FEATURES = 2 ** 18
+
+# Kelime kökü yerine kullanılan önek uzunluğu ("imamoğlunun" -> "imamo")
+PREFIX_LEN = 5
+
+_WORD_RE = re.compile(r'\w+')
+_TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+
+
+def tokenize(text: str) -> List[str]:
+    """Türkçe küçük harfe çevirip kelimelere ayır"""
+    return _WORD_RE.findall(str(text).translate(_TURKISH_LOWER).lower())
+
+
+class HashingVectorizer:
+    """Kelime, kelime ikilisi ve önek özelliklerini sabit boyuta hash'leyen vectorizer"""
+
+    def __init__(self, n_features: int = DEFAULT_N_FEATURES):
+        """
+        Vectorizer başlatıcı
+
+        Args:
+            n_features: Özellik uzayı boyutu
+        """
+        self.n_features = n_features
+
+    def features(self, text: str) -> List[int]:
+        """Tek bir metnin özellik indeksleri"""
+        words = tokenize(text)
+        feats = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        feats += [f"{w[:PREFIX_LEN]}~" for w in words if len(w) > PREFIX_LEN]
+        n = self.n_features
+        return [zlib.crc32(f.encode('utf-8')) % n for f in feats]
+
+    def transform(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Metinleri CSR biçiminde seyrek matrise çevir
+
+        Args:
+            texts: Metinler
+
+        Returns:
+            (indptr, indices, values) - her satır L2 normalize edilmiştir
+        """
+        indptr = [0]
+        indices: List[int] = []
+        values: List[float] = []
+        for text in texts:
+            row = self.features(text)
+            indices.extend(row)
+            values.extend([1.0 / np.sqrt(len(row))] * len(row) if row else [])
+            indptr.append(len(indices))
+
+        return (np.asarray(indptr, dtype=np.int64),
+                np.asarray(indices, dtype=np.int64),
+                np.asarray(values, dtype=np.float32))
+
+
+class LocalLeaderClassifier:
+    """Lider başına lojistik regresyon (çok etiketli)"""
+
+    def __init__(self, leader_codes: Sequence[str], n_features: int = DEFAULT_N_FEATURES):
+        """
+        Sınıflandırıcı başlatıcı
+
+        Args:
+            leader_codes: Lider kodları (IS_<kod> etiketleri)
+            n_features: Özellik uzayı boyutu
+        """
+        self.leader_codes = list(leader_codes)
+        self.vectorizer = HashingVectorizer(n_features)
+        self.weights = np.zeros((n_features, len(self.leader_codes)), dtype=np.float32)
+        self.bias = np.zeros(len(self.leader_codes), dtype=np.float32)
+
+    def _logits(self, indptr, indices, values) -> Tuple[np.ndarray, np.ndarray]:
+        n_rows = len(indptr) - 1
+        row_ids = np.repeat(np.arange(n_rows), np.diff(indptr))
+        logits = np.tile(self.bias, (n_rows, 1))
+        np.add.at(logits, row_ids, self.weights[indices] * values[:, None])
+        return logits, row_ids
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Lider bahsetme olasılıkları
+
+        Args:
+            texts: Metinler
+
+        Returns:
+            (satır, lider) boyutunda olasılık matrisi
+        """
+        logits, _ = self._logits(*self.vectorizer.transform(texts))
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def fit(self, texts: Sequence[str], labels: np.ndarray, epochs: int = 5,
+            learning_rate: float = 0.5, l2: float = 1e-6, batch_size: int = 256,
+            seed: int = 0):
+        """
+        Modeli eğit
+
+        Args:
+            texts: Metinler
+            labels: (satır, lider) boyutunda 0/1 etiketler
+            epochs: Epoch sayısı
+            learning_rate: Adagrad öğrenme oranı
+            l2: L2 düzenlileştirme katsayısı
+            batch_size: Mini-batch boyutu
+            seed: Karıştırma tohumu
+        """
+        indptr, indices, values = self.vectorizer.transform(texts)
+        labels = np.asarray(labels, dtype=np.float32)
+        rng = np.random.default_rng(seed)
+
+        grad_sq = np.full_like(self.weights, 1e-8)
+        bias_grad_sq = np.full_like(self.bias, 1e-8)
+
+        for _ in range(epochs):
+            order = rng.permutation(len(labels))
+            for start in range(0, len(order), batch_size):
+                rows = order[start:start + batch_size]
+                starts, ends = indptr[rows], indptr[rows + 1]
+                sub_indptr = np.concatenate([[0], np.cumsum(ends - starts)])
+                take = np.repeat(starts - sub_indptr[:-1], ends - starts) + np.arange(sub_indptr[-1])
+                sub_indices, sub_values = indices[take], values[take]
+
+                logits, row_ids = self._logits(sub_indptr, sub_indices, sub_values)
+                error = 1.0 / (1.0 + np.exp(-logits)) - labels[rows]
+
+                features = np.unique(sub_indices)
+                grad = np.zeros((len(features), self.weights.shape[1]), dtype=np.float32)
+                np.add.at(grad, np.searchsorted(features, sub_indices),
+                          error[row_ids] * sub_values[:, None])
+                grad = grad / len(rows) + l2 * self.weights[features]
+
+                grad_sq[features] += grad ** 2
+                self.weights[features] -= learning_rate * grad / np.sqrt(grad_sq[features])
+
+                bias_grad = error.mean(axis=0)
+                bias_grad_sq += bias_grad ** 2
+                self.bias -= learning_rate * bias_grad / np.sqrt(bias_grad_sq)
+
+        return self
+
+    def classify(self, texts: Sequence[str], threshold: float) -> List[Optional[Dict]]:
+        """
+        Emin olunan satırları sınıflandır
+
+        Bir satır, tüm liderler için olasılık ≥ threshold veya ≤ 1 - threshold
+        ise yerel olarak etiketlenir; aksi halde None döner (LLM'e gider).
+
+        Args:
+            texts: Metinler
+            threshold: Güven eşiği (0.5-1.0)
+
+        Returns:
+            Satır başına sınıflandırma sözlüğü veya None
+        """
+        if not len(texts):
+            return []
+
+        proba = self.predict_proba(texts)
+        confident = ((proba >= threshold) | (proba <= 1.0 - threshold)).all(axis=1)
+
+        results: List[Optional[Dict]] = []
+        for row, is_confident in zip(proba, confident):
+            if not is_confident:
+                results.append(None)
+                continue
+            classification = {f"IS_{code}": int(p >= 0.5) for code, p in zip(self.leader_codes, row)}
+            classification['reasoning'] = f"Yerel model (güven ≥ {threshold:.2f})"
+            results.append(classification)
+        return results
+
+    def save(self, path: str):
+        """Modeli .npz olarak kaydet"""
+        np.savez_compressed(path, weights=self.weights, bias=self.bias,
+                            leader_codes=np.array(self.leader_codes))
+
+    @classmethod
+    def load(cls, path: str) -> 'LocalLeaderClassifier':
+        """Kaydedilmiş modeli yükle"""
+        with np.load(path, allow_pickle=False) as data:
+            model = cls(list(data['leader_codes']), data['weights'].shape[0])
+            model.weights = data['weights'].astype(np.float32)
+            model.bias = data['bias'].astype(np.float32)
+        return model
+
+
+def load_training_data(paths: Iterable[str], chunksize: int = 10000,
+                       trust_legacy: bool = False) -> Tuple[List[str], np.ndarray, List[str]]:
+    """
+    Çıktı CSV'lerinden eğitim verisi topla
+
+    Yalnızca etiketi LLM'den gelen (CLASSIFICATION_SOURCE == 'llm') ve tüm
+    IS_* değerleri 0/1 olan satırlar kullanılır; yerel model, hesap profili
+    veya anahtar kelime fallback'i etiketleri modeli kendi hatalarıyla
+    eğitir. Kaynak sütunu olmayan eski çıktılarda etiketin nereden geldiği
+    bilinmez; bu dosyalar varsayılan olarak atlanır, trust_legacy ile tüm
+    satırları LLM etiketi sayılır.
+
+    Args:
+        paths: Çıktı CSV dosyaları
+        chunksize: Okuma parçası boyutu
+        trust_legacy: Kaynak sütunu olmayan dosyaları LLM etiketli kabul et
+
+    Returns:
+        (metinler, etiket matrisi, lider kodları)
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'results.csv')
+    >>> with open(path, 'w', encoding='utf-8') as f:
+    ...     _ = f.write('TEXT,IS_RTE,CLASSIFICATION_SOURCE\\na,1,llm\\nb,0,local\\nc,1,fallback\\nd,0,llm\\n')
+    >>> texts, labels, codes = load_training_data([path])
+    >>> texts, labels.ravel().tolist(), codes
+    (['a', 'd'], [1.0, 0.0], ['RTE'])
+
+    >>> legacy = os.path.join(os.path.dirname(path), 'legacy.csv')
+    >>> with open(legacy, 'w', encoding='utf-8') as f:
+    ...     _ = f.write('TEXT,IS_RTE\\ne,1\\n')
+    >>> load_training_data([path, legacy])[0]
+    ['a', 'd']
+    >>> load_training_data([path, legacy], trust_legacy=True)[0]
+    ['a', 'd', 'e']
+    """
+    import pandas as pd
+
+    texts: List[str] = []
+    labels: List[np.ndarray] = []
+    leader_codes: Optional[List[str]] = None
+
+    for path in paths:
+        for chunk in pd.read_csv(path, encoding='utf-8', chunksize=chunksize):
+            if 'CLASSIFICATION_SOURCE' in chunk.columns:
+                chunk = chunk[chunk['CLASSIFICATION_SOURCE'] == 'llm']
+            elif not trust_legacy:
+                print(f"Uyarı: {path} CLASSIFICATION_SOURCE sütunu içermiyor, atlandı "
+                      f"(LLM etiketli saymak için --trust-legacy)", file=sys.stderr)
+                break
+
+            label_columns = [col for col in chunk.columns if col.startswith('IS_')]
+            codes = [col[3:] for col in label_columns]
+            if leader_codes is None:
+                leader_codes = codes
+            elif codes != leader_codes:
+                raise ValueError(f"{path}: lider sütunları uyuşmuyor ({codes} != {leader_codes})")
+
+            chunk = chunk.dropna(subset=['TEXT'] + label_columns)
+            values = chunk[label_columns].to_numpy()
+            valid = np.isin(values, (0, 1)).all(axis=1)
+            texts.extend(chunk['TEXT'].astype(str)[valid])
+            labels.append(values[valid].astype(np.float32))
+
+    if not texts:
+        raise ValueError("Eğitim için uygun satır bulunamadı")
+
+    return texts, np.concatenate(labels), leader_codes
+
+
+def evaluate(model: LocalLeaderClassifier, texts: Sequence[str], labels: np.ndarray,
+             threshold: float) -> Dict:
+    """
+    Ayrılmış veri üzerinde doğruluk ve kapsama ölç
+
+    Returns:
+        {'rows', 'exact_accuracy', 'coverage', 'confident_accuracy'}
+    """
+    proba = model.predict_proba(texts)
+    predicted = (proba >= 0.5).astype(np.float32)
+    exact = (predicted == labels).all(axis=1)
+    confident = ((proba >= threshold) | (proba <= 1.0 - threshold)).all(axis=1)
+
+    return {
+        'rows': len(labels),
+        'exact_accuracy': round(float(exact.mean()), 4),
+        'coverage': round(float(confident.mean()), 4),
+        'confident_accuracy': round(float(exact[confident].mean()), 4) if confident.any() else None
+    }
+
+
+def main():
+    """Komut satırı arayüzü"""
+    parser = argparse.ArgumentParser(description='Yerel lider sınıflandırıcı')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train = subparsers.add_parser('train', help='Çıktı CSV\'lerinden model eğit')
+    train.add_argument('csv_files', nargs='+', help='Geçmiş çıktı CSV dosyaları')
+    train.add_argument('--model', default='local_model.npz', help='Model dosyası (default: local_model.npz)')
+    train.add_argument('--epochs', type=int, default=5, help='Epoch sayısı (default: 5)')
+    train.add_argument('--features', type=int, default=DEFAULT_N_FEATURES,
+                       help=f'Hash özellik sayısı (default: {DEFAULT_N_FEATURES})')
+    train.add_argument('--holdout', type=float, default=0.1,
+                       help='Değerlendirme için ayrılan oran (default: 0.1)')
+    train.add_argument('--threshold', type=float, default=0.9,
+                       help='Raporlanan güven eşiği (default: 0.9)')
+    train.add_argument('--trust-legacy', action='store_true',
+                       help='CLASSIFICATION_SOURCE sütunu olmayan eski çıktıları LLM etiketli say')
+
+    args = parser.parse_args()
+
+    texts, labels, leader_codes = load_training_data(args.csv_files, trust_legacy=args.trust_legacy)
+    order = np.random.default_rng(0).permutation(len(texts))
+    n_holdout = int(len(order) * args.holdout)
+    test_rows, train_rows = order[:n_holdout], order[n_holdout:]
+
+    model = LocalLeaderClassifier(leader_codes, args.features)
+    model.fit([texts[i] for i in train_rows], labels[train_rows], epochs=args.epochs)
+    model.save(args.model)
+
+    print(f"Model kaydedildi: {args.model} ({len(train_rows)} satır, liderler: {leader_codes})")
+    if n_holdout:
+        metrics = evaluate(model, [texts[i] for i in test_rows], labels[test_rows], args.threshold)
+        print(f"Ayrılmış veri: {metrics}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Logging Kurulumu - Türk Siyasi Lider Analiz Sistemi
+
+Worker thread'leri log kaydını yalnızca bir kuyruğa bırakır; dosya ve
+konsol yazımı tek bir arka plan thread'inde (QueueListener) yapılır.
+Böylece 429/timeout fırtınalarında bile disk ve stdout I/O'su API
+çağrılarını bekletmez. Dosyaya satır başına bir JSON kaydı yazılır.
+
+İstek başına debug olayları örneklenir (varsayılan: her 100 olaydan biri);
+DEBUG seviyesi kapalıyken maliyet tek bir seviye kontrolüdür.
+"""
+
+import sys
+import json
+import queue
+import atexit
+import logging
+import itertools
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+DEFAULT_LOG_FILE = 'political_analysis.log'
+DEFAULT_SAMPLE_EVERY = 100
+
+_CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+_sample_every = DEFAULT_SAMPLE_EVERY
+_sample_counters: Dict[str, 'itertools.count'] = {}
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Kaydı tek satırlık JSON'a çevir (extra={'fields': {...}} alanları eklenir)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(log_file: Optional[str] = DEFAULT_LOG_FILE, level: int = logging.INFO,
+                      json_lines: bool = True, sample_every: int = DEFAULT_SAMPLE_EVERY) -> QueueListener:
+    """
+    Kuyruk tabanlı logging'i kur (process başına yalnızca bir kez)
+
+    Sonraki çağrılar mevcut dinleyiciyi döndürür; handler'lar çoğalmaz.
+
+    Args:
+        log_file: Log dosyası (None = yalnızca konsol)
+        level: Kök logger seviyesi
+        json_lines: Dosyaya JSON satırları yaz (False = düz metin)
+        sample_every: Örneklenen debug olaylarından kaçta biri yazılır
+
+    Returns:
+        Arka plan yazıcısı (QueueListener)
+    """
+    global _listener, _sample_every
+
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        handlers = []
+        if log_file:
+            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler.setFormatter(JsonLineFormatter() if json_lines else logging.Formatter(_CONSOLE_FORMAT))
+            handlers.append(file_handler)
+
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(_CONSOLE_FORMAT))
+        handlers.append(console_handler)
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        root.addHandler(QueueHandler(log_queue))
+        root.setLevel(level)
+        # Bağlantı havuzunun DEBUG kayıtları istek başına satır üretir
+        logging.getLogger('urllib3').setLevel(max(level, logging.INFO))
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+        _sample_every = max(int(sample_every), 1)
+        return _listener
+
+
+def shutdown_logging():
+    """Kuyruktaki kayıtları yazıp arka plan thread'ini durdur"""
+    global _listener
+
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def log_sampled(logger: logging.Logger, event: str, **fields):
+    """
+    İstek başına debug olayını örnekleyerek yaz
+
+    Her olay adı için ayrı sayaç tutulur; ilk olay ve sonrasında her
+    sample_every'inci olay yazılır.
+
+    Args:
+        logger: Hedef logger
+        event: Olay adı (ör. 'api_response')
+        **fields: JSON kaydına eklenecek alanlar
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+
+    counter = _sample_counters.get(event)
+    if counter is None:
+        counter = _sample_counters.setdefault(event, itertools.count())
+    n = next(counter)
+    if n % _sample_every:
+        return
+
+    fields['event'] = event
+    fields['sample_every'] = _sample_every
+    logger.debug(event, extra={'fields': fields})
@@ -13,22 +13,77 @@ python political_analyzer.py input.csv output.csv YOUR_API_KEY
 
 import os
 import sys
+import csv
 import json
 import time
-import requests
-import pandas as pd
-from typing import Dict, List, Optional, Tuple
-from tqdm import tqdm
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 import argparse
 from pathlib import Path
 import logging
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import partial
 import threading
-from colorama import init, Fore, Style
+from contextlib import contextmanager
+from request_scheduler import get_scheduler
+from request_hedging import RequestHedger
+from file_readers import (iter_record_batches, iter_record_chunks, estimate_total_rows, validate_columns,
+                          get_file_ext)
+from prompts import (get_prompt, parse_json_object, parse_json_array, parse_sentiment,
+                     classification_schema, validate_classification, SENTIMENT_SCHEMA,
+                     multi_sentiment_schema, validate_multi_sentiment, format_batch_rows,
+                     batch_classification_schema, batch_sentiment_schema,
+                     validate_batch_classification, validate_batch_sentiment)
+from leaders import load_leaders, DEFAULT_REGISTRY
+from text_preprocess import prepare_text
+from account_profiles import AccountProfileStore
+from usage_tracker import UsageTracker
+from logging_setup import configure_logging, log_sampled
+from result_records import RecordLayout, ResultStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Küçük girdilerde (bu kadar kayıt ve altı) pandas yerine csv modülü kullanılır
+SMALL_INPUT_ROWS = 5000
+
+
+class _LazyColorama:
+    """
+    colorama.Fore/Style yerine geçen tembel vekil
+
+    colorama ilk renk kullanımında import edilir ve init() o zaman çağrılır;
+    `--help` gibi çıktı üretmeyen çağrılar bu maliyeti ödemez.
+    """
+
+    _initialized = False
+
+    def __init__(self, name: str):
+        self._name = name
+        self._target = None
+
+    def __getattr__(self, attr: str):
+        if self._target is None:
+            import colorama
+
+            if not _LazyColorama._initialized:
+                colorama.init()
+                _LazyColorama._initialized = True
+            self._target = getattr(colorama, self._name)
+        return getattr(self._target, attr)
+
+
+Fore = _LazyColorama('Fore')
+Style = _LazyColorama('Style')
+
+# Varsayılan liderlerin sentiment çıktı sütunları (ÖÖ sütunu geriye dönük uyumluluk için 'İ' ile yazılır)
+SENTIMENT_COLUMNS = DEFAULT_REGISTRY.sentiment_columns
+
+# Sentiment kaynağı sütunları (llm / lexicon / lexicon_fallback / account_prior)
+SENTIMENT_SOURCE_COLUMNS = DEFAULT_REGISTRY.source_columns
 
-# Colorama'yı başlat
-init()
+# API/ayrıştırma hatasında dönen varsayılan sınıflandırmanın açıklaması
+FALLBACK_REASONING = "API hatası - varsayılan değerler"
 
 
 class PoliticalAnalysisSystem:
@@ -58,42 +113,282 @@ class PoliticalAnalysisSystem:
             'timeout_sec': kwargs.get('timeout_sec', 30),
             'save_progress': kwargs.get('save_progress', True),
             'max_workers': kwargs.get('max_workers', 3),
+            'priority': kwargs.get('priority', 'bulk'),
+            'max_concurrent_requests': kwargs.get('max_concurrent_requests', 4),
+            'prompt_versions': kwargs.get('prompt_versions', {}),
+            'json_mode': kwargs.get('json_mode', True),
+            'max_reasks': kwargs.get('max_reasks', 1),
+            'normalize_text': kwargs.get('normalize_text', True),
+            'max_input_tokens': kwargs.get('max_input_tokens'),
+            'local_model': kwargs.get('local_model'),
+            'local_confidence': kwargs.get('local_confidence', 0.9),
+            'sentiment_engine': kwargs.get('sentiment_engine', 'llm'),
+            'lexicon_confidence': kwargs.get('lexicon_confidence', 0.7),
+            'account_profiles': kwargs.get('account_profiles'),
+            'account_shortcut': kwargs.get('account_shortcut', False),
+            'account_min_rows': kwargs.get('account_min_rows', 50),
+            'account_purity': kwargs.get('account_purity', 0.97),
+            'account_revalidate_every': kwargs.get('account_revalidate_every', 20),
+            'leaders_file': kwargs.get('leaders_file'),
+            'multi_target_sentiment': kwargs.get('multi_target_sentiment', True),
+            'price_input_per_million': kwargs.get('price_input_per_million', 0.075),
+            'price_output_per_million': kwargs.get('price_output_per_million', 0.30),
+            'log_file': kwargs.get('log_file', 'political_analysis.log'),
+            'log_level': kwargs.get('log_level', 'INFO'),
+            'log_json': kwargs.get('log_json', True),
+            'debug_sample_every': kwargs.get('debug_sample_every', 100),
+            'memory_profile': kwargs.get('memory_profile', False),
+            'memory_snapshot_every': kwargs.get('memory_snapshot_every', 50),
+            'small_input_rows': kwargs.get('small_input_rows', SMALL_INPUT_ROWS),
+            'coalesce_max_items': kwargs.get('coalesce_max_items', 8),
+            'coalesce_wait_ms': kwargs.get('coalesce_wait_ms', 10),
+            'speculative_sentiment': kwargs.get('speculative_sentiment', False),
+            'speculative_confidence': kwargs.get('speculative_confidence', 0.85),
+            'hedge_requests': kwargs.get('hedge_requests', False),
+            'hedge_budget_pct': kwargs.get('hedge_budget_pct', 5.0),
+            'hedge_min_samples': kwargs.get('hedge_min_samples', 20),
+            'timestamp_column': kwargs.get('timestamp_column'),
+            'trend_granularity': kwargs.get('trend_granularity', 'hour'),
         }
 
-        # Lider tanımları
-        self.leaders = {
-            'RTE': 'Recep Tayyip Erdoğan',
-            'ÖÖ': 'Özgür Özel',
-            'MY': 'Mansur Yavaş',
-            'EI': 'Ekrem İmamoğlu'
+        # Lider tanımları (varsayılan dört lider veya JSON kayıt defteri)
+        self.leader_registry = load_leaders(self.config['leaders_file'])
+        self.leaders = self.leader_registry.names
+        self.sentiment_columns = self.leader_registry.sentiment_columns
+        self.source_columns = self.leader_registry.source_columns
+
+        # Sonuç satırları için paylaşılan kompakt sütun düzeni
+        self.record_layout = RecordLayout(self.leader_registry)
+
+        # Prompt şablonları (sürüm seçilebilir, varsayılan: kayıtlı en güncel);
+        # lider listesi şablona bir kez gömülür
+        self.prompts = {
+            name: get_prompt(name, self.config['prompt_versions'].get(name))
+            for name in ('classification', 'sentiment', 'multi_sentiment',
+                         'classification_batch', 'multi_sentiment_batch')
         }
+        static_leader_prompt = 'leader_block' not in self.prompts['classification'].fields
+        for name in ('classification', 'classification_batch'):
+            self.prompts[name] = self.prompts[name].partial(
+                leader_block=self.leader_registry.prompt_block(),
+                json_example=self.leader_registry.json_example()
+            )
+
+        # Yapılandırılmış çıktı (JSON modu) şemaları
+        self.response_schemas = {
+            'classification': classification_schema(self.leaders),
+            'classification_batch': batch_classification_schema(self.leaders),
+            'sentiment': SENTIMENT_SCHEMA
+        }
+
+        # Çevrimdışı sözlük sentiment motoru (ilk kullanımda kurulur, bkz. lexicon)
+        self._lexicon = None
+        self._mention_matcher = None
+
+        # Hesap bazında birikmiş dağılımlar (opsiyonel)
+        self.account_profiles = None
+        if self.config['account_profiles']:
+            self.account_profiles = AccountProfileStore(
+                self.config['account_profiles'],
+                min_rows=self.config['account_min_rows'],
+                purity=self.config['account_purity'],
+                revalidate_every=self.config['account_revalidate_every']
+            )
 
         # İstatistikler
         self.stats = {
             'processed': 0,
             'errors': 0,
             'start_time': None,
-            'total_items': 0
+            'total_items': 0,
+            'parse_errors': 0,
+            'reasks': 0,
+            'input_tokens': 0,
+            'input_tokens_raw': 0,
+            'truncated_rows': 0,
+            'local_classified': 0,
+            'account_prior_rows': 0,
+            'sentiment_sources': {'llm': 0, 'lexicon': 0, 'lexicon_fallback': 0, 'account_prior': 0},
+            'speculative': {'rows': 0, 'issued': 0, 'used': 0, 'discarded': 0}
         }
 
         # Thread-safe için lock
         self.stats_lock = threading.Lock()
 
+        # API yanıtlarındaki token kullanımı (aşama/lider/kayıt bazında)
+        self.usage = UsageTracker({
+            'input_per_million': self.config['price_input_per_million'],
+            'output_per_million': self.config['price_output_per_million']
+        })
+
+        # Kalıcı HTTP bağlantı havuzu (worker'lar arasında paylaşılır)
+        import requests
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(self.config['max_workers'], 10)
+        )
+        self.session.mount('https://', adapter)
+
+        # Aynı API anahtarını kullanan tüm örneklerle paylaşılan istek zamanlayıcı
+        self.scheduler = get_scheduler(
+            api_key, max_concurrent=self.config['max_concurrent_requests']
+        )
+
+        # p95'i aşan çağrılar için bütçeli kopya istekler (opsiyonel, bkz. request_hedging.py)
+        self.hedger = None
+        if self.config['hedge_requests']:
+            self.hedger = RequestHedger(budget_pct=self.config['hedge_budget_pct'],
+                                        min_samples=self.config['hedge_min_samples'],
+                                        max_workers=self.scheduler.max_concurrent)
+
+        # Worker bekleme/çalışma süreleri (yalnızca --profile ile, bkz. profiling.py)
+        self.thread_times = None
+
+        # Batch sınırlarında bellek ölçümleri (yalnızca memory_profile ile)
+        self.memory = None
+
         # Logging kurulumu
         self.setup_logging()
 
+        if static_leader_prompt and self.leader_registry is not DEFAULT_REGISTRY:
+            self.logger.warning(
+                f"{self.prompts['classification'].key} sabit lider listesi içeriyor; "
+                "özel lider kayıt defteriyle classification@v2 kullanın"
+            )
+
+        # Sınıflandırmayla paralel spekülatif sentiment istekleri (opsiyonel)
+        self._speculation_pool = None
+        if self.config['speculative_sentiment']:
+            self._speculation_pool = ThreadPoolExecutor(max_workers=self.config['max_workers'],
+                                                        thread_name_prefix='speculative')
+
+        # Eşzamanlı tekil istekleri çok satırlı prompt'larda birleştirici (ilk kullanımda kurulur)
+        self._coalescer = None
+        self._coalescer_lock = threading.Lock()
+
+        # Geçmiş etiketlerden eğitilmiş yerel sınıflandırıcı (opsiyonel)
+        self.local_classifier = None
+        if self.config['local_model']:
+            self.load_local_classifier(self.config['local_model'])
+
+    @property
+    def lexicon(self):
+        """Sözlük sentiment motoru (triage ve API hatası yedeği; numpy ilk kullanımda yüklenir)"""
+        if self._lexicon is None:
+            from lexicon_sentiment import LexiconSentimentEngine
+
+            self._lexicon = LexiconSentimentEngine(self.leader_registry.aliases)
+        return self._lexicon
+
+    @property
+    def mention_matcher(self):
+        """Takma ad tabanlı bahsetme tahmini (spekülatif sentiment için, bkz. lexicon_sentiment.py)"""
+        if self._mention_matcher is None:
+            from lexicon_sentiment import MentionMatcher
+
+            self._mention_matcher = MentionMatcher(self.leader_registry)
+        return self._mention_matcher
+
     def setup_logging(self):
-        """Logging sistemini kur"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('political_analysis.log', encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
+        """Kuyruk tabanlı logging'i kur (process başına yalnızca bir kez, bkz. logging_setup.py)"""
+        configure_logging(
+            log_file=self.config['log_file'],
+            level=getattr(logging, str(self.config['log_level']).upper(), logging.INFO),
+            json_lines=self.config['log_json'],
+            sample_every=self.config['debug_sample_every']
         )
         self.logger = logging.getLogger(__name__)
 
+    def load_local_classifier(self, model_path: str):
+        """
+        Yerel sınıflandırıcıyı yükle
+
+        Model tüm liderleri kapsamıyorsa kullanılmaz (tüm satırlar LLM'e gider).
+
+        Args:
+            model_path: local_classifier.py ile eğitilmiş .npz dosyası
+        """
+        from local_classifier import LocalLeaderClassifier
+
+        try:
+            model = LocalLeaderClassifier.load(model_path)
+        except Exception as e:
+            self.logger.error(f"Yerel model yüklenemedi: {e}")
+            return
+
+        missing = [code for code in self.leaders if code not in model.leader_codes]
+        if missing:
+            self.logger.warning(f"Yerel model şu liderleri içermiyor, devre dışı: {missing}")
+            return
+
+        self.local_classifier = model
+        self.logger.info(f"Yerel sınıflandırıcı yüklendi: {model_path}")
+
+    def local_classify(self, texts: List[str]) -> List[Optional[Dict]]:
+        """
+        Metinleri yerel modelle sınıflandır (emin olunamayanlar None)
+
+        Args:
+            texts: İçerik metinleri
+
+        Returns:
+            Satır başına sınıflandırma veya None
+        """
+        if self.local_classifier is None:
+            return [None] * len(texts)
+
+        try:
+            return self.local_classifier.classify(texts, self.config['local_confidence'])
+        except Exception as e:
+            self.logger.error(f"Yerel sınıflandırma hatası: {e}")
+            return [None] * len(texts)
+
+    def reset_stats(self):
+        """İstatistikleri sıfırla (aynı örnekle yeni bir iş başlatırken)"""
+        with self.stats_lock:
+            self.stats.update({
+                'processed': 0,
+                'errors': 0,
+                'start_time': time.time(),
+                'total_items': 0,
+                'parse_errors': 0,
+                'reasks': 0,
+                'input_tokens': 0,
+                'input_tokens_raw': 0,
+                'truncated_rows': 0,
+                'local_classified': 0,
+                'account_prior_rows': 0,
+                'sentiment_sources': {'llm': 0, 'lexicon': 0, 'lexicon_fallback': 0, 'account_prior': 0},
+                'speculative': {'rows': 0, 'issued': 0, 'used': 0, 'discarded': 0}
+            })
+        self.usage.reset()
+        if self.hedger is not None:
+            self.hedger.reset_stats()
+
+    @contextmanager
+    def suspended_stats(self):
+        """
+        Sayaçları geçici olarak kenara al
+
+        Dosya işinin batch'leri arasında çalıştırılan kısa bir iş kendi
+        sayaçlarıyla (reset_stats) çalışabilir; çıkışta önceki sayaçlar,
+        token kullanımı ve kopya istek sayıları geri yüklenir.
+        """
+        with self.stats_lock:
+            saved = dict(self.stats)
+        usage = (self.usage.total, self.usage.by_stage, self.usage.by_leader, self.usage.rows)
+        hedge = self.hedger.stats() if self.hedger is not None else None
+        try:
+            yield
+        finally:
+            with self.stats_lock:
+                self.stats.update(saved)
+            self.usage.total, self.usage.by_stage, self.usage.by_leader, self.usage.rows = usage
+            if hedge is not None:
+                self.hedger.reset_stats(hedge)
+
     def print_header(self):
         """Başlık yazdır"""
         print(f"{Fore.CYAN}{'=' * 60}")
@@ -111,26 +406,61 @@ class PoliticalAnalysisSystem:
 
         return {'processed': [], 'last_index': 0}
 
+    def load_result_store(self, progress: Dict, store_file: str) -> Tuple[ResultStore, int]:
+        """
+        Devam edilecek sonuç deposunu yükle (yoksa boş depo)
+
+        Eski biçimli progress dosyaları (sonuçlar JSON içinde) kayıt numarası
+        içermediği için kullanılamaz; bu durumda iş baştan başlar.
+
+        Args:
+            progress: load_progress çıktısı
+            store_file: save() ile yazılmış .npz dosyası
+
+        Returns:
+            (metin tutmayan ResultStore, devam edilecek kayıt numarası)
+        """
+        if progress.get('last_index') and os.path.exists(store_file):
+            try:
+                return ResultStore.load(self.record_layout, store_file), progress['last_index']
+            except Exception as e:
+                self.logger.warning(f"Progress sonuçları okunamadı, baştan başlanıyor: {e}")
+        elif progress.get('last_index'):
+            self.logger.warning("Progress dosyasında sonuç deposu yok (eski biçim), baştan başlanıyor")
+
+        return ResultStore(self.record_layout, keep_text=False), 0
+
     def save_progress(self, progress_file: str, data: Dict):
         """Progress kaydet"""
         if self.config['save_progress']:
             try:
                 with open(progress_file, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                    json.dump(data, f, ensure_ascii=False, indent=2, default=dict)
             except Exception as e:
                 self.logger.error(f"Progress kaydedilemedi: {e}")
 
-    def make_api_request(self, prompt: str, retries: int = 0) -> Optional[str]:
+    def make_api_request(self, prompt: str, retries: int = 0,
+                         priority: Optional[str] = None,
+                         response_schema: Optional[Dict] = None, stage: str = 'other',
+                         leader_codes: Sequence[str] = ()) -> Optional[str]:
         """
         Gemini API'ye istek gönder
 
         Args:
             prompt: Gönderilecek prompt
             retries: Retry sayısı
+            priority: Öncelik sınıfı (varsayılan: config['priority'])
+            response_schema: JSON modu için yanıt şeması (None = serbest metin)
+            stage: Token kullanımının yazılacağı aşama
+            leader_codes: Token kullanımının paylaştırılacağı liderler
 
         Returns:
             API yanıtı veya None
         """
+        import requests
+
+        priority = priority or self.config['priority']
+
         payload = {
             "contents": [{
                 "parts": [{
@@ -139,28 +469,52 @@ class PoliticalAnalysisSystem:
             }]
         }
 
+        if response_schema and self.config['json_mode']:
+            payload["generationConfig"] = {
+                "responseMimeType": "application/json",
+                "responseSchema": response_schema
+            }
+
         headers = {
             'Content-Type': 'application/json'
         }
 
         try:
-            response = requests.post(
-                f"{self.base_url}?key={self.api_key}",
-                json=payload,
-                headers=headers,
-                timeout=self.config['timeout_sec']
-            )
+            queued = time.perf_counter()
+            self.scheduler.acquire(priority)
+            started = time.perf_counter()
+            send = partial(self._post_in_slot, payload, headers)
+            if self.hedger is None:
+                response = send()
+            else:
+                response = self.hedger.call(
+                    send, stage,
+                    try_slot=lambda: self.scheduler.try_acquire(priority),
+                    succeeded=lambda r: r.status_code == 200,
+                    discard=self._discard_hedged_response
+                )
+
+            if self.thread_times is not None:
+                self.thread_times.add('slot_wait', started - queued)
+                self.thread_times.add('http', time.perf_counter() - started)
+            log_sampled(self.logger, 'api_response', stage=stage, status=response.status_code,
+                        retries=retries, latency_ms=round((time.perf_counter() - started) * 1000, 1))
 
             if response.status_code == 200:
                 data = response.json()
+                self.usage.record(stage, data.get('usageMetadata'), leader_codes)
                 return data['candidates'][0]['content']['parts'][0]['text']
 
             elif response.status_code == 429:  # Rate limit
                 if retries < self.config['max_retries']:
                     wait_time = (2 ** retries) * 2  # Exponential backoff
                     self.logger.warning(f"Rate limit, {wait_time}s bekleniyor...")
+                    self.scheduler.penalize(wait_time)
                     time.sleep(wait_time)
-                    return self.make_api_request(prompt, retries + 1)
+                    if self.thread_times is not None:
+                        self.thread_times.add('backoff', wait_time)
+                    return self.make_api_request(prompt, retries + 1, priority, response_schema,
+                                                 stage, leader_codes)
 
             else:
                 self.logger.error(f"API Error: {response.status_code} - {response.text}")
@@ -169,7 +523,10 @@ class PoliticalAnalysisSystem:
             if retries < self.config['max_retries']:
                 self.logger.warning(f"Timeout, retry {retries + 1}")
                 time.sleep(2)
-                return self.make_api_request(prompt, retries + 1)
+                if self.thread_times is not None:
+                    self.thread_times.add('backoff', 2)
+                return self.make_api_request(prompt, retries + 1, priority, response_schema,
+                                             stage, leader_codes)
             else:
                 self.logger.error("API timeout")
 
@@ -178,6 +535,32 @@ class PoliticalAnalysisSystem:
 
         return None
 
+    def _post_in_slot(self, payload: Dict, headers: Dict):
+        """
+        Tek HTTP denemesi; çağrılmadan önce zamanlayıcı slotu alınmış olmalı
+
+        Slot, yanıt gelince veya hata olunca bırakılır.
+        """
+        try:
+            return self.session.post(
+                f"{self.base_url}?key={self.api_key}",
+                json=payload,
+                headers=headers,
+                timeout=self.config['timeout_sec']
+            )
+        finally:
+            self.scheduler.release()
+
+    def _discard_hedged_response(self, response):
+        """Kaybeden kopya denemenin token kullanımını 'hedge' aşamasına yaz ve yanıtı kapat"""
+        try:
+            if response.status_code == 200:
+                self.usage.record('hedge', response.json().get('usageMetadata'))
+        except ValueError:
+            pass
+        finally:
+            response.close()
+
     def classify_by_leader(self, text: str, account_name: str) -> Dict:
         """
         Agent 1: İçeriği liderlere göre sınıflandır
@@ -189,60 +572,37 @@ class PoliticalAnalysisSystem:
         Returns:
             Sınıflandırma sonucu
         """
-        prompt = f'''
-Sen bir Türk siyasi analiz uzmanısın. Aşağıdaki sosyal medya içeriğini ya da haber metnini analiz ederek, bu içeriğin hangi siyasi lideri ilgilendirdiğini belirle.
-
-Liderler:
-- RTE: Recep Tayyip Erdoğan (AK Parti, Cumhurbaşkanı, AKP Genel Başkanı)
-- OO: Özgür Özel (CHP Genel Başkanı, Muhalefet Lideri)
-- MY: Mansur Yavaş (Ankara Büyükşehir Belediye Başkanı, CHP)
-- EI: Ekrem İmamoğlu (İstanbul Büyükşehir Belediye Başkanı, CHP Cumhurbaşkanı Adayı, CHP)
-
-Kurallar:
-1. İçerik bir lideri doğrudan bahsediyorsa, o lidere +1 ver
-2. İçerik bir liderin görevinden bahsediyorsa, o lidere +1 ver
-3. Diğer tüm liderlere 0 ver.
-4. Eğer hiçbir lider açık şekilde ilgili değilse, hepsine 0 ver
-5. Birden fazla lider ilgiliyse, hepsine +1 ilgisiz olanlara 0 ver.
-
-İçerik: "{text}"
-Hesap: "{account_name}"
-
-Sonucu sadece JSON formatında ver:
-{{
-    "IS_RTE": 1 veya 0,
-    "IS_ÖÖ": 1 veya 0,
-    "IS_MY": 1 veya 0,
-    "IS_EI": 1 veya 0,
-    "reasoning": "Kısa açıklama"
-}}
-'''
-
-        response = self.make_api_request(prompt)
-
-        if response:
-            try:
-                # JSON'u bul ve parse et
-                import re
-                json_match = re.search(r'\{.*\}', response, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
-            except json.JSONDecodeError as e:
-                self.logger.error(f"JSON parse error: {e}")
+        prompt = self.prompts['classification'].render(text=text, account_name=account_name)
+        schema = self.response_schemas['classification']
+
+        # Yalnızca bozuk/eksik yanıt veren içerik yeniden sorulur
+        for attempt in range(self.config['max_reasks'] + 1):
+            if attempt:
+                with self.stats_lock:
+                    self.stats['reasks'] += 1
+
+            response = self.make_api_request(prompt, response_schema=schema, stage='classification')
+            if not response:
+                break
+
+            classification = validate_classification(parse_json_object(response), self.leaders)
+            if classification is not None:
+                return classification
+
+            with self.stats_lock:
+                self.stats['parse_errors'] += 1
+            self.logger.error("JSON parse error: yanıt şemaya uymuyor")
 
         # Fallback değerler
         with self.stats_lock:
             self.stats['errors'] += 1
 
-        return {
-            "IS_RTE": 0,
-            "IS_ÖÖ": 0,
-            "IS_MY": 0,
-            "IS_EI": 0,
-            "reasoning": "API hatası - varsayılan değerler"
-        }
+        fallback = {f"IS_{code}": 0 for code in self.leaders}
+        fallback["reasoning"] = FALLBACK_REASONING
+        return fallback
 
-    def analyze_sentiment_for_leader(self, text: str, account_name: str, leader_name: str) -> int:
+    def analyze_sentiment_for_leader(self, text: str, account_name: str, leader_name: str,
+                                     default: Optional[int] = 0) -> Optional[int]:
         """
         Agent 2: Belirli bir lider için sentiment analizi
 
@@ -250,51 +610,320 @@ Sonucu sadece JSON formatında ver:
             text: Analiz edilecek metin
             account_name: Hesap adı
             leader_name: Lider adı
+            default: API/ayrıştırma hatasında dönecek değer
+
+        Returns:
+            Sentiment değeri (-1, 0, 1) veya hata durumunda default
+        """
+        prompt = self.prompts['sentiment'].render(
+            text=text, account_name=account_name, leader_name=leader_name
+        )
+        leader_codes = [code for code, name in self.leaders.items() if name == leader_name]
+
+        for attempt in range(self.config['max_reasks'] + 1):
+            if attempt:
+                with self.stats_lock:
+                    self.stats['reasks'] += 1
+
+            response = self.make_api_request(prompt, response_schema=self.response_schemas['sentiment'],
+                                             stage='sentiment', leader_codes=leader_codes)
+            if not response:
+                break
+
+            sentiment = parse_sentiment(response)
+            if sentiment is not None:
+                return sentiment
+
+            with self.stats_lock:
+                self.stats['parse_errors'] += 1
+
+        with self.stats_lock:
+            self.stats['errors'] += 1
+
+        return default  # Varsayılan nötr
+
+    def analyze_sentiment_multi(self, text: str, account_name: str,
+                                leader_codes: List[str]) -> Dict[str, int]:
+        """
+        Agent 2 (çok hedefli): Bahsedilen tüm liderler için tek çağrıda sentiment
+
+        Yanıtta eksik/geçersiz kalan liderler için yalnızca onlar yeniden sorulur.
+
+        Args:
+            text: Analiz edilecek metin
+            account_name: Hesap adı
+            leader_codes: Bahsedilen lider kodları
+
+        Returns:
+            Lider kodu -> sentiment (başarısız liderler yer almaz)
+        """
+        results = {}
+        pending = list(leader_codes)
+
+        for attempt in range(self.config['max_reasks'] + 1):
+            if attempt:
+                with self.stats_lock:
+                    self.stats['reasks'] += 1
+
+            prompt = self.prompts['multi_sentiment'].render(
+                leader_list='\n'.join(f"- {code}: {self.leaders[code]}" for code in pending),
+                text=text, account_name=account_name
+            )
+            response = self.make_api_request(prompt, response_schema=multi_sentiment_schema(pending),
+                                             stage='multi_sentiment', leader_codes=pending)
+            if not response:
+                break
+
+            valid = validate_multi_sentiment(parse_json_object(response), pending)
+            results.update(valid)
+            pending = [code for code in pending if code not in valid]
+            if not pending:
+                break
+
+            with self.stats_lock:
+                self.stats['parse_errors'] += 1
+
+        if pending:
+            with self.stats_lock:
+                self.stats['errors'] += 1
+
+        return results
+
+    def classify_batch(self, rows: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+        """
+        Agent 1 (çok satırlı): Birden fazla içeriği tek çağrıda sınıflandır
+
+        Geçersiz veya eksik kalan kayıtlar None döner; bunlar
+        process_single_content içinde tekil çağrıyla (re-ask dahil) sorulur.
+
+        Args:
+            rows: (hesap adı, hazırlanmış metin) çiftleri
+
+        Returns:
+            Kayıt sırasıyla sınıflandırma veya None
+        """
+        if not rows:
+            return []
+
+        prompt = self.prompts['classification_batch'].render(rows=format_batch_rows(rows))
+        response = self.make_api_request(prompt, response_schema=self.response_schemas['classification_batch'],
+                                         stage='classification_batch')
+        if not response:
+            return [None] * len(rows)
+
+        results = validate_batch_classification(parse_json_array(response), self.leaders, len(rows))
+        invalid = sum(result is None for result in results)
+        if invalid:
+            with self.stats_lock:
+                self.stats['parse_errors'] += 1
+            self.logger.warning(f"Çok satırlı sınıflandırma: {invalid}/{len(rows)} kayıt geçersiz, tekil sorulacak")
+        return results
+
+    def analyze_sentiment_batch(self, rows: List[Tuple[str, str]],
+                                leader_lists: List[List[str]]) -> List[Dict[str, int]]:
+        """
+        Agent 2 (çok satırlı): Birden fazla içeriğin sentiment'ini tek çağrıda al
+
+        Args:
+            rows: (hesap adı, hazırlanmış metin) çiftleri
+            leader_lists: Kayıt sırasıyla bahsedilen lider kodları
 
         Returns:
-            Sentiment değeri (-1, 0, 1)
+            Kayıt sırasıyla lider kodu -> sentiment (eksik liderler tekil sorulur)
+        """
+        if not rows:
+            return []
+
+        codes = list(dict.fromkeys(code for leader_codes in leader_lists for code in leader_codes))
+        prompt = self.prompts['multi_sentiment_batch'].render(
+            leader_list='\n'.join(f"- {code}: {self.leaders[code]}" for code in codes),
+            rows=format_batch_rows(rows, leader_lists)
+        )
+        response = self.make_api_request(prompt, response_schema=batch_sentiment_schema(codes),
+                                         stage='multi_sentiment_batch', leader_codes=codes)
+        if not response:
+            return [{} for _ in rows]
+
+        results = validate_batch_sentiment(parse_json_array(response), leader_lists)
+        if any(len(valid) < len(leader_codes) for valid, leader_codes in zip(results, leader_lists)):
+            with self.stats_lock:
+                self.stats['parse_errors'] += 1
+        return results
+
+    def start_speculative_sentiment(self, text: str, account_name: str) -> Optional[Tuple[List[str], Future]]:
+        """
+        Bahsetmesi neredeyse kesin liderler için sentiment isteğini sınıflandırmayı beklemeden başlat
+
+        Yalnızca speculative_sentiment açık ve motor 'llm' iken çalışır;
+        hesap öncülü olan liderler atlanır.
+
+        Args:
+            text: Hazırlanmış metin
+            account_name: Hesap adı
+
+        Returns:
+            (spekülatif lider kodları, sonuç Future'ı) veya None
+        """
+        if self._speculation_pool is None or self.config['sentiment_engine'] != 'llm':
+            return None
+
+        codes = self.mention_matcher.confident_mentions(text, self.config['speculative_confidence'])
+        if self.account_profiles is not None and self.config['account_shortcut']:
+            codes = [code for code in codes
+                     if self.account_profiles.prior_sentiment(account_name, code, text) is None]
+        if not codes:
+            return None
+
+        with self.stats_lock:
+            self.stats['speculative']['rows'] += 1
+            self.stats['speculative']['issued'] += len(codes)
+        return codes, self._speculation_pool.submit(self._speculative_sentiments, text, account_name, codes)
+
+    def _speculative_sentiments(self, text: str, account_name: str, codes: List[str]) -> Dict[str, int]:
         """
-        prompt = f'''
-Sen bir politik sentiment analiz uzmanısın. 
+        Spekülatif sentiment çağrısı (normal yolla aynı prompt'lar, re-ask yok)
 
-Aşağıdaki sosyal medya içeriği ya da haberi "{leader_name}" hakkındaki duygusal tonunu "{leader_name}" lidere göre siyasi bir uzman gibi analiz et.
-Bu haber ya da medya içeriği bu liderle ilgili pozitif bir algı mı negatif bir algı mı?
+        Hatalar istatistiklere yazılmaz; eksik kalan liderler sınıflandırmadan
+        sonra normal yoldan sorulur.
+        """
+        if len(codes) > 1 and self.config['multi_target_sentiment']:
+            prompt = self.prompts['multi_sentiment'].render(
+                leader_list='\n'.join(f"- {code}: {self.leaders[code]}" for code in codes),
+                text=text, account_name=account_name
+            )
+            response = self.make_api_request(prompt, response_schema=multi_sentiment_schema(codes),
+                                             stage='speculative_sentiment', leader_codes=codes)
+            return validate_multi_sentiment(parse_json_object(response), codes) if response else {}
+
+        results = {}
+        for code in codes:
+            prompt = self.prompts['sentiment'].render(
+                text=text, account_name=account_name, leader_name=self.leaders[code]
+            )
+            response = self.make_api_request(prompt, response_schema=self.response_schemas['sentiment'],
+                                             stage='speculative_sentiment', leader_codes=[code])
+            sentiment = parse_sentiment(response) if response else None
+            if sentiment is not None:
+                results[code] = sentiment
+        return results
 
-İçerik: "{text}"
-Hesap: "{account_name}"
+    def collect_speculative_sentiment(self, speculative: Tuple[List[str], Future], mentioned: List[str],
+                                      llm_sentiments: Optional[Dict[str, int]] = None) -> Optional[Dict[str, int]]:
+        """
+        Spekülatif sonuçlardan sınıflandırmayla uyuşanları al
 
-Sentiment kategorileri:
-- 1: Pozitif (övgü, destek, beğeni)
-- 0: Nötr (tarafsız bahsetme, objektif, yalnızca bahsetme)
-- -1: Negatif (eleştiri, saldırı, olumsuz)
+        Sınıflandırma hiçbir spekülatif lideri doğrulamıyorsa istek
+        beklenmez; sonucu arka planda tamamlanıp atılır.
 
-Sadece sayısal değeri ver (1, 0, veya -1):
-'''
+        Args:
+            speculative: start_speculative_sentiment çıktısı
+            mentioned: Sınıflandırmada bahsedilen lider kodları
+            llm_sentiments: Önceden alınmış LLM sonuçları (öncelikli)
 
-        response = self.make_api_request(prompt)
+        Returns:
+            Lider kodu -> sentiment (resolve_sentiments'e aktarılır)
+        """
+        codes, future = speculative
+        confirmed = [code for code in codes if code in mentioned]
 
-        if response:
+        results = {}
+        if confirmed:
             try:
-                # Sayısal değeri çıkar
-                import re
-                number_match = re.search(r'-?[01]', response.strip())
-                if number_match:
-                    return int(number_match.group())
-            except ValueError:
-                pass
+                results = future.result()
+            except Exception as e:
+                self.logger.warning(f"Spekülatif sentiment hatası: {e}")
 
+        used = {code: results[code] for code in confirmed if code in results}
         with self.stats_lock:
-            self.stats['errors'] += 1
+            self.stats['speculative']['used'] += len(used)
+            self.stats['speculative']['discarded'] += len(codes) - len(confirmed)
+
+        merged = {**used, **(llm_sentiments or {})}
+        return merged or None
+
+    def resolve_sentiments(self, text: str, account_name: str, leader_codes: List[str],
+                           llm_sentiments: Optional[Dict[str, int]] = None) -> Dict[str, Tuple[int, str]]:
+        """
+        Bahsedilen liderlerin sentiment'ini uygun kaynaktan belirle
+
+        'llm' modunda liderler Gemini'ye sorulur (birden fazla lider varsa
+        tek çok hedefli çağrıyla); 'hybrid' modunda sözlük
+        motoru yeterince eminse API çağrısı yapılmaz; 'lexicon' modunda hiç
+        API çağrısı yapılmaz. API hatasında sonuç sözlük motorundan alınır.
+        Hesap kısa devresi açıksa tutumu sabit hesaplarda öncül kullanılır.
+
+        Args:
+            text: Analiz edilecek metin
+            account_name: Hesap adı
+            leader_codes: Bahsedilen lider kodları
+            llm_sentiments: Çok satırlı çağrıdan önceden alınmış LLM sonuçları (eksik liderler ayrıca sorulur)
 
-        return 0  # Varsayılan nötr
+        Returns:
+            Lider kodu -> (sentiment, kaynak)
+        """
+        engine = self.config['sentiment_engine']
+        resolved = {}
+
+        if self.account_profiles is not None and self.config['account_shortcut']:
+            for code in leader_codes:
+                prior = self.account_profiles.prior_sentiment(account_name, code, text)
+                if prior is not None:
+                    resolved[code] = (prior, 'account_prior')
+            leader_codes = [code for code in leader_codes if code not in resolved]
+
+        lexicon_results = {}
+        if engine != 'llm' and leader_codes:
+            scores = self.lexicon.score_leaders(text, leader_codes)
+            lexicon_results = dict(zip(leader_codes, scores))
+
+        llm_codes = []
+        for code in leader_codes:
+            lexicon = lexicon_results.get(code)
+            if lexicon and (engine == 'lexicon' or lexicon.confidence >= self.config['lexicon_confidence']):
+                resolved[code] = (lexicon.sentiment, 'lexicon')
+            else:
+                llm_codes.append(code)
 
-    def process_single_content(self, account_name: str, text: str) -> Optional[Dict]:
+        llm_results = {code: llm_sentiments[code] for code in llm_codes
+                       if llm_sentiments and code in llm_sentiments}
+        pending = [code for code in llm_codes if code not in llm_results]
+
+        if len(pending) > 1 and self.config['multi_target_sentiment']:
+            llm_results.update(self.analyze_sentiment_multi(text, account_name, pending))
+        else:
+            for code in pending:
+                sentiment = self.analyze_sentiment_for_leader(
+                    text, account_name, self.leaders[code], default=None
+                )
+                if sentiment is not None:
+                    llm_results[code] = sentiment
+
+        for code in llm_codes:
+            if code in llm_results:
+                resolved[code] = (llm_results[code], 'llm')
+            else:
+                lexicon = lexicon_results.get(code) or self.lexicon.score(text, code)
+                resolved[code] = (lexicon.sentiment, 'lexicon_fallback')
+
+        with self.stats_lock:
+            for _, source in resolved.values():
+                self.stats['sentiment_sources'][source] += 1
+
+        return resolved
+
+    def process_single_content(self, account_name: str, text: str,
+                               local_classification: Optional[Dict] = None,
+                               batch_classification: Optional[Dict] = None,
+                               llm_sentiments: Optional[Dict[str, int]] = None) -> Optional[Dict]:
         """
         Tek bir içeriği işle
 
         Args:
             account_name: Hesap adı
             text: İçerik metni
+            local_classification: Batch için önceden hesaplanmış yerel sınıflandırma
+            batch_classification: Çok satırlı çağrıdan alınmış LLM sınıflandırması
+            llm_sentiments: Çok satırlı çağrıdan alınmış LLM sentiment'leri
 
         Returns:
             İşlem sonucu
@@ -302,43 +931,68 @@ Sadece sayısal değeri ver (1, 0, veya -1):
         if not text or not text.strip():
             return None
 
+        self.usage.start_row()
+        row_started, cpu_started = time.perf_counter(), time.thread_time()
         try:
-            # Agent 1: Lider sınıflandırması
-            classification = self.classify_by_leader(text, account_name)
+            # Ön işleme: normalize et ve token bütçesine sığdır (çıktıdaki TEXT değişmez)
+            prepared = prepare_text(text, self.config['max_input_tokens'],
+                                    self.config['normalize_text'])
+            prompt_text = prepared.text
+
+            # Agent 1: Lider sınıflandırması (hesap öncülü veya yerel model eminse LLM'e gidilmez)
+            classification = None
+            speculative = None
+            if self.account_profiles is not None and self.config['account_shortcut']:
+                classification = self.account_profiles.prior_classification(account_name, self.leaders, prompt_text)
+                classification_source = 'account_prior'
+
+            if classification is None:
+                if local_classification is None and self.local_classifier is not None:
+                    local_classification = self.local_classify([text])[0]
+
+                if local_classification is not None:
+                    classification = local_classification
+                    classification_source = 'local'
+                else:
+                    if batch_classification is None:
+                        speculative = self.start_speculative_sentiment(prompt_text, account_name)
+                    classification = batch_classification or self.classify_by_leader(prompt_text, account_name)
+                    classification_source = 'fallback' if classification.get(
+                        'reasoning') == FALLBACK_REASONING else 'llm'
 
             # Agent 2: Sentiment analizi (sadece ilgili liderler için)
-            sentiment_results = {
-                "RTE_SENTIMENT": None,
-                "ÖÖ_SENTİMENT": None,
-                "MY_SENTIMENT": None,
-                "EI_SENTIMENT": None
-            }
-
-            for code, full_name in self.leaders.items():
-                is_key = f"IS_{code}"
-                if classification.get(is_key) == 1:
-                    sentiment_key = f"{code}_SENTIMENT"
-                    sentiment_results[sentiment_key] = self.analyze_sentiment_for_leader(
-                        text, account_name, full_name
-                    )
+            mentioned = [code for code in self.leaders if classification.get(f"IS_{code}") == 1]
+            if speculative is not None:
+                llm_sentiments = self.collect_speculative_sentiment(speculative, mentioned, llm_sentiments)
+            resolved = self.resolve_sentiments(prompt_text, account_name, mentioned, llm_sentiments)
+
+            # Hesap profiline yalnızca LLM etiketleri yazılır (öncüller kendini beslemesin)
+            if self.account_profiles is not None:
+                self.account_profiles.record(
+                    account_name,
+                    classification if classification_source == 'llm' else None,
+                    {code: sentiment for code, (sentiment, source) in resolved.items() if source == 'llm'}
+                )
 
             # İstatistikleri güncelle
             with self.stats_lock:
                 self.stats['processed'] += 1
-
-            return {
-                'ACCOUNT_NAME': account_name,
-                'TEXT': text,
-                'IS_RTE': classification.get('IS_RTE', -1),
-                'IS_ÖÖ': classification.get('IS_ÖÖ', -1),
-                'IS_MY': classification.get('IS_MY', -1),
-                'IS_EI': classification.get('IS_EI', -1),
-                'RTE_SENTIMENT': sentiment_results['RTE_SENTIMENT'],
-                'ÖÖ_SENTİMENT': sentiment_results['ÖÖ_SENTİMENT'],
-                'MY_SENTIMENT': sentiment_results['MY_SENTIMENT'],
-                'EI_SENTIMENT': sentiment_results['EI_SENTIMENT'],
-                'reasoning': classification.get('reasoning', '')
-            }
+                self.stats['input_tokens'] += prepared.tokens
+                self.stats['input_tokens_raw'] += prepared.original_tokens
+                self.stats['truncated_rows'] += prepared.truncated
+                self.stats['local_classified'] += classification_source == 'local'
+                self.stats['account_prior_rows'] += classification_source == 'account_prior'
+
+            # Kompakt, dict uyumlu kayıt (bkz. result_records.py)
+            row_usage = self.usage.finish_row()
+            return self.record_layout.make(
+                account_name, text, classification, resolved,
+                reasoning=classification.get('reasoning', ''),
+                input_tokens=prepared.tokens,
+                api_prompt_tokens=row_usage['prompt_tokens'],
+                api_output_tokens=row_usage['output_tokens'],
+                classification_source=classification_source
+            )
 
         except Exception as e:
             self.logger.error(f"İçerik işleme hatası: {e}")
@@ -346,26 +1000,36 @@ Sadece sayısal değeri ver (1, 0, veya -1):
                 self.stats['errors'] += 1
             return None
 
-    def process_batch_parallel(self, data_batch: List[Dict]) -> List[Dict]:
+        finally:
+            if self.thread_times is not None:
+                self.thread_times.add_row(time.perf_counter() - row_started,
+                                          time.thread_time() - cpu_started)
+
+    def process_batch_parallel(self, data_batch: List[Dict], with_positions: bool = False) -> List:
         """
         Batch'i paralel olarak işle
 
         Args:
             data_batch: İşlenecek veri batch'i
+            with_positions: Sonuçları (batch içi sıra, sonuç) çiftleri olarak döndür
 
         Returns:
-            İşlem sonuçları
+            Girdi sırasıyla işlem sonuçları (başarısız satırlar yer almaz)
         """
         results = []
 
-        with ThreadPoolExecutor(max_workers=self.config['max_workers']) as executor:
+        # Yerel sınıflandırma batch üzerinde tek seferde (vektörel) yapılır
+        local_results = self.local_classify([item.get('TEXT', '') for item in data_batch])
+
+        with ThreadPoolExecutor(max_workers=self.config['max_workers'], thread_name_prefix='batch') as executor:
             # Her içerik için task oluştur
             future_to_item = {
                 executor.submit(
                     self.process_single_content,
                     item.get('ACCOUNT_NAME', ''),
-                    item.get('TEXT', '')
-                ): item for item in data_batch
+                    item.get('TEXT', ''),
+                    local_result
+                ): position for position, (item, local_result) in enumerate(zip(data_batch, local_results))
             }
 
             # Sonuçları topla
@@ -373,7 +1037,7 @@ Sadece sayısal değeri ver (1, 0, veya -1):
                 try:
                     result = future.result()
                     if result:
-                        results.append(result)
+                        results.append((future_to_item[future], result))
 
                     # Rate limiting
                     time.sleep(self.config['rate_limit_sec'] / self.config['max_workers'])
@@ -381,9 +1045,114 @@ Sadece sayısal değeri ver (1, 0, veya -1):
                 except Exception as e:
                     self.logger.error(f"Batch işleme hatası: {e}")
 
+        if self.account_profiles is not None:
+            self.account_profiles.flush()
+
+        results.sort(key=lambda pair: pair[0])
+        return results if with_positions else [result for _, result in results]
+
+    @property
+    def coalescer(self):
+        """Tekil istekleri çok satırlı prompt'larda birleştiren dağıtıcı (bkz. coalescer.py)"""
+        if self._coalescer is None:
+            with self._coalescer_lock:
+                if self._coalescer is None:
+                    from coalescer import RequestCoalescer
+
+                    self._coalescer = RequestCoalescer(
+                        self.process_coalesced_batch,
+                        max_items=self.config['coalesce_max_items'],
+                        max_wait_ms=self.config['coalesce_wait_ms'],
+                        name='coalescer'
+                    )
+        return self._coalescer
+
+    def analyze_coalesced(self, account_name: str, text: str) -> Future:
+        """
+        Tek içeriği birleştiriciye bırak
+
+        Aynı anda gelen diğer tekil isteklerle birlikte çok satırlı tek
+        prompt'la işlenir.
+
+        Args:
+            account_name: Hesap adı
+            text: İçerik metni
+
+        Returns:
+            process_single_content sonucunu taşıyan Future
+        """
+        return self.coalescer.submit((account_name, text))
+
+    def process_coalesced_batch(self, items: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+        """
+        Birleştirilmiş tekil istekleri çok satırlı prompt'larla işle
+
+        LLM'e gidecek kayıtların sınıflandırması tek çağrıda, 'llm' motorunda
+        bahsedilen liderlerin sentiment'i de tek çağrıda alınır. Hesap öncülü
+        veya yerel model ile çözülen kayıtlar prompt'a eklenmez; çok satırlı
+        yanıtta eksik/geçersiz kalan kayıtlar tekil çağrılarla tamamlanır.
+        Paylaşılan çağrıların token'ları aşama toplamlarında yer alır, kayıt
+        bazındaki API_*_TOKENS sütunlarına yalnızca tekil çağrılar yazılır.
+
+        Args:
+            items: (hesap adı, metin) çiftleri
+
+        Returns:
+            İstek sırasıyla işlem sonuçları (başarısızsa None)
+        """
+        if len(items) == 1:
+            return [self.process_single_content(*items[0])]
+
+        local_results = self.local_classify([text or '' for _, text in items])
+        shortcut = self.account_profiles is not None and self.config['account_shortcut']
+
+        prepared = {
+            i: prepare_text(text, self.config['max_input_tokens'], self.config['normalize_text']).text
+            for i, (_, text) in enumerate(items) if text and text.strip()
+        }
+
+        # Sınıflandırma: LLM'e gidecek kayıtlar tek prompt'ta
+        need = [i for i in prepared if local_results[i] is None and not (
+            shortcut and self.account_profiles.prior_classification(items[i][0], self.leaders, prepared[i])
+            is not None)]
+        batch_classifications = {}
+        if len(need) > 1:
+            classified = self.classify_batch([(items[i][0], prepared[i]) for i in need])
+            batch_classifications = dict(zip(need, classified))
+
+        # Sentiment: bahsedilen liderler tek prompt'ta (yalnızca 'llm' motoru)
+        llm_sentiments = {}
+        if self.config['sentiment_engine'] == 'llm':
+            asks = []
+            for i in prepared:
+                classification = local_results[i] or batch_classifications.get(i)
+                if classification is None:
+                    continue
+                account_name = items[i][0]
+                codes = [code for code in self.leaders if classification.get(f"IS_{code}") == 1
+                         and not (shortcut and self.account_profiles.prior_sentiment(account_name, code, prepared[i])
+                                  is not None)]
+                if codes:
+                    asks.append((i, codes))
+            if len(asks) > 1:
+                sentiments = self.analyze_sentiment_batch([(items[i][0], prepared[i]) for i, _ in asks],
+                                                          [codes for _, codes in asks])
+                llm_sentiments = {i: valid for (i, _), valid in zip(asks, sentiments)}
+
+        # Kayıtları tamamla (eksikler tekil çağrılarla paralel sorulur)
+        with ThreadPoolExecutor(max_workers=self.config['max_workers'], thread_name_prefix='batch') as executor:
+            results = list(executor.map(
+                lambda i: self.process_single_content(items[i][0], items[i][1], local_results[i],
+                                                      batch_classifications.get(i), llm_sentiments.get(i)),
+                range(len(items))
+            ))
+
+        if self.account_profiles is not None:
+            self.account_profiles.flush()
+
         return results
 
-    def read_csv(self, file_path: str) -> pd.DataFrame:
+    def read_csv(self, file_path: str) -> 'pd.DataFrame':
         """
         CSV dosyasını oku
 
@@ -393,18 +1162,16 @@ Sadece sayısal değeri ver (1, 0, veya -1):
         Returns:
             Pandas DataFrame
         """
+        import pandas as pd
+
         try:
-            df = pd.read_csv(file_path, encoding='utf-8')
+            df = pd.read_csv(file_path, encoding='utf-8', dtype=str, keep_default_na=False)
 
             # Sütun isimlerini temizle
             df.columns = df.columns.str.strip()
 
             # Gerekli sütunları kontrol et
-            required_columns = ['ACCOUNT_NAME', 'TEXT']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-
-            if missing_columns:
-                raise ValueError(f"Eksik sütunlar: {missing_columns}")
+            validate_columns(list(df.columns))
 
             # Boş satırları temizle
             df = df.dropna(subset=['TEXT'])
@@ -417,26 +1184,33 @@ Sadece sayısal değeri ver (1, 0, veya -1):
             self.logger.error(f"CSV okuma hatası: {e}")
             raise
 
-    def write_csv(self, file_path: str, results: List[Dict]):
+    def write_csv(self, file_path: str, results, input_file: Optional[str] = None,
+                  light: bool = False):
         """
         Sonuçları CSV'ye yaz
 
         Args:
             file_path: Çıktı dosya yolu
-            results: Sonuç listesi
+            results: Sonuç listesi veya ResultStore
+            input_file: Metin tutmayan ResultStore için ACCOUNT_NAME/TEXT'in okunacağı girdi
+            light: ResultStore'u pandas'sız, csv modülüyle yaz (küçük girdiler)
         """
-        try:
-            df = pd.DataFrame(results)
+        if isinstance(results, ResultStore):
+            if light:
+                self.write_store_csv_light(file_path, results, input_file)
+            else:
+                self.write_store_csv(file_path, results, input_file)
+            return
 
-            # Sütun sıralaması
-            columns = [
-                'ACCOUNT_NAME', 'TEXT', 'IS_RTE', 'IS_ÖÖ', 'IS_MY', 'IS_EI',
-                'RTE_SENTIMENT', 'ÖÖ_SENTİMENT', 'MY_SENTIMENT', 'EI_SENTIMENT'
-            ]
+        import pandas as pd
 
-            # Mevcut sütunları al
-            available_columns = [col for col in columns if col in df.columns]
-            df = df[available_columns]
+        try:
+            # Sütun sıralaması (lider kayıt defterinden); DataFrame sütun sütun
+            # kurulur, satır başına geçici dict oluşturulmaz
+            columns = self.leader_registry.output_columns()
+            available_columns = [col for col in columns if results and col in results[0]]
+            df = pd.DataFrame({col: [r.get(col) for r in results] for col in available_columns},
+                              columns=available_columns)
 
             df.to_csv(file_path, index=False, encoding='utf-8')
             self.logger.info(f"Sonuçlar {file_path} dosyasına yazıldı")
@@ -445,12 +1219,119 @@ Sadece sayısal değeri ver (1, 0, veya -1):
             self.logger.error(f"CSV yazma hatası: {e}")
             raise
 
-    def generate_report(self, results: List[Dict]) -> Dict:
+    def write_store_csv(self, file_path: str, store: ResultStore, input_file: Optional[str] = None):
+        """
+        ResultStore'u CSV'ye yaz
+
+        Metinler depoda tutulmuyorsa girdi dosyası parça parça yeniden okunur
+        ve ROW_ID ile eşleştirilir; sayısal sütunlar kopyalanmadan DataFrame'e
+        çevrilir.
+
+        Args:
+            file_path: Çıktı dosya yolu
+            store: Sonuç deposu
+            input_file: Girdi dosyası (store.keep_text False ise gerekli)
+        """
+        import numpy as np
+        import pandas as pd
+
+        columns = self.leader_registry.output_columns()
+        frame = store.to_pandas()
+
+        try:
+            if store.keep_text:
+                frame[[col for col in columns if col in frame.columns]].to_csv(
+                    file_path, index=False, encoding='utf-8')
+                self.logger.info(f"Sonuçlar {file_path} dosyasına yazıldı")
+                return
+
+            if input_file is None:
+                raise ValueError("Metin tutmayan ResultStore için girdi dosyası gerekli")
+
+            row_ids = frame['ROW_ID'].to_numpy()
+            if len(row_ids) > 1 and (row_ids[1:] < row_ids[:-1]).any():
+                frame = frame.sort_values('ROW_ID', kind='stable')
+                row_ids = frame['ROW_ID'].to_numpy()
+
+            with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                pd.DataFrame(columns=columns).to_csv(f, index=False)
+                offset = position = 0
+                for records in iter_record_chunks(input_file):
+                    end = offset + len(records)
+                    stop = int(np.searchsorted(row_ids, end))
+                    if stop > position:
+                        local = row_ids[position:stop] - offset
+                        chunk = frame.iloc[position:stop].assign(
+                            ACCOUNT_NAME=[records[i].get('ACCOUNT_NAME', '') for i in local],
+                            TEXT=[records[i]['TEXT'] for i in local]
+                        )
+                        chunk[columns].to_csv(f, index=False, header=False)
+                    position, offset = stop, end
+                    if position >= len(row_ids):
+                        break
+
+            self.logger.info(f"Sonuçlar {file_path} dosyasına yazıldı")
+
+        except Exception as e:
+            self.logger.error(f"CSV yazma hatası: {e}")
+            raise
+
+    def write_store_csv_light(self, file_path: str, store: ResultStore,
+                              input_file: Optional[str] = None):
+        """
+        ResultStore'u pandas'sız, csv modülüyle yaz
+
+        Küçük girdiler için; çıktı write_store_csv ile aynıdır (boş değerler
+        boş hücre, satır sonu pandas gibi os.linesep). Metinler depoda
+        tutulmuyorsa girdi, işlemdeki gibi csv modülüyle yeniden okunur.
+
+        Args:
+            file_path: Çıktı dosya yolu
+            store: Sonuç deposu
+            input_file: Girdi dosyası (store.keep_text False ise gerekli)
+        """
+        columns = self.leader_registry.output_columns()
+
+        def write_row(writer, row: Dict):
+            writer.writerow(['' if row.get(col) is None else row[col] for col in columns])
+
+        try:
+            if not store.keep_text and input_file is None:
+                raise ValueError("Metin tutmayan ResultStore için girdi dosyası gerekli")
+
+            with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f, lineterminator=os.linesep)
+                writer.writerow(columns)
+
+                if store.keep_text:
+                    for row in store:
+                        write_row(writer, row)
+                else:
+                    positions = {row_id: i for i, row_id in enumerate(store.row_ids[:len(store)].tolist())}
+                    offset = 0
+                    for records in iter_record_chunks(input_file, light=True):
+                        for k, record in enumerate(records):
+                            i = positions.get(offset + k)
+                            if i is None:
+                                continue
+                            row = store[i]
+                            row['ACCOUNT_NAME'] = record.get('ACCOUNT_NAME', '')
+                            row['TEXT'] = record['TEXT']
+                            write_row(writer, row)
+                        offset += len(records)
+
+            self.logger.info(f"Sonuçlar {file_path} dosyasına yazıldı")
+
+        except Exception as e:
+            self.logger.error(f"CSV yazma hatası: {e}")
+            raise
+
+    def generate_report(self, results) -> Dict:
         """
         Analiz raporu oluştur
 
         Args:
-            results: Analiz sonuçları
+            results: Analiz sonuçları (liste veya ResultStore)
 
         Returns:
             Rapor dictionary'si
@@ -458,30 +1339,17 @@ Sadece sayısal değeri ver (1, 0, veya -1):
         if not results:
             return {}
 
+        store = ResultStore.from_records(self.record_layout, results)
+
         # Temel istatistikler
         total_processed = len(results)
         total_time = time.time() - self.stats['start_time'] if self.stats['start_time'] else 0
 
-        # Lider istatistikleri
-        leader_stats = {}
-        for leader_code in self.leaders.keys():
-            mentions = sum(1 for r in results if r.get(f'IS_{leader_code}') == 1)
-
-            sentiment_key = f'{leader_code}_SENTIMENT'
-            sentiments = [r.get(sentiment_key) for r in results if r.get(sentiment_key) is not None]
-
-            positive = sum(1 for s in sentiments if s == 1)
-            neutral = sum(1 for s in sentiments if s == 0)
-            negative = sum(1 for s in sentiments if s == -1)
-
-            leader_stats[leader_code] = {
-                'name': self.leaders[leader_code],
-                'mentions': mentions,
-                'positive': positive,
-                'neutral': neutral,
-                'negative': negative,
-                'total_sentiment': len(sentiments)
-            }
+        # Lider istatistikleri (tip dizileri üzerinde vektörel)
+        leader_stats = {
+            leader_code: {'name': self.leaders[leader_code], **counts}
+            for leader_code, counts in store.leader_counts().items()
+        }
 
         return {
             'summary': {
@@ -495,9 +1363,66 @@ Sadece sayısal değeri ver (1, 0, veya -1):
                                                                                                                                 'errors']) > 0 else 0
             },
             'leader_statistics': leader_stats,
+            'response_validation': {
+                'json_mode': self.config['json_mode'],
+                'parse_errors': self.stats['parse_errors'],
+                'reasks': self.stats['reasks']
+            },
+            'input_tokens': {
+                'max_input_tokens': self.config['max_input_tokens'],
+                'total': self.stats['input_tokens'],
+                'total_before_preprocess': self.stats['input_tokens_raw'],
+                'avg_per_row': round(self.stats['input_tokens'] / self.stats['processed'], 1)
+                if self.stats['processed'] else 0,
+                'truncated_rows': self.stats['truncated_rows']
+            },
+            'local_classifier': {
+                'model': self.config['local_model'] if self.local_classifier is not None else None,
+                'confidence_threshold': self.config['local_confidence'],
+                'rows': self.stats['local_classified'],
+                'share': round(self.stats['local_classified'] / self.stats['processed'], 4)
+                if self.stats['processed'] else 0
+            },
+            'sentiment_sources': {
+                'engine': self.config['sentiment_engine'],
+                'lexicon_confidence': self.config['lexicon_confidence'],
+                **self.stats['sentiment_sources']
+            },
+            'account_profiles': {
+                'db': self.config['account_profiles'],
+                'shortcut': self.config['account_shortcut'],
+                'min_rows': self.config['account_min_rows'],
+                'purity': self.config['account_purity'],
+                'revalidate_every': self.config['account_revalidate_every'],
+                'prior_classified_rows': self.stats['account_prior_rows'],
+                **(self.account_profiles.revalidation_stats() if self.account_profiles is not None else {})
+            },
+            'speculative_sentiment': {
+                'enabled': self._speculation_pool is not None,
+                'confidence_threshold': self.config['speculative_confidence'],
+                **self.stats['speculative'],
+                'hit_rate': round(self.stats['speculative']['used'] / self.stats['speculative']['issued'], 4)
+                if self.stats['speculative']['issued'] else 0
+            },
+            'hedging': {
+                'enabled': self.hedger is not None,
+                **(self.hedger.stats() if self.hedger is not None else {})
+            },
+            'api_usage': self.usage.to_dict(),
+            'memory': self.memory_report(),
+            'prompt_versions': {name: template.key for name, template in self.prompts.items()},
             'generated_at': datetime.now().isoformat()
         }
 
+    def memory_report(self) -> Dict:
+        """Rapordaki bellek bölümü (en yüksek RSS her zaman, ayrıntılar memory_profile ile)"""
+        from profiling import peak_rss_mb
+
+        section = {'peak_rss_mb': peak_rss_mb(), 'memory_profile': self.memory is not None}
+        if self.memory is not None:
+            section.update(self.memory.to_dict())
+        return section
+
     def print_report(self, report: Dict):
         """
         Raporu güzel formatta yazdır
@@ -516,6 +1441,61 @@ Sadece sayısal değeri ver (1, 0, veya -1):
         print(f"⚡ Ortalama hız: {summary.get('avg_time_per_item', 0):.2f} saniye/kayıt")
         print(f"📈 Başarı oranı: {summary.get('success_rate', 0):.1f}%")
 
+        validation = report.get('response_validation', {})
+        if validation.get('parse_errors') or validation.get('reasks'):
+            print(f"🔁 Geçersiz yanıt: {validation.get('parse_errors', 0)}, "
+                  f"yeniden sorulan: {validation.get('reasks', 0)}")
+
+        local = report.get('local_classifier', {})
+        if local.get('rows'):
+            print(f"🧠 Yerel model: {local['rows']} kayıt (%{local['share'] * 100:.1f}) LLM'siz sınıflandırıldı")
+
+        accounts = report.get('account_profiles', {})
+        if accounts.get('prior_classified_rows'):
+            print(f"👤 Hesap öncülüyle sınıflandırılan: {accounts['prior_classified_rows']} kayıt")
+        if accounts.get('dropped_priors'):
+            print(f"👤 Yeniden doğrulamada LLM ile çelişen öncül: {accounts['dropped_priors']} "
+                  f"({accounts['revalidated']} karşılaştırma)")
+
+        sources = report.get('sentiment_sources', {})
+        if sources.get('lexicon') or sources.get('lexicon_fallback'):
+            print(f"📖 Sentiment kaynağı: LLM {sources.get('llm', 0)}, sözlük {sources.get('lexicon', 0)}, "
+                  f"API hatası sonrası sözlük {sources.get('lexicon_fallback', 0)}")
+
+        tokens = report.get('input_tokens', {})
+        if tokens.get('total'):
+            print(f"🔤 Girdi token: {tokens['total']} (ön işleme öncesi {tokens['total_before_preprocess']}), "
+                  f"ortalama {tokens['avg_per_row']}/kayıt, kısaltılan: {tokens['truncated_rows']}")
+
+        usage = report.get('api_usage', {})
+        if usage.get('total', {}).get('calls'):
+            per_row = usage['per_row']
+            print(f"💰 API token: {usage['total']['prompt_tokens']} girdi + {usage['total']['output_tokens']} çıktı, "
+                  f"kayıt başına {per_row['prompt_tokens'] + per_row['output_tokens']:.0f}, "
+                  f"tahmini maliyet ${usage['total']['estimated_cost_usd']:.4f}")
+
+        speculative = report.get('speculative_sentiment', {})
+        if speculative.get('enabled') and speculative.get('issued'):
+            print(f"⚡ Spekülatif sentiment: {speculative['issued']} lider istendi, "
+                  f"{speculative['used']} kullanıldı, {speculative['discarded']} atıldı "
+                  f"(isabet %{speculative['hit_rate'] * 100:.1f})")
+
+        trends = report.get('trends')
+        if trends:
+            print(f"📈 Trend: {trends['hour_buckets']} saatlik / {trends['day_buckets']} günlük dilim "
+                  f"({trends['first']} → {trends['last']}), zamanı okunamayan: {trends['unparsed_rows']}")
+
+        hedging = report.get('hedging', {})
+        if hedging.get('enabled') and hedging.get('hedged'):
+            print(f"🪂 Kopya istek: {hedging['hedged']}/{hedging['requests']} "
+                  f"(%{hedging['hedge_rate'] * 100:.1f}, bütçe %{hedging['budget_pct']:g}), "
+                  f"kopya kazandı: {hedging['hedge_wins']}")
+
+        memory = report.get('memory', {})
+        if memory.get('memory_profile'):
+            print(f"🧮 Bellek: en yüksek RSS {memory['peak_rss_mb']} MB, "
+                  f"tracemalloc zirvesi {memory['traced_peak_mb']} MB")
+
         leader_stats = report.get('leader_statistics', {})
         print(f"\n{Fore.CYAN}📈 LİDER İSTATİSTİKLERİ:{Style.RESET_ALL}")
 
@@ -556,16 +1536,41 @@ Sadece sayısal değeri ver (1, 0, veya -1):
             minutes = (seconds % 3600) // 60
             return f"{int(hours)} saat {int(minutes)} dakika"
 
+    def write_trends_csv(self, output_file: str, trends) -> str:
+        """
+        Trend tablosunu çıktı dosyasının yanına yaz
+
+        Args:
+            output_file: Çıktı CSV dosyası
+            trends: TrendAggregator
+
+        Returns:
+            Trend dosyasının yolu (<çıktı>_trends.csv)
+        """
+        from aggregates import TREND_COLUMNS
+        from exporters import write_csv_stream
+
+        trends_file = f"{os.path.splitext(output_file)[0]}_trends.csv"
+        with open(trends_file, 'w', encoding='utf-8', newline='') as f:
+            write_csv_stream(f, trends.table(self.config['trend_granularity']), columns=TREND_COLUMNS)
+        return trends_file
+
     def process_file(self, input_file: str, output_file: str):
         """
-        Ana işlem fonksiyonu - CSV dosyasını işle
+        Ana işlem fonksiyonu - CSV/Excel dosyasını işle
 
         Args:
-            input_file: Girdi CSV dosyası
+            input_file: Girdi CSV veya Excel dosyası
             output_file: Çıktı CSV dosyası
         """
         self.stats['start_time'] = time.time()
 
+        if self.config['memory_profile']:
+            from profiling import MemoryTracker
+
+            self.memory = MemoryTracker(self.config['memory_snapshot_every'])
+            self.memory.start()
+
         # Header yazdır
         self.print_header()
         print(f"📁 Girdi dosyası: {input_file}")
@@ -575,72 +1580,108 @@ Sadece sayısal değeri ver (1, 0, veya -1):
         print(f"⚙️  Rate limit: {self.config['rate_limit_sec']} saniye")
         print(f"{Fore.CYAN}{'=' * 60}{Style.RESET_ALL}")
 
-        # Progress dosyası
+        # Progress dosyası (sonuçlar ayrı .npz dosyasında sütunsal tutulur)
         progress_file = f"{output_file}.progress.json"
+        store_file = f"{output_file}.progress.npz"
         progress = self.load_progress(progress_file)
 
         try:
-            # CSV'yi oku
-            df = self.read_csv(input_file)
-            self.stats['total_items'] = len(df)
+            # Girdiyi parça parça oku (CSV veya Excel), toplamı tahmin et
+            estimated_total = estimate_total_rows(input_file)
+            self.stats['total_items'] = estimated_total or 0
 
             # Progress'ten devam et
-            start_index = progress.get('last_index', 0)
-            processed_results = progress.get('processed', [])
+            store, start_index = self.load_result_store(progress, store_file)
+            remaining_total = max(estimated_total - start_index, 0) if estimated_total is not None else None
 
-            remaining_data = df.iloc[start_index:].to_dict('records')
+            # Küçük CSV girdileri pandas'sız okunur ve yazılır (okuma ve yazma aynı okuyucuyu kullanır)
+            light = (get_file_ext(input_file) == 'csv' and estimated_total is not None
+                     and estimated_total <= self.config['small_input_rows'])
 
-            print(f"📊 Toplam kayıt: {len(df)}")
-            print(f"✅ İşlenmiş: {len(processed_results)}")
-            print(f"⏳ Kalan: {len(remaining_data)}")
+            print(f"📊 Toplam kayıt (tahmini): {estimated_total if estimated_total is not None else '?'}")
+            print(f"✅ İşlenmiş: {len(store)}")
+            print(f"⏳ Kalan (tahmini): {remaining_total if remaining_total is not None else '?'}")
             print("\n🚀 İşlem başlıyor...\n")
 
             # Progress bar
-            pbar = tqdm(total=len(remaining_data), desc="İşleniyor",
+            from tqdm import tqdm
+
+            pbar = tqdm(total=remaining_total, desc="İşleniyor",
                         unit="kayıt", colour="green")
 
-            all_results = processed_results.copy()
+            current_index = start_index
+
+            # Zaman sütunu verildiyse saatlik trend sayaçları (devam ederken progress'ten yüklenir)
+            timestamp_column = self.config['timestamp_column']
+            trends = None
+            if timestamp_column:
+                from aggregates import TrendAggregator
 
-            # Batch'ler halinde işle
-            for i in range(0, len(remaining_data), self.config['batch_size']):
-                batch = remaining_data[i:i + self.config['batch_size']]
-                current_index = start_index + i
+                trends = TrendAggregator(self.sentiment_columns, progress.get('trends') if start_index else None)
 
-                # Batch'i işle
-                batch_results = self.process_batch_parallel(batch)
-                all_results.extend(batch_results)
+            # Batch'ler halinde işle (dosya okunurken işlem başlar)
+            batches = iter_record_batches(input_file, self.config['batch_size'], skip=start_index,
+                                          light=light)
+            for batch_num, batch in enumerate(batches):
+                if trends is not None and batch_num == 0 and timestamp_column not in batch[0]:
+                    raise ValueError(f"Zaman sütunu bulunamadı: {timestamp_column}")
+
+                # Batch'i işle (sonuçlar girdideki kayıt numarasıyla saklanır)
+                for position, result in self.process_batch_parallel(batch, with_positions=True):
+                    store.append(result, current_index + position)
+                    if trends is not None:
+                        trends.add(result, batch[position].get(timestamp_column))
+                current_index += len(batch)
 
                 # Progress güncelle
-                progress['processed'] = all_results
-                progress['last_index'] = current_index + len(batch)
-                self.save_progress(progress_file, progress)
+                if self.config['save_progress']:
+                    store.save(store_file)
+                    self.save_progress(progress_file, {
+                        'last_index': current_index, 'results_file': store_file,
+                        'trends': trends.to_dict() if trends is not None else None
+                    })
 
                 # Progress bar güncelle
                 pbar.update(len(batch))
 
+                if self.memory is not None:
+                    self.memory.snapshot(current_index)
+
                 # Ara rapor
-                if (i // self.config['batch_size']) % 5 == 0:
+                if batch_num % 5 == 0 and batch_num > 0 and remaining_total:
                     elapsed = time.time() - self.stats['start_time']
-                    remaining_items = len(remaining_data) - i - len(batch)
-                    if i > 0:
-                        avg_time_per_batch = elapsed / ((i // self.config['batch_size']) + 1)
-                        estimated_remaining = (remaining_items / self.config['batch_size']) * avg_time_per_batch
-                        pbar.set_postfix({
-                            'Hata': self.stats['errors'],
-                            'Kalan': self.format_time(estimated_remaining)
-                        })
-
+                    remaining_items = max(remaining_total - (current_index - start_index), 0)
+                    avg_time_per_batch = elapsed / (batch_num + 1)
+                    estimated_remaining = (remaining_items / self.config['batch_size']) * avg_time_per_batch
+                    pbar.set_postfix({
+                        'Hata': self.stats['errors'],
+                        'Kalan': self.format_time(estimated_remaining)
+                    })
+
+            self.stats['total_items'] = current_index
             pbar.close()
 
-            # Sonuçları kaydet
-            self.write_csv(output_file, all_results)
+            if self.memory is not None:
+                self.memory.stop()
 
-            # Progress dosyasını temizle
-            if os.path.exists(progress_file):
-                os.remove(progress_file)
+            # Sonuçları kaydet (metinler girdiden okunur)
+            self.write_csv(output_file, store, input_file=input_file, light=light)
+
+            # Progress dosyalarını temizle
+            for path in (progress_file, store_file):
+                if os.path.exists(path):
+                    os.remove(path)
+
+            # Trend tablosu (sonuçlar yeniden taranmaz)
+            if trends is not None:
+                trends_file = self.write_trends_csv(output_file, trends)
 
             # Rapor oluştur ve yazdır
-            report = self.generate_report(all_results)
+            report = self.generate_report(store)
+            if trends is not None:
+                report['trends'] = {'timestamp_column': timestamp_column,
+                                    'granularity': self.config['trend_granularity'],
+                                    'file': trends_file, **trends.summary()}
             self.print_report(report)
 
             # JSON raporu kaydet
@@ -658,6 +1699,126 @@ Sadece sayısal değeri ver (1, 0, veya -1):
             raise
 
 
+# Worker başlarken kurulan (işe özel değiştirilemeyen) ayarlar -> komut satırı seçeneği
+WORKER_SETTINGS = {
+    'max_concurrent_requests': '--max-concurrent',
+    'local_model': '--local-model',
+    'account_profiles': '--account-profiles',
+    'account_shortcut': '--account-shortcut',
+    'account_revalidate_every': '--account-revalidate-every',
+    'leaders_file': '--leaders',
+    'speculative_sentiment': '--speculative-sentiment',
+    'speculative_confidence': '--speculative-confidence',
+    'hedge_requests': '--hedge-requests',
+    'hedge_budget_pct': '--hedge-budget',
+    'price_input_per_million': '--price-input',
+    'price_output_per_million': '--price-output',
+    'log_level': '--log-level',
+    'debug_sample_every': '--debug-sample',
+}
+
+
+def add_worker_arguments(parser: argparse.ArgumentParser):
+    """
+    Sıcak analizör örneğinde sabitlenen ayarların seçeneklerini ekle
+
+    Hem bu komut hem de job_queue.py worker kullanır; böylece --queue ile
+    işe taşınamayan ayarlar worker'a aynı adlarla verilebilir.
+
+    Args:
+        parser: Seçeneklerin ekleneceği parser
+    """
+    parser.add_argument('--max-concurrent', type=int, default=4,
+                        help='API anahtarı başına eşzamanlı istek limiti (default: 4)')
+    parser.add_argument('--local-model', metavar='NPZ',
+                        help='Yerel sınıflandırıcı modeli (bkz. local_classifier.py train)')
+    parser.add_argument('--account-profiles', metavar='DB',
+                        help='Hesap bazında dağılımların biriktirileceği SQLite dosyası (bkz. account_profiles.py)')
+    parser.add_argument('--account-shortcut', action='store_true',
+                        help='Duruşu neredeyse sabit hesaplarda sınıflandırma/sentiment çağrısını atla')
+    parser.add_argument('--account-revalidate-every', type=int, default=20, metavar='K',
+                        help='Öncülü olan satırların K\'da birini yine LLM\'e gönder; çelişirse öncül düşer '
+                             '(0 = kapalı, default: 20)')
+    parser.add_argument('--leaders', metavar='JSON',
+                        help='Lider kayıt defteri JSON dosyası (default: varsayılan dört lider, bkz. leaders.py)')
+    parser.add_argument('--speculative-sentiment', action='store_true',
+                        help='Adı kesin geçen liderlerin sentiment isteğini sınıflandırmayla paralel başlat '
+                             '(gecikme düşer, yanlış tahminlerde fazladan çağrı yapılır)')
+    parser.add_argument('--speculative-confidence', type=float, default=0.85,
+                        help='Spekülatif istek için takma ad eşleşme güveni eşiği (default: 0.85)')
+    parser.add_argument('--hedge-requests', action='store_true',
+                        help='Aşamanın gözlenen p95 gecikmesini aşan çağrıların kopyasını gönder, ilk yanıt kazanır')
+    parser.add_argument('--hedge-budget', type=float, default=5.0, metavar='PCT',
+                        help='Kopya isteklerin toplam isteklere oranı için üst sınır, yüzde (default: 5)')
+    parser.add_argument('--price-input', type=float, default=0.075,
+                        help='Maliyet tahmini: 1M girdi token fiyatı, USD (default: 0.075)')
+    parser.add_argument('--price-output', type=float, default=0.30,
+                        help='Maliyet tahmini: 1M çıktı token fiyatı, USD (default: 0.30)')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default='INFO',
+                        help='Log seviyesi; DEBUG örneklenmiş istek olaylarını da yazar (default: INFO)')
+    parser.add_argument('--debug-sample', type=int, default=100, metavar='N',
+                        help='DEBUG modunda istek olaylarının N\'de biri yazılır (default: 100)')
+
+
+def worker_config(args) -> Dict:
+    """
+    add_worker_arguments seçeneklerinden konfigürasyon (anahtarlar: WORKER_SETTINGS)
+
+    Args:
+        args: add_worker_arguments eklenmiş bir parser'ın çıktısı
+
+    Returns:
+        Konfigürasyon sözlüğü
+    """
+    return {
+        'max_concurrent_requests': args.max_concurrent,
+        'local_model': args.local_model,
+        'account_profiles': args.account_profiles,
+        'account_shortcut': args.account_shortcut,
+        'account_revalidate_every': args.account_revalidate_every,
+        'leaders_file': args.leaders,
+        'speculative_sentiment': args.speculative_sentiment,
+        'speculative_confidence': args.speculative_confidence,
+        'hedge_requests': args.hedge_requests,
+        'hedge_budget_pct': args.hedge_budget,
+        'price_input_per_million': args.price_input,
+        'price_output_per_million': args.price_output,
+        'log_level': args.log_level,
+        'debug_sample_every': args.debug_sample
+    }
+
+
+def build_config(args) -> Dict:
+    """
+    Komut satırı argümanlarından PoliticalAnalysisSystem konfigürasyonu
+
+    Args:
+        args: main() parser'ının çıktısı
+
+    Returns:
+        Konfigürasyon sözlüğü
+    """
+    return {
+        'batch_size': args.batch_size,
+        'max_workers': args.workers,
+        'rate_limit_sec': args.rate_limit,
+        'max_retries': args.max_retries,
+        'save_progress': not args.no_progress,
+        'json_mode': not args.no_json_mode,
+        'max_input_tokens': args.max_input_tokens,
+        'normalize_text': not args.no_normalize,
+        'local_confidence': args.local_confidence,
+        'sentiment_engine': args.sentiment_engine,
+        'lexicon_confidence': args.lexicon_confidence,
+        'multi_target_sentiment': not args.no_multi_target,
+        'memory_profile': args.memory_profile,
+        'small_input_rows': args.small_input_rows,
+        'timestamp_column': args.timestamp_column,
+        'trend_granularity': args.trend_granularity,
+        **worker_config(args)
+    }
+
+
 def main():
     """Ana fonksiyon - Komut satırı arayüzü"""
     parser = argparse.ArgumentParser(
@@ -672,9 +1833,10 @@ def main():
         '''
     )
 
-    parser.add_argument('input_file', help='Girdi CSV dosyası')
+    parser.add_argument('input_file', help='Girdi CSV veya Excel (.xlsx) dosyası')
     parser.add_argument('output_file', help='Çıktı CSV dosyası')
-    parser.add_argument('api_key', help='Google Gemini API anahtarı')
+    parser.add_argument('api_key', nargs='?', default=os.getenv('GOOGLE_API_KEY'),
+                        help='Google Gemini API anahtarı (default: GOOGLE_API_KEY; --queue ile kullanılmaz)')
 
     parser.add_argument('--batch-size', type=int, default=5,
                         help='Batch boyutu (default: 5)')
@@ -686,6 +1848,36 @@ def main():
                         help='Maksimum retry sayısı (default: 3)')
     parser.add_argument('--no-progress', action='store_true',
                         help='Progress kaydetme')
+    parser.add_argument('--max-input-tokens', type=int, default=None,
+                        help='İçerik metni için token bütçesi; aşan metinler kısaltılır (default: sınırsız)')
+    parser.add_argument('--no-normalize', action='store_true',
+                        help='Metin normalizasyonunu (URL/@kullanıcı daraltma vb.) kapat')
+    parser.add_argument('--local-confidence', type=float, default=0.9,
+                        help='Yerel modelin LLM\'i atlaması için güven eşiği (default: 0.9)')
+    parser.add_argument('--sentiment-engine', choices=['llm', 'hybrid', 'lexicon'], default='llm',
+                        help='Sentiment kaynağı: llm, hybrid (sözlük eminse API atlanır), lexicon (default: llm)')
+    parser.add_argument('--lexicon-confidence', type=float, default=0.7,
+                        help='Hybrid modda sözlük sonucunun kabul eşiği (default: 0.7)')
+    parser.add_argument('--no-multi-target', action='store_true',
+                        help='Birden fazla lider bahsedilen satırlarda lider başına ayrı sentiment çağrısı yap')
+    parser.add_argument('--no-json-mode', action='store_true',
+                        help='Yapılandırılmış (JSON modu) yanıt isteme, serbest metni ayrıştır')
+    parser.add_argument('--profile', choices=['cprofile', 'sampling'],
+                        help='process_file\'ı profille: cprofile (.pstats) veya sampling (.collapsed); '
+                             'worker bekleme/çalışma süreleri .threads.json\'a yazılır')
+    parser.add_argument('--profile-out', metavar='PREFIX',
+                        help='Profil çıktılarının öneki (default: <çıktı dosyası>.profile)')
+    parser.add_argument('--memory-profile', action='store_true',
+                        help='Batch sınırlarında tracemalloc/RSS ölçümü yap ve rapora ekle (yavaşlatır)')
+    parser.add_argument('--small-input-rows', type=int, default=SMALL_INPUT_ROWS, metavar='N',
+                        help=f'En çok N kayıtlı CSV\'leri pandas\'sız oku/yaz (0 = kapalı, default: {SMALL_INPUT_ROWS})')
+    parser.add_argument('--timestamp-column', metavar='COL',
+                        help='Saatlik/günlük lider trendleri için zaman sütunu; <çıktı>_trends.csv yazılır')
+    parser.add_argument('--trend-granularity', choices=['hour', 'day'], default='hour',
+                        help='Trend tablosunun zaman çözünürlüğü (default: hour)')
+    parser.add_argument('--queue', metavar='DB',
+                        help='Yerelde işlemek yerine işi SQLite kuyruğuna gönder (bkz. job_queue.py)')
+    add_worker_arguments(parser)
 
     args = parser.parse_args()
 
@@ -699,19 +1891,59 @@ def main():
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
+    # Kuyruk modu: işi paylaşılan worker'lara bırak
+    if args.queue:
+        from job_queue import JobQueue, JOB_CONFIG_OVERRIDES
+
+        # Yalnızca varsayılandan farklı verilen ayarlar işe taşınır; worker başlarken
+        # sabitlenen ayarlar (lider listesi, yerel model, ...) işe özel değiştirilemez.
+        # İş ilerlemesi kuyrukta tutulduğundan --no-progress kuyruk modunda anlamsızdır.
+        config = build_config(args)
+        defaults = build_config(parser.parse_args([args.input_file, args.output_file]))
+        changed = [key for key, value in config.items() if value != defaults[key] and key != 'save_progress']
+        worker_only = [WORKER_SETTINGS[key] if config[key] is True else f"{WORKER_SETTINGS[key]} {config[key]}"
+                       for key in changed if key in WORKER_SETTINGS]
+        local_only = ['--memory-profile'] if args.memory_profile else []
+        if args.profile or args.profile_out:
+            local_only.append('--profile')
+        if worker_only:
+            print(f"{Fore.RED}❌ Bu ayarlar işe özel değiştirilemez, worker başlarken verilir: "
+                  f"python job_queue.py --db {args.queue} worker {' '.join(worker_only)}{Style.RESET_ALL}")
+        if local_only:
+            print(f"{Fore.RED}❌ Bu ayarlar kuyruk modunda desteklenmez: {', '.join(local_only)}. "
+                  f"--queue olmadan çalıştırın.{Style.RESET_ALL}")
+        if worker_only or local_only:
+            sys.exit(1)
+        if args.api_key:
+            print(f"{Fore.YELLOW}ℹ️  API anahtarı kuyruk modunda kullanılmaz; iş worker'ın anahtarıyla çalışır"
+                  f"{Style.RESET_ALL}")
+
+        job_id = JobQueue(args.queue).submit_file(
+            args.input_file, args.output_file, config={key: config[key] for key in changed}
+        )
+        print(f"{Fore.GREEN}📥 İş kuyruğa eklendi: {job_id}{Style.RESET_ALL}")
+        print(f"📊 Durum: python job_queue.py --db {args.queue} status {job_id}")
+        sys.exit(0)
+
+    if not args.api_key:
+        print(f"{Fore.RED}❌ API anahtarı gerekli (argüman veya GOOGLE_API_KEY){Style.RESET_ALL}")
+        sys.exit(1)
+
     # Sistem oluştur
-    config = {
-        'batch_size': args.batch_size,
-        'max_workers': args.workers,
-        'rate_limit_sec': args.rate_limit,
-        'max_retries': args.max_retries,
-        'save_progress': not args.no_progress
-    }
+    config = build_config(args)
 
     analyzer = PoliticalAnalysisSystem(args.api_key, **config)
 
     try:
-        analyzer.process_file(args.input_file, args.output_file)
+        if args.profile:
+            from profiling import ThreadTimeRecorder, run_profiled
+
+            analyzer.thread_times = ThreadTimeRecorder()
+            run_profiled(args.profile, args.profile_out or f"{args.output_file}.profile",
+                         analyzer.process_file, args.input_file, args.output_file,
+                         recorder=analyzer.thread_times)
+        else:
+            analyzer.process_file(args.input_file, args.output_file)
         sys.exit(0)
     except KeyboardInterrupt:
         print(f"\n{Fore.YELLOW}⚠️  İşlem kullanıcı tarafından durduruldu{Style.RESET_ALL}")
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""
+Profil Modu - Türk Siyasi Lider Analiz Sistemi
+
+`political_analyzer.py --profile` ile bir çalıştırmanın CPU ve duvar saati
+dağılımını kodu değiştirmeden çıkarır:
+
+- cprofile: deterministik profil, <önek>.pstats (snakeviz / pstats ile açılır);
+  yalnızca ana thread'i (okuma, pandas, CSV yazma) kapsar
+- sampling: worker'lar dahil tüm thread'lerin yığınlarını düzenli
+  aralıklarla örnekler, <önek>.collapsed (flamegraph.pl / speedscope için "a;b;c sayı" satırları)
+
+Her iki modda worker thread'leri için bekleme/çalışma süreleri
+<önek>.threads.json dosyasına yazılır: slot bekleme (zamanlayıcı), HTTP,
+429/timeout beklemesi ve thread CPU süresi ayrı ayrı tutulur.
+
+`--memory-profile` ile batch sınırlarında tracemalloc ölçümleri ve RSS
+değerleri toplanır (MemoryTracker); özet analiz raporunun 'memory'
+bölümüne eklenir.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional
+
+PROFILE_MODES = ('cprofile', 'sampling')
+
+# Örnekleme aralığı (saniye)
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# Yığın başına tutulacak en fazla çerçeve
+MAX_STACK_DEPTH = 64
+
+_THREAD_SUFFIX_RE = re.compile(r'_\d+$')
+
+# Adsız ThreadPoolExecutor'ların havuz sayacı ("ThreadPoolExecutor-12_3")
+_EXECUTOR_COUNTER_RE = re.compile(r'^(ThreadPoolExecutor)-\d+(?=_\d+$)')
+
+
+def thread_label(name: str) -> str:
+    """
+    Thread adını havuzdan bağımsız hale getir
+
+    Her batch yeni bir executor açtığından aynı worker sırası her batch'te
+    farklı bir adla görünür; havuz sayacı atılır, worker sırası korunur.
+
+    Args:
+        name: threading.Thread adı
+
+    Returns:
+        Normalize edilmiş ad
+
+    >>> thread_label('ThreadPoolExecutor-12_3')
+    'ThreadPoolExecutor_3'
+    >>> thread_label('batch_2'), thread_label('MainThread')
+    ('batch_2', 'MainThread')
+    """
+    return _EXECUTOR_COUNTER_RE.sub(r'\1', name)
+
+# Thread başına tutulan süre kategorileri
+TIME_CATEGORIES = ('slot_wait', 'http', 'backoff')
+
+# Raporda tutulacak en fazla bellek ölçümü (aşılırsa seyreltilir)
+MAX_MEMORY_POINTS = 200
+
+_MB = 1024 * 1024
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process'in en yüksek RSS değeri (MB, desteklenmeyen platformda None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt döndürür
+    return round(peak / (_MB if sys.platform == 'darwin' else 1024), 1)
+
+
+def current_rss_mb() -> Optional[float]:
+    """Process'in şu anki RSS değeri (MB, /proc yoksa None)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(pages * os.sysconf('SC_PAGE_SIZE') / _MB, 1)
+
+
+class ThreadTimeRecorder:
+    """Thread başına duvar saati, CPU ve bekleme kategorileri"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._threads: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    def add(self, category: str, seconds: float):
+        """Geçerli thread'e bir süre kategorisi ekle"""
+        name = thread_label(threading.current_thread().name)
+        with self._lock:
+            self._threads[name][category] += seconds
+
+    def add_row(self, wall: float, cpu: float):
+        """Geçerli thread'de işlenen bir kaydın duvar saati ve CPU süresi"""
+        name = thread_label(threading.current_thread().name)
+        with self._lock:
+            bucket = self._threads[name]
+            bucket['rows'] += 1
+            bucket['wall'] += wall
+            bucket['cpu'] += cpu
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """
+        Thread başına özet
+
+        'other_wait' = duvar saati - CPU - ölçülen bekleme kategorileri
+        (GIL, kilitler, ölçülmeyen I/O).
+        """
+        with self._lock:
+            summary = {}
+            for name, bucket in sorted(self._threads.items()):
+                entry = {key: round(bucket.get(key, 0.0), 4)
+                         for key in ('rows', 'wall', 'cpu') + TIME_CATEGORIES}
+                entry['rows'] = int(entry['rows'])
+                measured = bucket.get('cpu', 0.0) + sum(bucket.get(c, 0.0) for c in TIME_CATEGORIES)
+                entry['other_wait'] = round(max(bucket.get('wall', 0.0) - measured, 0.0), 4)
+                entry['busy_ratio'] = round(bucket['cpu'] / bucket['wall'], 4) if bucket.get('wall') else 0
+                summary[name] = entry
+            return summary
+
+
+class MemoryTracker:
+    """Batch sınırlarında tracemalloc ve RSS ölçümleri"""
+
+    def __init__(self, snapshot_every: int = 50, top: int = 10):
+        """
+        Bellek izleyici başlatıcı
+
+        tracemalloc bellek ayırmalarını yavaşlattığı için yalnızca açıkça
+        istendiğinde kullanılır.
+
+        Args:
+            snapshot_every: Kaç batch'te bir tam snapshot alınacağı (en çok büyüyen satırlar için)
+            top: Raporlanacak en çok büyüyen kaynak satır sayısı
+        """
+        self.snapshot_every = max(int(snapshot_every), 1)
+        self.top = top
+        self.points: List[Dict] = []
+        self.top_growth: List[Dict] = []
+        self._baseline = None
+        self._batches = 0
+        self._stride = 1
+
+    def start(self):
+        """tracemalloc'u başlat ve referans snapshot al"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._baseline = tracemalloc.take_snapshot()
+
+    def snapshot(self, rows: int):
+        """
+        Batch sonunda ölçüm al
+
+        Args:
+            rows: O ana kadar okunan kayıt sayısı
+        """
+        if not tracemalloc.is_tracing():
+            return
+
+        self._batches += 1
+        if self._batches % self._stride == 0:
+            traced, peak = tracemalloc.get_traced_memory()
+            self.points.append({
+                'batch': self._batches,
+                'rows': rows,
+                'traced_mb': round(traced / _MB, 2),
+                'traced_peak_mb': round(peak / _MB, 2),
+                'rss_mb': current_rss_mb()
+            })
+            if len(self.points) > MAX_MEMORY_POINTS:
+                self.points = self.points[1::2]
+                self._stride *= 2
+
+        if self._batches % self.snapshot_every == 0:
+            self._update_top_growth()
+
+    def _update_top_growth(self):
+        """Referansa göre en çok büyüyen kaynak satırlar"""
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>')
+        ])
+        stats = snapshot.compare_to(self._baseline, 'lineno')[:self.top]
+        self.top_growth = [{
+            'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            'size_mb': round(stat.size / _MB, 3),
+            'growth_mb': round(stat.size_diff / _MB, 3),
+            'blocks': stat.count
+        } for stat in stats]
+
+    def stop(self):
+        """Son snapshot'ı al ve tracemalloc'u durdur"""
+        if tracemalloc.is_tracing():
+            self._update_top_growth()
+            tracemalloc.stop()
+
+    def to_dict(self) -> Dict:
+        """Rapor bölümü"""
+        return {
+            'traced_peak_mb': max((p['traced_peak_mb'] for p in self.points), default=0),
+            'batches': self._batches,
+            'points': self.points,
+            'top_growth': self.top_growth
+        }
+
+
+class SamplingProfiler:
+    """sys._current_frames() ile tüm thread'leri örnekleyen hafif profilleyici"""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        """
+        Profilleyici başlatıcı
+
+        Args:
+            interval: Örnekler arası süre (saniye)
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        names = {t.ident: _THREAD_SUFFIX_RE.sub('', thread_label(t.name)) for t in threading.enumerate()}
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            labels = []
+            while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                labels.append(self._frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(thread_id, str(thread_id)))
+            self.stacks[';'.join(reversed(labels))] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        """Örneklemeyi arka plan thread'inde başlat"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Örneklemeyi durdur"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_collapsed(self, path: str):
+        """Flamegraph için katlanmış yığın dosyası yaz"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def run_profiled(mode: str, prefix: str, func: Callable, *args,
+                 recorder: Optional[ThreadTimeRecorder] = None, **kwargs):
+    """
+    Fonksiyonu seçilen profil moduyla çalıştır ve çıktıları yaz
+
+    Fonksiyon hata verse de o ana kadar toplanan profil yazılır.
+
+    Args:
+        mode: 'cprofile' veya 'sampling'
+        prefix: Çıktı dosyalarının öneki
+        func: Profillenecek fonksiyon (ör. analyzer.process_file)
+        recorder: Worker bekleme/çalışma süreleri (None = yazılmaz)
+
+    Returns:
+        Fonksiyonun dönüş değeri
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Bilinmeyen profil modu: {mode} (seçenekler: {PROFILE_MODES})")
+
+    outputs = []
+    started = time.perf_counter()
+
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        profiler = SamplingProfiler()
+        profiler.start()
+
+    try:
+        return func(*args, **kwargs)
+    finally:
+        if mode == 'cprofile':
+            profiler.disable()
+            profiler.dump_stats(f"{prefix}.pstats")
+            outputs.append(f"{prefix}.pstats")
+            print(f"\n⏱️  En çok kümülatif süre harcayan 15 fonksiyon (toplam {time.perf_counter() - started:.1f}s):")
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+        else:
+            profiler.stop()
+            profiler.write_collapsed(f"{prefix}.collapsed")
+            outputs.append(f"{prefix}.collapsed")
+            print(f"\n⏱️  {profiler.samples} örnek, {len(profiler.stacks)} farklı yığın "
+                  f"({time.perf_counter() - started:.1f}s)")
+
+        if recorder is not None:
+            threads = recorder.to_dict()
+            with open(f"{prefix}.threads.json", 'w', encoding='utf-8') as f:
+                json.dump(threads, f, ensure_ascii=False, indent=2)
+            outputs.append(f"{prefix}.threads.json")
+
+            print(f"{'Thread':<28} {'Kayıt':>6} {'Süre':>8} {'CPU':>8} {'Slot':>8} {'HTTP':>8} {'Backoff':>8} {'Diğer':>8}")
+            for name, t in threads.items():
+                print(f"{name[:28]:<28} {t['rows']:>6} {t['wall']:>8.2f} {t['cpu']:>8.2f} {t['slot_wait']:>8.2f} "
+                      f"{t['http']:>8.2f} {t['backoff']:>8.2f} {t['other_wait']:>8.2f}")
+
+        print(f"📄 Profil çıktıları: {', '.join(outputs)}")
@@ -0,0 +1,631 @@
+# -*- coding: utf-8 -*-
+"""
+Prompt Şablonları - Türk Siyasi Lider Analiz Sistemi
+
+Sürümlü prompt şablonu kayıt defteri ve önceden derlenmiş yanıt
+ayrıştırıcıları. Şablonlar modül yüklenirken bir kez f-string fonksiyonuna
+derlenir; çağrı başına yalnızca değişken alanlar doldurulur.
+Ayrıştırıcılar önce katı JSON/sayı yolunu dener, regex'i yalnızca yedek
+olarak kullanır. JSON modu için yanıt şemaları ve şema doğrulayıcı da
+burada tanımlıdır.
+"""
+
+import re
+import json
+import string
+import keyword
+from typing import Dict, List, Optional, Tuple
+
+# Yanıt ayrıştırma için önceden derlenmiş ifadeler (yedek yol)
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+_SENTIMENT_RE = re.compile(r'-?[01]')
+_CODE_FENCE_RE = re.compile(r'^```(?:json)?\s*(.*?)\s*```$', re.DOTALL)
+
+_SENTIMENT_VALUES = {'1': 1, '0': 0, '-1': -1, '+1': 1}
+
+
+class PromptTemplate:
+    """
+    Sürümlü prompt şablonu
+
+    str.format sözdizimindeki şablon bir kez statik metin ve alan adı
+    parçalarına ayrılır ve statik parçaları sabit olarak gören bir f-string
+    fonksiyonuna derlenir; render() satır içi f-string kadar hızlıdır.
+
+    >>> t = PromptTemplate('demo', 'v1', 'Metin: "{text}" {{json}} {text}')
+    >>> t.render(text='a')
+    'Metin: "a" {json} a'
+    """
+
+    __slots__ = ('name', 'version', 'template', 'fields', '_parts', '_render')
+
+    def __init__(self, name: str, version: str, template: str):
+        """
+        Şablon başlatıcı
+
+        Args:
+            name: Şablon adı (ör. 'classification')
+            version: Şablon sürümü (ör. 'v1')
+            template: str.format sözdiziminde şablon metni
+        """
+        self.name = name
+        self.version = version
+        self.template = template
+
+        parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, _, _ in string.Formatter().parse(template):
+            parts.append((literal, field))
+        self._parts = tuple(parts)
+        self.fields = tuple(dict.fromkeys(field for _, field in parts if field))
+        self._render = self._compile()
+
+    @property
+    def key(self) -> str:
+        """Kayıt anahtarı (ad@sürüm)"""
+        return f"{self.name}@{self.version}"
+
+    @property
+    def render(self):
+        """
+        Şablonu dolduran fonksiyon
+
+        render(**alanlar) hazır prompt metnini döndürür; alanlar anahtar
+        kelimeyle verilir, eksik veya tanımsız alan hata verir.
+        """
+        return self._render
+
+    def _compile(self):
+        """
+        Şablonu f-string fonksiyonuna derle
+
+        Statik parçalar kaynak koda gömülmez, fonksiyonun global adları
+        olarak verilir; böylece şablon metni kaçış gerektirmez. Alan adları
+        Python tanımlayıcısı değilse parça birleştiren yedek yol kullanılır.
+
+        Returns:
+            Anahtar kelime argümanlarıyla çağrılan render fonksiyonu
+        """
+        constants = {f"_s{i}": literal for i, (literal, _) in enumerate(self._parts)}
+        if not all(field.isidentifier() and not keyword.iskeyword(field) and field not in constants
+                   for field in self.fields):
+            parts = self._parts
+
+            def render(**values) -> str:
+                chunks = []
+                for literal, field in parts:
+                    chunks.append(literal)
+                    if field:
+                        chunks.append(str(values[field]))
+                return ''.join(chunks)
+            return render
+
+        body = ''.join('{_s%d}' % i + ('{%s}' % field if field else '')
+                       for i, (_, field) in enumerate(self._parts))
+        params = ', '.join(('*',) + self.fields) if self.fields else ''
+        source = f"lambda {params}: f{body!r}"
+        return eval(compile(source, f"<prompt {self.key}>", 'eval'), constants)
+
+    def partial(self, **values) -> 'PromptTemplate':
+        """
+        Verilen alanları sabitleyip yeni şablon üret
+
+        Çağrıdan çağrıya değişmeyen bloklar (ör. lider listesi) bir kez
+        gömülür; render() yalnızca kalan alanları doldurur.
+
+        Args:
+            **values: Sabitlenecek alan değerleri
+
+        Returns:
+            Aynı ad ve sürümde yeni şablon
+        """
+        def escape(text: str) -> str:
+            return text.replace('{', '{{').replace('}', '}}')
+
+        chunks = []
+        for literal, field in self._parts:
+            chunks.append(escape(literal))
+            if field in values:
+                chunks.append(escape(str(values[field])))
+            elif field:
+                chunks.append('{' + field + '}')
+        return PromptTemplate(self.name, self.version, ''.join(chunks))
+
+
+# Kayıt defteri: ad -> {sürüm: şablon}
+PROMPT_REGISTRY: Dict[str, Dict[str, PromptTemplate]] = {}
+
+# Sürüm belirtilmediğinde kullanılan varsayılan sürümler
+DEFAULT_VERSIONS: Dict[str, str] = {}
+
+
+def register_prompt(template: PromptTemplate, default: bool = False) -> PromptTemplate:
+    """
+    Şablonu kayıt defterine ekle
+
+    Args:
+        template: Prompt şablonu
+        default: Bu sürüm varsayılan olsun mu
+
+    Returns:
+        Eklenen şablon
+    """
+    PROMPT_REGISTRY.setdefault(template.name, {})[template.version] = template
+    if default or template.name not in DEFAULT_VERSIONS:
+        DEFAULT_VERSIONS[template.name] = template.version
+    return template
+
+
+def get_prompt(name: str, version: Optional[str] = None) -> PromptTemplate:
+    """
+    Kayıtlı şablonu getir
+
+    Args:
+        name: Şablon adı
+        version: Sürüm (None = varsayılan)
+
+    Returns:
+        Prompt şablonu
+
+    Raises:
+        KeyError: Şablon veya sürüm bulunamazsa
+    """
+    versions = PROMPT_REGISTRY[name]
+    return versions[version or DEFAULT_VERSIONS[name]]
+
+
+def parse_json_object(response: str) -> Optional[Dict]:
+    """
+    Yanıttan JSON nesnesi çıkar
+
+    Önce yanıtın kendisi (veya ```json bloğu) katı JSON olarak denenir;
+    yalnızca başarısız olursa açgözlü regex ile nesne aranır.
+
+    Args:
+        response: Model yanıtı
+
+    Returns:
+        Ayrıştırılan sözlük veya None
+    """
+    text = response.strip()
+    fenced = _CODE_FENCE_RE.match(text)
+    if fenced:
+        text = fenced.group(1)
+
+    try:
+        parsed = json.loads(text)
+        if isinstance(parsed, dict):
+            return parsed
+    except ValueError:
+        pass
+
+    match = _JSON_OBJECT_RE.search(text)
+    if match:
+        try:
+            parsed = json.loads(match.group())
+            if isinstance(parsed, dict):
+                return parsed
+        except ValueError:
+            pass
+
+    return None
+
+
+def parse_json_array(response: str) -> Optional[List]:
+    """
+    Yanıttan JSON dizisi çıkar (çok satırlı prompt'lar için)
+
+    parse_json_object ile aynı sırayla önce katı JSON, sonra regex denenir.
+
+    Args:
+        response: Model yanıtı
+
+    Returns:
+        Ayrıştırılan liste veya None
+    """
+    text = response.strip()
+    fenced = _CODE_FENCE_RE.match(text)
+    if fenced:
+        text = fenced.group(1)
+
+    try:
+        parsed = json.loads(text)
+        if isinstance(parsed, list):
+            return parsed
+    except ValueError:
+        pass
+
+    match = _JSON_ARRAY_RE.search(text)
+    if match:
+        try:
+            parsed = json.loads(match.group())
+            if isinstance(parsed, list):
+                return parsed
+        except ValueError:
+            pass
+
+    return None
+
+
+def format_batch_rows(rows, leaders=None) -> str:
+    """
+    Çok satırlı prompt için kayıt listesi (satır başına bir JSON nesnesi)
+
+    Metinler JSON olarak kodlanır; içerikteki tırnak ve satır sonları
+    kayıt sınırlarını bozmaz.
+
+    Args:
+        rows: (hesap adı, metin) çiftleri; id sıra numarasıdır
+        leaders: Kayıt sırasıyla sorulacak lider kodları (None = alan eklenmez)
+
+    Returns:
+        Prompt'a gömülecek metin
+    """
+    lines = []
+    for i, (account_name, text) in enumerate(rows):
+        row = {'id': i, 'account_name': account_name, 'text': text}
+        if leaders is not None:
+            row['leaders'] = list(leaders[i])
+        lines.append(json.dumps(row, ensure_ascii=False))
+    return '\n'.join(lines)
+
+
+def parse_sentiment(response: str) -> Optional[int]:
+    """
+    Yanıttan sentiment değeri (-1, 0, 1) çıkar
+
+    Args:
+        response: Model yanıtı
+
+    Returns:
+        Sentiment değeri veya None
+    """
+    text = response.strip()
+    value = _SENTIMENT_VALUES.get(text)
+    if value is not None:
+        return value
+
+    match = _SENTIMENT_RE.search(text)
+    return int(match.group()) if match else None
+
+
+def classification_schema(leader_codes) -> Dict:
+    """
+    Sınıflandırma yanıtı için Gemini responseSchema
+
+    Args:
+        leader_codes: Lider kodları
+
+    Returns:
+        OpenAPI alt kümesinde şema sözlüğü
+    """
+    properties = {f"IS_{code}": {"type": "INTEGER"} for code in leader_codes}
+    properties["reasoning"] = {"type": "STRING"}
+    return {
+        "type": "OBJECT",
+        "properties": properties,
+        "required": list(properties),
+        "propertyOrdering": list(properties)
+    }
+
+
+# Sentiment yanıtı tek bir tamsayıdır (-1, 0, 1)
+SENTIMENT_SCHEMA = {"type": "INTEGER"}
+
+
+def multi_sentiment_schema(leader_codes) -> Dict:
+    """
+    Çok hedefli sentiment yanıtı için şema (lider kodu -> -1/0/1)
+
+    Args:
+        leader_codes: Satırda bahsedilen lider kodları
+
+    Returns:
+        OpenAPI alt kümesinde şema sözlüğü
+    """
+    properties = {code: {"type": "INTEGER"} for code in leader_codes}
+    return {
+        "type": "OBJECT",
+        "properties": properties,
+        "required": list(properties),
+        "propertyOrdering": list(properties)
+    }
+
+
+def validate_multi_sentiment(parsed: Optional[Dict], leader_codes) -> Dict[str, int]:
+    """
+    Çok hedefli sentiment yanıtından geçerli değerleri al
+
+    Geçersiz veya eksik liderler sonuçta yer almaz (yalnızca onlar
+    yeniden sorulur).
+
+    Args:
+        parsed: parse_json_object çıktısı
+        leader_codes: Beklenen lider kodları
+
+    Returns:
+        Lider kodu -> sentiment
+    """
+    if not isinstance(parsed, dict):
+        return {}
+
+    valid = {}
+    for code in leader_codes:
+        value = _SENTIMENT_VALUES.get(str(parsed.get(code)).strip())
+        if value is not None:
+            valid[code] = value
+    return valid
+
+
+def batch_classification_schema(leader_codes) -> Dict:
+    """
+    Çok satırlı sınıflandırma yanıtı için şema (kayıt başına bir nesne)
+
+    Args:
+        leader_codes: Lider kodları
+
+    Returns:
+        OpenAPI alt kümesinde şema sözlüğü
+    """
+    item = classification_schema(leader_codes)
+    properties = {"id": {"type": "INTEGER"}, **item["properties"]}
+    return {
+        "type": "ARRAY",
+        "items": {
+            "type": "OBJECT",
+            "properties": properties,
+            "required": list(properties),
+            "propertyOrdering": list(properties)
+        }
+    }
+
+
+def batch_sentiment_schema(leader_codes) -> Dict:
+    """
+    Çok satırlı sentiment yanıtı için şema
+
+    Kayıtlarda farklı liderler bahsedildiği için yalnızca 'id' zorunludur;
+    lider alanları kayıtta istenen liderler için doldurulur.
+
+    Args:
+        leader_codes: Batch'te en az bir kayıtta bahsedilen lider kodları
+
+    Returns:
+        OpenAPI alt kümesinde şema sözlüğü
+    """
+    properties = {"id": {"type": "INTEGER"}}
+    properties.update({code: {"type": "INTEGER", "nullable": True} for code in leader_codes})
+    return {
+        "type": "ARRAY",
+        "items": {
+            "type": "OBJECT",
+            "properties": properties,
+            "required": ["id"],
+            "propertyOrdering": list(properties)
+        }
+    }
+
+
+def _items_by_id(parsed: Optional[List], size: int) -> Dict[int, Dict]:
+    """Dizi yanıtındaki nesneleri geçerli 'id' değerine göre eşle"""
+    items = {}
+    if not isinstance(parsed, list):
+        return items
+    for item in parsed:
+        if not isinstance(item, dict):
+            continue
+        try:
+            row_id = int(item.get('id'))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= row_id < size and row_id not in items:
+            items[row_id] = item
+    return items
+
+
+def validate_batch_classification(parsed: Optional[List], leader_codes, size: int) -> List[Optional[Dict]]:
+    """
+    Çok satırlı sınıflandırma yanıtını kayıt bazında doğrula
+
+    Eksik veya geçersiz kayıtlar None döner (yalnızca onlar tekil
+    çağrıyla yeniden sorulur).
+
+    Args:
+        parsed: parse_json_array çıktısı
+        leader_codes: Lider kodları
+        size: Prompt'taki kayıt sayısı
+
+    Returns:
+        Kayıt sırasıyla normalize edilmiş sözlük veya None
+    """
+    items = _items_by_id(parsed, size)
+    results = []
+    for row_id in range(size):
+        item = items.get(row_id)
+        if item is not None:
+            item = validate_classification({k: v for k, v in item.items() if k != 'id'}, leader_codes)
+        results.append(item)
+    return results
+
+
+def validate_batch_sentiment(parsed: Optional[List], expected) -> List[Dict[str, int]]:
+    """
+    Çok satırlı sentiment yanıtını kayıt bazında doğrula
+
+    Args:
+        parsed: parse_json_array çıktısı
+        expected: Kayıt sırasıyla istenen lider kodları
+
+    Returns:
+        Kayıt sırasıyla lider kodu -> sentiment (geçersiz liderler yer almaz)
+    """
+    items = _items_by_id(parsed, len(expected))
+    return [validate_multi_sentiment(items.get(row_id), codes) for row_id, codes in enumerate(expected)]
+
+
+def validate_classification(parsed: Optional[Dict], leader_codes) -> Optional[Dict]:
+    """
+    Sınıflandırma yanıtını doğrula ve normalize et
+
+    Her IS_* alanı bulunmalı ve 0/1 (veya "0"/"1") olmalıdır.
+
+    Args:
+        parsed: parse_json_object çıktısı
+        leader_codes: Lider kodları
+
+    Returns:
+        Normalize edilmiş sözlük veya geçersizse None
+    """
+    if not isinstance(parsed, dict):
+        return None
+
+    for code in leader_codes:
+        key = f"IS_{code}"
+        value = _SENTIMENT_VALUES.get(str(parsed.get(key)).strip())
+        if value not in (0, 1):
+            return None
+        parsed[key] = value
+
+    reasoning = parsed.get("reasoning")
+    parsed["reasoning"] = '' if reasoning is None else str(reasoning)
+    return parsed
+
+
+register_prompt(PromptTemplate('classification', 'v1', """
+Sen bir Türk siyasi analiz uzmanısın. Aşağıdaki sosyal medya içeriğini ya da haber metnini analiz ederek, bu içeriğin hangi siyasi lideri ilgilendirdiğini belirle.
+
+Liderler:
+- RTE: Recep Tayyip Erdoğan (AK Parti, Cumhurbaşkanı, AKP Genel Başkanı)
+- OO: Özgür Özel (CHP Genel Başkanı, Muhalefet Lideri)
+- MY: Mansur Yavaş (Ankara Büyükşehir Belediye Başkanı, CHP)
+- EI: Ekrem İmamoğlu (İstanbul Büyükşehir Belediye Başkanı, CHP Cumhurbaşkanı Adayı, CHP)
+
+Kurallar:
+1. İçerik bir lideri doğrudan bahsediyorsa, o lidere +1 ver
+2. İçerik bir liderin görevinden bahsediyorsa, o lidere +1 ver
+3. Diğer tüm liderlere 0 ver.
+4. Eğer hiçbir lider açık şekilde ilgili değilse, hepsine 0 ver
+5. Birden fazla lider ilgiliyse, hepsine +1 ilgisiz olanlara 0 ver.
+
+İçerik: "{text}"
+Hesap: "{account_name}"
+
+Sonucu sadece JSON formatında ver:
+{{
+    "IS_RTE": 1 veya 0,
+    "IS_ÖÖ": 1 veya 0,
+    "IS_MY": 1 veya 0,
+    "IS_EI": 1 veya 0,
+    "reasoning": "Kısa açıklama"
+}}
+"""))
+
+register_prompt(PromptTemplate('sentiment', 'v1', """
+Sen bir politik sentiment analiz uzmanısın. 
+
+Aşağıdaki sosyal medya içeriği ya da haberi "{leader_name}" hakkındaki duygusal tonunu "{leader_name}" lidere göre siyasi bir uzman gibi analiz et.
+Bu haber ya da medya içeriği bu liderle ilgili pozitif bir algı mı negatif bir algı mı?
+
+İçerik: "{text}"
+Hesap: "{account_name}"
+
+Sentiment kategorileri:
+- 1: Pozitif (övgü, destek, beğeni)
+- 0: Nötr (tarafsız bahsetme, objektif, yalnızca bahsetme)
+- -1: Negatif (eleştiri, saldırı, olumsuz)
+
+Sadece sayısal değeri ver (1, 0, veya -1):
+"""))
+
+# Lider listesi ve örnek JSON lider kayıt defterinden üretilir (bkz. leaders.py)
+register_prompt(PromptTemplate('classification', 'v2', """
+Sen bir Türk siyasi analiz uzmanısın. Aşağıdaki sosyal medya içeriğini ya da haber metnini analiz ederek, bu içeriğin hangi siyasi lideri ilgilendirdiğini belirle.
+
+Liderler:
+{leader_block}
+
+Kurallar:
+1. İçerik bir lideri doğrudan bahsediyorsa, o lidere +1 ver
+2. İçerik bir liderin görevinden bahsediyorsa, o lidere +1 ver
+3. Diğer tüm liderlere 0 ver.
+4. Eğer hiçbir lider açık şekilde ilgili değilse, hepsine 0 ver
+5. Birden fazla lider ilgiliyse, hepsine +1 ilgisiz olanlara 0 ver.
+
+İçerik: "{text}"
+Hesap: "{account_name}"
+
+Sonucu sadece JSON formatında ver:
+{{
+{json_example}
+    "reasoning": "Kısa açıklama"
+}}
+"""), default=True)
+
+# Bir satırda bahsedilen tüm liderler için tek çağrı
+register_prompt(PromptTemplate('multi_sentiment', 'v1', """
+Sen bir politik sentiment analiz uzmanısın. 
+
+Aşağıdaki sosyal medya içeriği ya da haberin her bir lider hakkındaki duygusal tonunu o lidere göre siyasi bir uzman gibi ayrı ayrı analiz et.
+Bu haber ya da medya içeriği her liderle ilgili pozitif bir algı mı negatif bir algı mı?
+
+Liderler:
+{leader_list}
+
+İçerik: "{text}"
+Hesap: "{account_name}"
+
+Sentiment kategorileri:
+- 1: Pozitif (övgü, destek, beğeni)
+- 0: Nötr (tarafsız bahsetme, objektif, yalnızca bahsetme)
+- -1: Negatif (eleştiri, saldırı, olumsuz)
+
+Sonucu sadece JSON formatında ver; anahtarlar lider kodları, değerler 1, 0 veya -1:
+"""))
+
+# Birden fazla kaydın sınıflandırması tek çağrıda (istek birleştirici, bkz. coalescer.py)
+register_prompt(PromptTemplate('classification_batch', 'v1', """
+Sen bir Türk siyasi analiz uzmanısın. Aşağıdaki her bir sosyal medya içeriğini ya da haber metnini ayrı ayrı analiz ederek, her içeriğin hangi siyasi lideri ilgilendirdiğini belirle.
+
+Liderler:
+{leader_block}
+
+Kurallar:
+1. İçerik bir lideri doğrudan bahsediyorsa, o lidere +1 ver
+2. İçerik bir liderin görevinden bahsediyorsa, o lidere +1 ver
+3. Diğer tüm liderlere 0 ver.
+4. Eğer hiçbir lider açık şekilde ilgili değilse, hepsine 0 ver
+5. Birden fazla lider ilgiliyse, hepsine +1 ilgisiz olanlara 0 ver.
+6. Her kaydı yalnızca kendi içeriğine göre değerlendir.
+
+Kayıtlar (her satır bir JSON nesnesi):
+{rows}
+
+Sonucu sadece JSON dizisi olarak ver; her kayıt için aynı "id" ile bir nesne:
+[
+  {{
+    "id": 0,
+{json_example}
+    "reasoning": "Kısa açıklama"
+  }}
+]
+"""))
+
+# Birden fazla kaydın, her birinde bahsedilen liderler için sentiment'i tek çağrıda
+register_prompt(PromptTemplate('multi_sentiment_batch', 'v1', """
+Sen bir politik sentiment analiz uzmanısın. 
+
+Aşağıdaki her bir sosyal medya içeriği ya da haberin, "leaders" alanında verilen her lider hakkındaki duygusal tonunu o lidere göre siyasi bir uzman gibi ayrı ayrı analiz et.
+
+Liderler:
+{leader_list}
+
+Kayıtlar (her satır bir JSON nesnesi):
+{rows}
+
+Sentiment kategorileri:
+- 1: Pozitif (övgü, destek, beğeni)
+- 0: Nötr (tarafsız bahsetme, objektif, yalnızca bahsetme)
+- -1: Negatif (eleştiri, saldırı, olumsuz)
+
+Sonucu sadece JSON dizisi olarak ver; her kayıt için aynı "id" ile bir nesne, anahtarlar kayıttaki lider kodları, değerler 1, 0 veya -1:
+"""))
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+İstek Yedekleme (Hedging) - Türk Siyasi Lider Analiz Sistemi
+
+Bazı Gemini çağrıları timeout_sec dolana kadar asılı kalır; batch
+sınırlarında bekleyen worker'lar yüzünden tek bir yavaş çağrı bütün
+batch'i durdurur. Yedekleyici, çağrı aşamanın gözlenen p95 gecikmesini
+aştığında aynı isteğin bir kopyasını gönderir; ilk başarılı yanıt kazanır.
+
+requests bloklayan bir çağrıyı dışarıdan kesemediği için kaybeden deneme
+terk edilir: sonucu beklenmez, tamamlandığında yanıtı kapatılır ve
+zamanlayıcı slotu o an bırakılır. Kopyalar toplam isteklerin budget_pct
+yüzdesini aşamaz ve yalnızca zamanlayıcıda boş slot varsa gönderilir.
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_BUDGET_PCT = 5.0
+DEFAULT_PERCENTILE = 0.95
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_MIN_DELAY_MS = 100
+DEFAULT_WINDOW = 200
+
+
+class LatencyTracker:
+    """Aşama bazında kayan pencereli gecikme örnekleri"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """
+        İzleyici başlatıcı
+
+        Args:
+            window: Aşama başına tutulacak son örnek sayısı
+        """
+        self.window = max(int(window), 1)
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        """
+        Başarılı bir çağrının süresini ekle
+
+        Args:
+            stage: Aşama adı
+            seconds: Çağrı süresi
+        """
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, stage: str, q: float, min_samples: int) -> Optional[float]:
+        """
+        Aşamanın gecikme yüzdeliği
+
+        Args:
+            stage: Aşama adı
+            q: Yüzdelik (0-1)
+            min_samples: Bundan az örnek varken None döner
+
+        Returns:
+            Saniye cinsinden yüzdelik veya None
+        """
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None or len(samples) < max(min_samples, 1):
+                return None
+            ordered = sorted(samples)
+        return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+class RequestHedger:
+    """Gözlenen p95'i aşan çağrılar için bütçeli kopya istek gönderen yürütücü"""
+
+    def __init__(self, budget_pct: float = DEFAULT_BUDGET_PCT, percentile: float = DEFAULT_PERCENTILE,
+                 min_samples: int = DEFAULT_MIN_SAMPLES, min_delay_ms: float = DEFAULT_MIN_DELAY_MS,
+                 window: int = DEFAULT_WINDOW, max_workers: int = 4, name: str = 'hedge'):
+        """
+        Yedekleyici başlatıcı
+
+        Args:
+            budget_pct: Kopya isteklerin toplam isteklere oranı için üst sınır (%)
+            percentile: Kopyanın gönderileceği gecikme yüzdeliği
+            min_samples: Aşama bu kadar örneğe ulaşmadan kopya gönderilmez
+            min_delay_ms: Yüzdelik ne kadar düşük olursa olsun en az bu kadar beklenir
+            window: Aşama başına gecikme penceresi
+            max_workers: Aynı anda uçuşta olabilecek deneme (zamanlayıcı slot sayısı)
+            name: Thread adlarının öneki
+        """
+        self.budget = max(budget_pct, 0) / 100
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = max(min_delay_ms, 0) / 1000
+        self.latency = LatencyTracker(window)
+
+        self._lock = threading.Lock()
+        self.reset_stats()
+        # Her deneme bir zamanlayıcı slotu tuttuğundan havuz kuyrukta beklemez
+        self._executor = ThreadPoolExecutor(max_workers=max(max_workers, 1), thread_name_prefix=name)
+
+    def hedge_delay(self, stage: str) -> Optional[float]:
+        """
+        Aşama için kopya gönderme eşiği
+
+        Args:
+            stage: Aşama adı
+
+        Returns:
+            Saniye cinsinden eşik veya yeterli örnek yoksa None
+        """
+        observed = self.latency.percentile(stage, self.percentile, self.min_samples)
+        if observed is None:
+            return None
+        return max(observed, self.min_delay)
+
+    def call(self, send: Callable[[], Any], stage: str, try_slot: Callable[[], bool],
+             succeeded: Callable[[Any], bool], discard: Callable[[Any], None]) -> Any:
+        """
+        Çağrıyı gerekirse kopyasıyla birlikte çalıştır
+
+        send ilk deneme için çağrılmadan önce slot alınmış olmalıdır; send
+        her denemede slotu bırakır. Kopya için slot try_slot ile beklemeden
+        alınır.
+
+        Args:
+            send: Tek HTTP denemesi (yanıt döndürür veya hata fırlatır)
+            stage: Gecikme örneklerinin tutulacağı aşama
+            try_slot: Kopya için beklemeden slot alan fonksiyon
+            succeeded: Yanıtın başarılı sayılıp sayılmadığı
+            discard: Kullanılmayan yanıtı kapatan fonksiyon
+
+        Returns:
+            Kazanan denemenin yanıtı (hiçbiri başarılı değilse ilk denemenin sonucu)
+        """
+        with self._lock:
+            self._stats['requests'] += 1
+
+        delay = self.hedge_delay(stage)
+        if delay is None:
+            # Isınma: örnek toplanırken thread değiştirmeden çalıştır
+            return self._timed(send, stage, succeeded)
+
+        primary = self._executor.submit(self._timed, send, stage, succeeded)
+        if wait([primary], timeout=delay).done:
+            return primary.result()
+
+        if not self._take_budget():
+            return primary.result()
+        if not try_slot():
+            with self._lock:
+                self._stats['hedged'] -= 1
+                self._stats['skipped_no_slot'] += 1
+            return primary.result()
+
+        hedge = self._executor.submit(self._timed, send, stage, succeeded)
+        pending = {primary, hedge}
+        winner = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if self._succeeded(future, succeeded)), None)
+
+        chosen = winner or primary
+        loser = hedge if chosen is primary else primary
+        if winner is hedge:
+            with self._lock:
+                self._stats['hedge_wins'] += 1
+        if not loser.done():
+            with self._lock:
+                self._stats['abandoned'] += 1
+        loser.add_done_callback(lambda future: self._discard(future, discard))
+        return chosen.result()
+
+    def _take_budget(self) -> bool:
+        """Bütçe izin veriyorsa bir kopya hakkı ayır"""
+        with self._lock:
+            if self._stats['hedged'] + 1 > self.budget * self._stats['requests']:
+                self._stats['skipped_budget'] += 1
+                return False
+            self._stats['hedged'] += 1
+            return True
+
+    def _timed(self, send: Callable[[], Any], stage: str, succeeded: Callable[[Any], bool]) -> Any:
+        """Denemeyi çalıştır, başarılıysa süresini örneklere ekle"""
+        started = time.monotonic()
+        result = send()
+        if succeeded(result):
+            self.latency.observe(stage, time.monotonic() - started)
+        return result
+
+    @staticmethod
+    def _succeeded(future: Future, succeeded: Callable[[Any], bool]) -> bool:
+        return future.exception() is None and succeeded(future.result())
+
+    @staticmethod
+    def _discard(future: Future, discard: Callable[[Any], None]):
+        """Kaybeden denemenin yanıtını (varsa) kapat"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        discard(future.result())
+
+    def reset_stats(self, counters: Optional[Dict] = None):
+        """
+        Sayaçları sıfırla (gecikme örnekleri korunur)
+
+        Args:
+            counters: Verilirse sayaçlar bu değerlere (ör. önceki stats() çıktısı) ayarlanır
+        """
+        counters = counters or {}
+        with self._lock:
+            self._stats = {key: counters.get(key, 0) for key in
+                           ('requests', 'hedged', 'hedge_wins', 'abandoned', 'skipped_budget', 'skipped_no_slot')}
+
+    def stats(self) -> Dict:
+        """Kopya sayıları ve bütçe kullanımı"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['budget_pct'] = round(self.budget * 100, 2)
+        stats['hedge_rate'] = round(stats['hedged'] / stats['requests'], 4) if stats['requests'] else 0
+        stats['hedge_win_rate'] = round(stats['hedge_wins'] / stats['hedged'], 4) if stats['hedged'] else 0
+        return stats
+
+    def close(self):
+        """Yeni deneme kabul etme; uçuştaki denemeler arka planda tamamlanır"""
+        self._executor.shutdown(wait=False)
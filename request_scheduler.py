@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+API İstek Zamanlayıcı - Türk Siyasi Lider Analiz Sistemi
+
+make_api_request önünde duran, öncelik sınıflı ve ağırlıklı adil paylaşımlı
+(weighted fair queuing) bir istek kapısı. Aynı API anahtarını kullanan tüm
+analizör örnekleri process içinde tek bir zamanlayıcıyı paylaşır; böylece
+toplu işler kotayı doldururken etkileşimli istekler düşük gecikmeyle geçer.
+"""
+
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Öncelik sınıfları ve ağırlıkları (yüksek ağırlık = daha büyük pay)
+DEFAULT_WEIGHTS = {
+    'interactive': 8.0,
+    'bulk': 1.0,
+}
+
+# Rate limit (429) sonrası soğuma süresinden muaf sınıflar
+COOLDOWN_EXEMPT = ('interactive',)
+
+
+class RequestScheduler:
+    """
+    Ağırlıklı adil paylaşımlı istek zamanlayıcı
+
+    Her sınıfın bir sanal zamanı vardır; boş slot açıldığında bekleyen
+    sınıflardan sanal zamanı en küçük olan seçilir ve sanal zamanı
+    1/ağırlık kadar ilerletilir. Sınıf içinde sıra FIFO'dur.
+    """
+
+    def __init__(self, max_concurrent: int = 4, min_interval_sec: float = 0.0,
+                 weights: Optional[Dict[str, float]] = None):
+        """
+        Zamanlayıcı başlatıcı
+
+        Args:
+            max_concurrent: Aynı anda uçuşta olabilecek maksimum istek
+            min_interval_sec: Ardışık istekler arası minimum süre
+            weights: Sınıf ağırlıkları
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval_sec = min_interval_sec
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+
+        self._cond = threading.Condition()
+        self._waiting = {cls: deque() for cls in self.weights}
+        self._vtime = {cls: 0.0 for cls in self.weights}
+        self._global_vtime = 0.0
+        self._active = 0
+        self._last_dispatch = 0.0
+        self._cooldown_until = 0.0
+
+        self.stats = {cls: {'granted': 0, 'wait_sec': 0.0} for cls in self.weights}
+
+    def _resolve_class(self, priority: Optional[str]) -> str:
+        if priority in self.weights:
+            return priority
+        return 'bulk' if 'bulk' in self.weights else next(iter(self.weights))
+
+    def _dispatch_delay(self, cls: str, now: float) -> float:
+        """Sınıfın dispatch edilebilmesi için kalan süre"""
+        delay = self._last_dispatch + self.min_interval_sec - now
+        if cls not in COOLDOWN_EXEMPT:
+            delay = max(delay, self._cooldown_until - now)
+        return delay
+
+    def _next_class(self, now: float) -> Optional[str]:
+        """Sıradaki sınıfı seç (en küçük sanal zaman)"""
+        candidates = [
+            cls for cls, queue in self._waiting.items()
+            if queue and self._dispatch_delay(cls, now) <= 0
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda cls: self._vtime[cls])
+
+    def acquire(self, priority: Optional[str] = None):
+        """
+        İstek slotu al (gerekirse sırayı bekle)
+
+        Args:
+            priority: Öncelik sınıfı ('interactive', 'bulk', ...)
+        """
+        cls = self._resolve_class(priority)
+        ticket = object()
+        enqueued_at = time.monotonic()
+
+        with self._cond:
+            queue = self._waiting[cls]
+            if not queue:
+                # Boşta kalan sınıf geçmişe dönük kredi biriktirmesin
+                self._vtime[cls] = max(self._vtime[cls], self._global_vtime)
+            queue.append(ticket)
+
+            while True:
+                now = time.monotonic()
+                if (self._active < self.max_concurrent and queue[0] is ticket
+                        and self._next_class(now) == cls):
+                    break
+
+                timeout = None
+                if self._active < self.max_concurrent:
+                    delays = [self._dispatch_delay(c, now) for c, q in self._waiting.items() if q]
+                    pending = [d for d in delays if d > 0]
+                    if pending:
+                        timeout = min(pending)
+                self._cond.wait(timeout=timeout)
+
+            queue.popleft()
+            self._grant(cls, enqueued_at)
+
+    def try_acquire(self, priority: Optional[str] = None) -> bool:
+        """
+        Slot boşsa beklemeden al (kopya istekler için)
+
+        Sırada bekleyen varsa veya sınıf soğumadaysa slot alınmaz; böylece
+        kopyalar bekleyen isteklerin önüne geçmez.
+
+        Args:
+            priority: Öncelik sınıfı
+
+        Returns:
+            Slot alındıysa True
+        """
+        cls = self._resolve_class(priority)
+        with self._cond:
+            now = time.monotonic()
+            if (self._active >= self.max_concurrent or any(self._waiting.values())
+                    or self._dispatch_delay(cls, now) > 0):
+                return False
+            self._vtime[cls] = max(self._vtime[cls], self._global_vtime)
+            self._grant(cls, now)
+            return True
+
+    def _grant(self, cls: str, enqueued_at: float):
+        """Slotu sınıfa ver ve sanal zamanı ilerlet (kilit altında çağrılır)"""
+        self._active += 1
+        self._global_vtime = self._vtime[cls]
+        self._vtime[cls] += 1.0 / self.weights[cls]
+        self._last_dispatch = time.monotonic()
+
+        self.stats[cls]['granted'] += 1
+        self.stats[cls]['wait_sec'] += self._last_dispatch - enqueued_at
+        self._cond.notify_all()
+
+    def release(self):
+        """İstek slotunu bırak"""
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: Optional[str] = None):
+        """acquire/release için context manager"""
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def penalize(self, seconds: float):
+        """
+        Rate limit sonrası muaf olmayan sınıfları soğut
+
+        Args:
+            seconds: Soğuma süresi
+        """
+        with self._cond:
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+
+# API anahtarı başına paylaşılan zamanlayıcılar
+_schedulers: Dict[str, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(api_key: str, **kwargs) -> RequestScheduler:
+    """
+    API anahtarı için process genelinde paylaşılan zamanlayıcıyı getir
+
+    İlk çağrıdaki ayarlar geçerlidir; sonraki çağrılar aynı örneği döndürür.
+
+    Args:
+        api_key: Google Gemini API anahtarı
+        **kwargs: RequestScheduler ayarları
+
+    Returns:
+        Paylaşılan RequestScheduler
+    """
+    with _schedulers_lock:
+        if api_key not in _schedulers:
+            _schedulers[api_key] = RequestScheduler(**kwargs)
+        return _schedulers[api_key]
@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""
+Kompakt Sonuç Kayıtları - Türk Siyasi Lider Analiz Sistemi
+
+Her sonuç satırı için ~20 anahtarlı bir dict yerine __slots__ kullanan
+tek bir nesne tutulur. Lider etiketleri, sentiment'ler ve sentiment
+kaynakları satır başına tek bir `bytes` içinde paketlenir; sütun düzeni
+tüm satırlarca paylaşılan RecordLayout'tadır. Kayıtlar salt okunur
+Mapping'dir: `r['IS_RTE']`, `r.get(...)`, `dict(r)` ve `pd.DataFrame(rows)`
+dict satırlarla aynı şekilde çalışır.
+
+Çok satırlı işlerde sonuçlar ResultStore'da sütunsal olarak birikir: int8
+etiket/sentiment dizileri ve girdi kaydına başvuran ROW_ID (metin kopyası
+tutulmaz). pandas/Arrow'a sayısal sütunlar kopyalanmadan çevrilir.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from leaders import LeaderRegistry
+
+# Paketlenmiş sentiment kaynakları (0 = yok)
+SOURCE_NAMES = (None, 'llm', 'lexicon', 'lexicon_fallback', 'account_prior')
+_SOURCE_CODES = {name: i for i, name in enumerate(SOURCE_NAMES)}
+
+# Etiket/sentiment değerleri value + 2 olarak saklanır (0 = None)
+_VALUE_OFFSET = 2
+
+# Kayıt nesnesinde doğrudan tutulan sütunlar
+_ATTRIBUTE_COLUMNS = {
+    'ACCOUNT_NAME': 'account',
+    'TEXT': 'text',
+    'reasoning': 'reasoning',
+    'INPUT_TOKENS': 'input_tokens',
+    'API_PROMPT_TOKENS': 'api_prompt_tokens',
+    'API_OUTPUT_TOKENS': 'api_output_tokens',
+    'CLASSIFICATION_SOURCE': 'classification_source',
+}
+
+
+def _pack_value(value: Optional[int]) -> int:
+    return 0 if value is None else int(value) + _VALUE_OFFSET
+
+
+def _unpack_value(byte: int) -> Optional[int]:
+    return None if byte == 0 else byte - _VALUE_OFFSET
+
+
+class RecordLayout:
+    """Bir lider kayıt defteri için sütun -> saklama yeri eşlemesi"""
+
+    def __init__(self, registry: LeaderRegistry):
+        """
+        Düzen başlatıcı
+
+        Args:
+            registry: Lider kayıt defteri
+        """
+        self.codes = registry.codes
+        n = len(self.codes)
+
+        # Sütun -> ('attr', ad) | ('value', bayt indeksi) | ('source', bayt indeksi)
+        self.index: Dict[str, Tuple[str, object]] = {}
+        self.columns: List[str] = []
+
+        def add(column, spec):
+            self.index[column] = spec
+            self.columns.append(column)
+
+        add('ACCOUNT_NAME', ('attr', 'account'))
+        add('TEXT', ('attr', 'text'))
+        for i, code in enumerate(self.codes):
+            add(f'IS_{code}', ('value', i))
+        for i, column in enumerate(registry.sentiment_columns.values()):
+            add(column, ('value', n + i))
+        for i, column in enumerate(registry.source_columns.values()):
+            add(column, ('source', 2 * n + i))
+        for column in ('reasoning', 'INPUT_TOKENS', 'API_PROMPT_TOKENS',
+                       'API_OUTPUT_TOKENS', 'CLASSIFICATION_SOURCE'):
+            add(column, ('attr', _ATTRIBUTE_COLUMNS[column]))
+
+    def make(self, account: str, text: str, classification: Dict,
+             resolved: Dict[str, Tuple[int, str]], reasoning: str, input_tokens: int,
+             api_prompt_tokens: int, api_output_tokens: int,
+             classification_source: str) -> 'AnalysisRecord':
+        """
+        Sonuç kaydı oluştur
+
+        Args:
+            classification: IS_* etiketleri (eksik lider = -1)
+            resolved: Lider kodu -> (sentiment, kaynak)
+
+        Returns:
+            AnalysisRecord
+        """
+        packed = bytearray(3 * len(self.codes))
+        n = len(self.codes)
+        for i, code in enumerate(self.codes):
+            packed[i] = _pack_value(classification.get(f'IS_{code}', -1))
+            if code in resolved:
+                sentiment, source = resolved[code]
+                packed[n + i] = _pack_value(sentiment)
+                packed[2 * n + i] = _SOURCE_CODES[source]
+
+        return AnalysisRecord(self, account, text, bytes(packed), reasoning, input_tokens,
+                              api_prompt_tokens, api_output_tokens, classification_source)
+
+
+class AnalysisRecord(Mapping):
+    """Tek bir analiz sonucu (salt okunur, dict uyumlu)"""
+
+    __slots__ = ('layout', 'account', 'text', 'packed', 'reasoning', 'input_tokens',
+                 'api_prompt_tokens', 'api_output_tokens', 'classification_source')
+
+    def __init__(self, layout: RecordLayout, account: str, text: str, packed: bytes,
+                 reasoning: str, input_tokens: int, api_prompt_tokens: int,
+                 api_output_tokens: int, classification_source: str):
+        self.layout = layout
+        self.account = account
+        self.text = text
+        self.packed = packed
+        self.reasoning = reasoning
+        self.input_tokens = input_tokens
+        self.api_prompt_tokens = api_prompt_tokens
+        self.api_output_tokens = api_output_tokens
+        self.classification_source = classification_source
+
+    def __getitem__(self, column: str):
+        kind, where = self.layout.index[column]
+        if kind == 'attr':
+            return getattr(self, where)
+        if kind == 'value':
+            return _unpack_value(self.packed[where])
+        return SOURCE_NAMES[self.packed[where]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.layout.columns)
+
+    def __len__(self) -> int:
+        return len(self.layout.columns)
+
+    def __repr__(self) -> str:
+        return f"AnalysisRecord({dict(self)!r})"
+
+
+# Tip dizilerinde boş (None) değer
+NULL_INT8 = -128
+
+# ResultStore'da sütun olarak tutulan sayaçlar
+_COUNTER_COLUMNS = ('INPUT_TOKENS', 'API_PROMPT_TOKENS', 'API_OUTPUT_TOKENS')
+
+
+class ResultStore:
+    """
+    Tip dizileriyle tutulan sütunsal sonuç deposu
+
+    Lider etiketleri ve sentiment'ler int8, kaynaklar uint8 kodları olarak
+    saklanır. Her satır girdi dosyasındaki (temizlenmiş) kayıt numarasını
+    ROW_ID olarak tutar; keep_text=False iken TEXT/ACCOUNT_NAME kopyalanmaz,
+    CSV yazılırken girdiden okunur. reasoning saklanmaz (CSV'de yer almaz).
+
+    Dilimleme (store[a:b]) kopyasız bir görünüm döndürür.
+    """
+
+    def __init__(self, layout: RecordLayout, keep_text: bool = True, capacity: int = 1024):
+        """
+        Depo başlatıcı
+
+        Args:
+            layout: Paylaşılan sütun düzeni
+            keep_text: ACCOUNT_NAME/TEXT'i depoda tut (False = ROW_ID ile girdiye başvur)
+            capacity: Başlangıç kapasitesi (dolunca iki katına çıkar)
+        """
+        import numpy as np
+
+        self.layout = layout
+        self.keep_text = keep_text
+        self.size = 0
+        self._view = False
+
+        n = len(layout.codes)
+        capacity = max(int(capacity), 1)
+        # Lider/sayaç dizileri sütun öncelikli: her sütun bellekte bitişik
+        self.row_ids = np.empty(capacity, dtype=np.int64)
+        self.flags = np.empty((n, capacity), dtype=np.int8)
+        self.sentiments = np.empty((n, capacity), dtype=np.int8)
+        self.sources = np.empty((n, capacity), dtype=np.uint8)
+        self.counters = np.empty((len(_COUNTER_COLUMNS), capacity), dtype=np.int32)
+        self.classification_sources = np.empty(capacity, dtype=np.uint8)
+        self.source_labels: List[str] = []
+        self.accounts: Optional[List[str]] = [] if keep_text else None
+        self.texts: Optional[List[str]] = [] if keep_text else None
+
+    @classmethod
+    def from_records(cls, layout: RecordLayout, records, row_ids=None) -> 'ResultStore':
+        """
+        Dict/AnalysisRecord listesinden depo oluştur (metinler tutulur)
+
+        Args:
+            layout: Sütun düzeni
+            records: Sonuç satırları
+            row_ids: Satırların girdi numaraları (None = sıra numarası)
+        """
+        if isinstance(records, ResultStore):
+            return records
+        records = list(records)
+        store = cls(layout, keep_text=True, capacity=len(records) or 1)
+        store.extend(records, row_ids if row_ids is not None else range(len(records)))
+        return store
+
+    def _columns(self):
+        return ('row_ids', 'flags', 'sentiments', 'sources', 'counters', 'classification_sources')
+
+    def _grow(self, needed: int):
+        import numpy as np
+
+        capacity = len(self.row_ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in self._columns():
+            old = getattr(self, name)
+            new = np.empty(old.shape[:-1] + (capacity,), dtype=old.dtype)
+            new[..., :self.size] = old[..., :self.size]
+            setattr(self, name, new)
+
+    def _label_code(self, label: str) -> int:
+        try:
+            return self.source_labels.index(label)
+        except ValueError:
+            self.source_labels.append(label)
+            return len(self.source_labels) - 1
+
+    def append(self, record, row_id: int):
+        """
+        Bir sonuç satırı ekle
+
+        Args:
+            record: AnalysisRecord veya dict satır
+            row_id: Girdi dosyasındaki kayıt numarası
+        """
+        if self._view:
+            raise TypeError("ResultStore görünümüne satır eklenemez")
+
+        self._grow(self.size + 1)
+        i = self.size
+        n = len(self.layout.codes)
+
+        if isinstance(record, AnalysisRecord) and record.layout is self.layout:
+            packed = record.packed
+            for j in range(n):
+                self.flags[j, i] = NULL_INT8 if packed[j] == 0 else packed[j] - _VALUE_OFFSET
+                self.sentiments[j, i] = NULL_INT8 if packed[n + j] == 0 else packed[n + j] - _VALUE_OFFSET
+                self.sources[j, i] = packed[2 * n + j]
+        else:
+            columns = self.layout.columns
+            for j in range(n):
+                flag = record.get(columns[2 + j])
+                sentiment = record.get(columns[2 + n + j])
+                self.flags[j, i] = NULL_INT8 if flag is None or flag != flag else int(flag)
+                self.sentiments[j, i] = NULL_INT8 if sentiment is None or sentiment != sentiment else int(sentiment)
+                self.sources[j, i] = _SOURCE_CODES.get(record.get(columns[2 + 2 * n + j]), 0)
+
+        for j, column in enumerate(_COUNTER_COLUMNS):
+            self.counters[j, i] = record.get(column) or 0
+        self.classification_sources[i] = self._label_code(record.get('CLASSIFICATION_SOURCE') or '')
+        self.row_ids[i] = row_id
+
+        if self.keep_text:
+            self.accounts.append(record.get('ACCOUNT_NAME', ''))
+            self.texts.append(record.get('TEXT', ''))
+        self.size += 1
+
+    def extend(self, records, row_ids):
+        """Birden fazla satırı girdi numaralarıyla ekle"""
+        for record, row_id in zip(records, row_ids):
+            self.append(record, row_id)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, key):
+        """store[i] -> dict satır, store[a:b] -> kopyasız görünüm"""
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.size)
+            if step != 1:
+                raise ValueError("ResultStore yalnızca adımsız dilimlemeyi destekler")
+            view = object.__new__(ResultStore)
+            view.layout = self.layout
+            view.keep_text = self.keep_text
+            view.size = max(stop - start, 0)
+            view._view = True
+            for name in self._columns():
+                setattr(view, name, getattr(self, name)[..., start:stop])
+            view.source_labels = self.source_labels
+            view.accounts = self.accounts[start:stop] if self.keep_text else None
+            view.texts = self.texts[start:stop] if self.keep_text else None
+            return view
+
+        if key < 0:
+            key += self.size
+        if not 0 <= key < self.size:
+            raise IndexError(key)
+        return self._row(key)
+
+    def _row(self, i: int) -> Dict:
+        n = len(self.layout.codes)
+        columns = self.layout.columns
+        row = {}
+        if self.keep_text:
+            row['ACCOUNT_NAME'] = self.accounts[i]
+            row['TEXT'] = self.texts[i]
+        for offset, values in ((2, self.flags), (2 + n, self.sentiments)):
+            for j in range(n):
+                value = int(values[j, i])
+                row[columns[offset + j]] = None if value == NULL_INT8 else value
+        for j in range(n):
+            row[columns[2 + 2 * n + j]] = SOURCE_NAMES[self.sources[j, i]]
+        for j, column in enumerate(_COUNTER_COLUMNS):
+            row[column] = int(self.counters[j, i])
+        row['CLASSIFICATION_SOURCE'] = self.source_labels[self.classification_sources[i]]
+        row['ROW_ID'] = int(self.row_ids[i])
+        return row
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self.size):
+            yield self._row(i)
+
+    def to_pandas(self):
+        """
+        pandas DataFrame (sayısal sütunlar kopyasız; boş değerler maskeli Int8)
+
+        Returns:
+            ROW_ID, [ACCOUNT_NAME, TEXT], IS_*, sentiment, kaynak ve sayaç sütunları
+        """
+        import numpy as np
+        import pandas as pd
+
+        n = len(self.layout.codes)
+        columns = self.layout.columns
+        size = self.size
+        data = {'ROW_ID': self.row_ids[:size]}
+        if self.keep_text:
+            data['ACCOUNT_NAME'] = self.accounts[:size]
+            data['TEXT'] = self.texts[:size]
+
+        for offset, values in ((2, self.flags), (2 + n, self.sentiments)):
+            for j in range(n):
+                column = values[j, :size]
+                data[columns[offset + j]] = pd.arrays.IntegerArray(column, column == NULL_INT8)
+        for j in range(n):
+            data[columns[2 + 2 * n + j]] = pd.Categorical.from_codes(
+                self.sources[j, :size].astype(np.int8) - 1, categories=list(SOURCE_NAMES[1:]))
+        for j, column in enumerate(_COUNTER_COLUMNS):
+            data[column] = self.counters[j, :size]
+        data['CLASSIFICATION_SOURCE'] = pd.Categorical.from_codes(
+            self.classification_sources[:size].astype(np.int16), categories=self.source_labels or [''])
+
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """pyarrow Table (sayısal sütunlar kopyasız)"""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("to_arrow için pyarrow gerekli: pip install pyarrow") from e
+        return pa.Table.from_pandas(self.to_pandas(), preserve_index=False)
+
+    def leader_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Lider bazında bahsetme ve sentiment sayıları (vektörel)
+
+        Returns:
+            Lider kodu -> {'mentions', 'positive', 'neutral', 'negative', 'total_sentiment'}
+        """
+        size = self.size
+        counts = {}
+        for j, code in enumerate(self.layout.codes):
+            sentiments = self.sentiments[j, :size]
+            counts[code] = {
+                'mentions': int((self.flags[j, :size] == 1).sum()),
+                'positive': int((sentiments == 1).sum()),
+                'neutral': int((sentiments == 0).sum()),
+                'negative': int((sentiments == -1).sum()),
+                'total_sentiment': int((sentiments != NULL_INT8).sum())
+            }
+        return counts
+
+    def save(self, path: str):
+        """Sayısal sütunları .npz olarak kaydet (devam etmek için)"""
+        import numpy as np
+
+        size = self.size
+        with open(path, 'wb') as f:
+            np.savez(f, codes=np.array(self.layout.codes),
+                     source_labels=np.array(self.source_labels, dtype=str),
+                     **{name: getattr(self, name)[..., :size] for name in self._columns()})
+
+    @classmethod
+    def load(cls, layout: RecordLayout, path: str) -> 'ResultStore':
+        """
+        save() ile kaydedilmiş depoyu yükle
+
+        Raises:
+            ValueError: Lider listesi düzenle uyuşmuyorsa
+        """
+        import numpy as np
+
+        with np.load(path) as data:
+            if list(data['codes']) != list(layout.codes):
+                raise ValueError(f"Kayıtlı depo farklı liderler içeriyor: {list(data['codes'])}")
+            size = len(data['row_ids'])
+            store = cls(layout, keep_text=False, capacity=max(size, 1))
+            for name in store._columns():
+                getattr(store, name)[..., :size] = data[name]
+            store.source_labels = [str(label) for label in data['source_labels']]
+            store.size = size
+        return store
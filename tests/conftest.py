@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Testler modülleri depo kökünden içe aktarır"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
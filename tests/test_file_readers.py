@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+CSV okuyucu eşdeğerlik testleri: pandas ve pandas'sız okuyucu aynı
+kayıtları üretmeli (small_input_rows eşiği çıktıyı değiştirmemeli)
+"""
+
+import io
+
+import pytest
+
+from file_readers import iter_csv_chunks, iter_csv_chunks_light, iter_record_batches
+
+CSV_CASES = {
+    'na_strings': 'ACCOUNT_NAME,TEXT\n@a,NA\n@b,null\n@c,N/A\n@d,nan\n@e,None\n',
+    'numeric_strings': 'ID,ACCOUNT_NAME,TEXT\n001,@a,007\n2,@b,1e3\n3,@c,-0\n',
+    'empty_values': 'ACCOUNT_NAME,TEXT\n,metin\n@b,\n@c,   \n@d,x\n',
+    'quoted_multiline': 'ACCOUNT_NAME,TEXT\n@a,"çok, satırlı\nmetin"\n@b,"""alıntı"" 😡"\n',
+    'padded_header': ' ACCOUNT_NAME , TEXT \n@a,  boşluklu  \n',
+    'blank_lines': 'ACCOUNT_NAME,TEXT\n\n@a,x\n\n@b,y\n',
+    'short_rows': 'ACCOUNT_NAME,TEXT,DATE\n@a,x\n@b,y,2024-01-01\n',
+    'crlf': 'ACCOUNT_NAME,TEXT\r\n@a,x\r\n@b,y\r\n',
+    'utf8_bom': '﻿ACCOUNT_NAME,TEXT\n@a,Erdoğan\n',
+}
+
+
+def read_all(reader, source, chunksize):
+    return [record for chunk in reader(source, chunksize=chunksize) for record in chunk]
+
+
+@pytest.mark.parametrize('chunksize', [1, 2, 1000])
+@pytest.mark.parametrize('name', sorted(CSV_CASES))
+def test_readers_return_same_records(name, chunksize):
+    data = CSV_CASES[name].encode('utf-8')
+    pandas_rows = read_all(iter_csv_chunks, io.BytesIO(data), chunksize)
+    light_rows = read_all(iter_csv_chunks_light, io.BytesIO(data), chunksize)
+    assert pandas_rows
+    assert pandas_rows == light_rows
+
+
+def test_readers_keep_values_as_strings():
+    data = CSV_CASES['numeric_strings'].encode('utf-8')
+    rows = read_all(iter_csv_chunks, io.BytesIO(data), 1000)
+    assert [(row['ID'], row['TEXT']) for row in rows] == [('001', '007'), ('2', '1e3'), ('3', '-0')]
+
+
+@pytest.mark.parametrize('name', ['utf8_bom', 'quoted_multiline', 'short_rows'])
+def test_readers_match_from_path(tmp_path, name):
+    path = tmp_path / 'input.csv'
+    path.write_bytes(CSV_CASES[name].encode('utf-8'))
+    assert read_all(iter_csv_chunks, str(path), 1000) == read_all(iter_csv_chunks_light, str(path), 1000)
+
+
+@pytest.mark.parametrize('skip', [0, 1, 4])
+def test_record_batches_match_when_resuming(tmp_path, skip):
+    path = tmp_path / 'input.csv'
+    path.write_text('ACCOUNT_NAME,TEXT\n' + ''.join(f'@h{i},{i:03d}\n' for i in range(9)), encoding='utf-8')
+
+    pandas_batches = list(iter_record_batches(str(path), 2, skip=skip, chunksize=3))
+    light_batches = list(iter_record_batches(str(path), 2, skip=skip, chunksize=3, light=True))
+    assert pandas_batches == light_batches
+    assert [row['TEXT'] for batch in light_batches for row in batch] == [f'{i:03d}' for i in range(skip, 9)]
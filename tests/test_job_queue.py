@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+İş kuyruğu davranış testleri: heartbeat, zaman aşımında yeniden kuyruğa
+alma ve çökmüş dosya işinin kaldığı yerden devam etmesi
+"""
+
+import csv
+
+import pytest
+
+import political_analyzer
+from job_queue import JobQueue, JobWorker
+
+CLASSIFICATION_RESPONSE = '{"IS_RTE": 1, "IS_ÖÖ": 0, "IS_MY": 0, "IS_EI": 0, "reasoning": "test"}'
+WORKER_CONFIG = {'rate_limit_sec': 0, 'save_progress': False, 'log_file': None, 'log_level': 'WARNING'}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / 'jobs.db'))
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    """API çağrılarını sahte yanıtla değiştir, gönderilen prompt'ları topla"""
+    sent = []
+
+    def fake_request(self, prompt, *args, **kwargs):
+        sent.append(prompt)
+        return CLASSIFICATION_RESPONSE if 'IS_RTE' in prompt else '1'
+
+    monkeypatch.setattr(political_analyzer.PoliticalAnalysisSystem, 'make_api_request', fake_request)
+    return sent
+
+
+@pytest.fixture
+def input_csv(tmp_path):
+    path = tmp_path / 'input.csv'
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['ACCOUNT_NAME', 'TEXT'])
+        for i in range(6):
+            writer.writerow([f'@hesap{i}', f'metin-{i} Erdoğan konuştu'])
+    return str(path)
+
+
+def test_live_job_is_not_requeued(queue):
+    job_id = queue.submit_text('@hesap', 'metin')
+    assert queue.claim_next('worker-1')['id'] == job_id
+
+    queue.heartbeat(job_id, 'worker-1')
+    assert queue.requeue_stale(lease_sec=60) == []
+    assert queue.claim_next('worker-2') is None
+    assert queue.get_job(job_id)['worker'] == 'worker-1'
+
+
+def test_stale_job_is_requeued_and_claimed_by_another_worker(queue):
+    job_id = queue.submit_text('@hesap', 'metin')
+    queue.claim_next('worker-1')
+
+    assert queue.requeue_stale(lease_sec=-1) == [job_id]
+    job = queue.get_job(job_id)
+    assert (job['status'], job['worker']) == ('queued', None)
+
+    job = queue.claim_next('worker-2')
+    assert (job['id'], job['worker']) == (job_id, 'worker-2')
+
+
+def test_heartbeat_from_previous_owner_is_ignored(queue):
+    job_id = queue.submit_text('@hesap', 'metin')
+    queue.claim_next('worker-1')
+    queue.requeue_stale(lease_sec=-1)
+    queue.claim_next('worker-2')
+    before = queue.get_job(job_id)['heartbeat_at']
+
+    queue.heartbeat(job_id, 'worker-1')
+    assert queue.get_job(job_id)['heartbeat_at'] == before
+
+
+def test_requeued_file_job_resumes_after_last_saved_batch(queue, prompts, input_csv, tmp_path):
+    output_file = str(tmp_path / 'results.csv')
+    job_id = queue.submit_file(input_csv, output_file, config={'batch_size': 2})
+
+    # İlk worker bir batch kaydettikten sonra çöker
+    first = JobWorker(queue, 'test-key', dict(WORKER_CONFIG), worker_id='crashed')
+    job = queue.claim_next('crashed')
+    batch = [{'ACCOUNT_NAME': '@hesap0', 'TEXT': 'metin-0 Erdoğan konuştu'},
+             {'ACCOUNT_NAME': '@hesap1', 'TEXT': 'metin-1 Erdoğan konuştu'}]
+    queue.append_results(job['id'], first.analyzer.process_batch_parallel(batch), len(batch), 0)
+    assert queue.requeue_stale(lease_sec=-1) == [job_id]
+    prompts.clear()
+
+    second = JobWorker(queue, 'test-key', dict(WORKER_CONFIG), worker_id='resumed')
+    assert second.run_once()
+
+    job = queue.get_job(job_id)
+    assert (job['status'], job['worker'], job['processed'], job['result_count']) == ('done', 'resumed', 6, 6)
+    assert [row_index for row_index, _ in queue.iter_results(job_id, with_index=True)] == list(range(6))
+
+    # Kaydedilmiş satırlar yeniden analiz edilmez
+    assert not any('metin-0' in prompt or 'metin-1' in prompt for prompt in prompts)
+    assert any('metin-5' in prompt for prompt in prompts)
+
+    with open(output_file, encoding='utf-8') as f:
+        texts = [row['TEXT'] for row in csv.DictReader(f)]
+    assert texts == [f'metin-{i} Erdoğan konuştu' for i in range(6)]
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+İstek yedekleme testleri: kopyalar bütçeyi aşmaz, ısınmada ve boş slot
+yokken gönderilmez, kaybeden yanıt kapatılır
+"""
+
+import threading
+import time
+
+import pytest
+
+from request_hedging import RequestHedger
+
+STAGE = 'sentiment'
+
+
+class FakeBackend:
+    """Gecikmesi ayarlanabilen sahte HTTP denemesi"""
+
+    def __init__(self):
+        self.delays = []
+        self.default_delay = 0.001
+        self.sent = 0
+        self.discarded = []
+        self._lock = threading.Lock()
+
+    def send(self):
+        with self._lock:
+            self.sent += 1
+            attempt = self.sent
+            delay = self.delays.pop(0) if self.delays else self.default_delay
+        time.sleep(delay)
+        return attempt
+
+    def discard(self, response):
+        with self._lock:
+            self.discarded.append(response)
+
+
+@pytest.fixture
+def hedger():
+    hedger = RequestHedger(budget_pct=10, min_samples=5, min_delay_ms=5, max_workers=4)
+    yield hedger
+    hedger.close()
+
+
+def call(hedger, backend, try_slot=lambda: True):
+    return hedger.call(backend.send, STAGE, try_slot, lambda response: True, backend.discard)
+
+
+def warm_up(hedger, backend, calls=10):
+    for _ in range(calls):
+        call(hedger, backend)
+
+
+def test_no_hedges_before_min_samples(hedger):
+    backend = FakeBackend()
+    backend.default_delay = 0.02
+    for _ in range(hedger.min_samples):
+        call(hedger, backend)
+
+    stats = hedger.stats()
+    assert stats['requests'] == backend.sent == hedger.min_samples
+    assert stats['hedged'] == stats['skipped_budget'] == 0
+
+
+def test_hedges_never_exceed_budget():
+    # Geniş pencere hızlı örneklerle dolu: yavaş çağrılar p95'i yükseltmez
+    hedger = RequestHedger(budget_pct=10, min_samples=5, min_delay_ms=5, window=1000, max_workers=4)
+    for _ in range(1000):
+        hedger.latency.observe(STAGE, 0.001)
+
+    # Her çağrı eşiği aşar; bütçe olmasa hepsi kopyalanırdı
+    backend = FakeBackend()
+    backend.default_delay = 0.02
+    try:
+        for _ in range(30):
+            call(hedger, backend)
+            stats = hedger.stats()
+            assert stats['hedged'] <= hedger.budget * stats['requests']
+    finally:
+        hedger.close()
+
+    stats = hedger.stats()
+    assert (stats['requests'], stats['hedged'], stats['skipped_budget']) == (30, 3, 27)
+    assert stats['hedge_rate'] <= stats['budget_pct'] / 100
+    assert backend.sent == stats['requests'] + stats['hedged']
+
+
+def test_slow_primary_loses_to_hedge_and_is_discarded(hedger):
+    backend = FakeBackend()
+    warm_up(hedger, backend, calls=20)
+
+    backend.delays = [0.5, 0.001]
+    started = time.monotonic()
+    winner = call(hedger, backend)
+
+    assert time.monotonic() - started < 0.4
+    assert winner == backend.sent
+    assert hedger.stats()['hedge_wins'] == 1
+
+    # Terk edilen ilk deneme tamamlanınca yanıtı kapatılır
+    deadline = time.monotonic() + 2
+    while not backend.discarded and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert backend.discarded == [winner - 1]
+
+
+def test_hedge_without_free_slot_does_not_use_budget(hedger):
+    backend = FakeBackend()
+    warm_up(hedger, backend, calls=20)
+
+    backend.delays = [0.03]
+    call(hedger, backend, try_slot=lambda: False)
+
+    stats = hedger.stats()
+    assert (stats['hedged'], stats['skipped_no_slot']) == (0, 1)
+    assert backend.sent == 21
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Metin Ön İşleme - Türk Siyasi Lider Analiz Sistemi
+
+Prompt'a gömülmeden önce içerik metnini sadeleştiren ve token bütçesine
+göre kısaltan aşama. Boşluklar normalize edilir, URL'ler alan adına
+indirgenir, uzun @kullanıcı zincirleri ve tekrarlanan hashtag'ler
+daraltılır, aynı noktalama/emoji karakterinin uzun tekrarları kısaltılır.
+Token sayısı API'ye gitmeden yerel bir tahminciyle hesaplanır.
+"""
+
+import re
+from typing import NamedTuple, Optional
+
+# Türkçe eklemeli yapısı nedeniyle İngilizce'deki ~4 karakter/token'dan düşük
+CHARS_PER_TOKEN = 3.5
+
+# Art arda korunacak @kullanıcı sayısı (kalanlar "+N" olarak özetlenir)
+MAX_HANDLE_RUN = 3
+
+# Aynı karakterin korunacak maksimum tekrarı ("!!!!!!" -> "!!!")
+MAX_CHAR_REPEAT = 3
+
+TRUNCATION_MARK = ' …'
+
+_URL_RE = re.compile(r'(?:https?://|www\.)(?:www\.)?([^\s/?#]+)[^\s]*', re.IGNORECASE)
+_HANDLE_RUN_RE = re.compile(r'(?:@\w+[\s,]*){%d,}' % (MAX_HANDLE_RUN + 1))
+_HANDLE_RE = re.compile(r'@\w+')
+_HASHTAG_RE = re.compile(r'#\w+')
+# Yalnızca noktalama/emoji tekrarları; harf ve rakamlar (tutarlar, ID'ler) korunur
+_CHAR_REPEAT_RE = re.compile(r'([^\w\s])\1{%d,}' % MAX_CHAR_REPEAT)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class PreparedText(NamedTuple):
+    """Ön işlenmiş metin ve token bilgisi"""
+    text: str
+    tokens: int
+    original_tokens: int
+    truncated: bool
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Token sayısını yerel olarak tahmin et
+
+    Args:
+        text: Metin
+
+    Returns:
+        Tahmini token sayısı
+    """
+    if not text:
+        return 0
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def _collapse_handle_run(match) -> str:
+    handles = _HANDLE_RE.findall(match.group())
+    kept = ' '.join(handles[:MAX_HANDLE_RUN])
+    return f"{kept} (+{len(handles) - MAX_HANDLE_RUN}) "
+
+
+def _dedupe_hashtags(text: str) -> str:
+    seen = set()
+
+    def replace(match):
+        tag = match.group().lower()
+        if tag in seen:
+            return ''
+        seen.add(tag)
+        return match.group()
+
+    return _HASHTAG_RE.sub(replace, text)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Metni anlamı koruyarak sadeleştir
+
+    Args:
+        text: Ham içerik metni
+
+    Returns:
+        Normalize edilmiş metin
+
+    Örnekler (python -m doctest text_preprocess.py):
+        >>> normalize_text('Harika!!!!!!! 👏👏👏👏👏')
+        'Harika!!! 👏👏👏'
+        >>> normalize_text('İmamoğlu 1000000 TL harcadı, dosya no 2024000017')
+        'İmamoğlu 1000000 TL harcadı, dosya no 2024000017'
+        >>> normalize_text('Çoooook güzel')
+        'Çoooook güzel'
+    """
+    text = _URL_RE.sub(lambda m: f"[link:{m.group(1).lower()}]", text)
+    text = _HANDLE_RUN_RE.sub(_collapse_handle_run, text)
+    if text.count('#') > 1:
+        text = _dedupe_hashtags(text)
+    text = _CHAR_REPEAT_RE.sub(lambda m: m.group(1) * MAX_CHAR_REPEAT, text)
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def truncate_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Metni token bütçesine sığacak şekilde kelime sınırından kes
+
+    Args:
+        text: Metin
+        max_tokens: Maksimum token
+
+    Returns:
+        Kısaltılmış metin (gerekmiyorsa aynısı)
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    max_chars = max(int((max_tokens - 1) * CHARS_PER_TOKEN) - len(TRUNCATION_MARK), 1)
+    cut = text[:max_chars]
+    space = cut.rfind(' ')
+    if space > max_chars // 2:
+        cut = cut[:space]
+    return cut.rstrip() + TRUNCATION_MARK
+
+
+def prepare_text(text: str, max_tokens: Optional[int] = None,
+                 normalize: bool = True) -> PreparedText:
+    """
+    Prompt'a gömülecek metni hazırla
+
+    Args:
+        text: Ham içerik metni
+        max_tokens: Token bütçesi (None = kısaltma yok)
+        normalize: Normalizasyon uygulansın mı
+
+    Returns:
+        PreparedText
+    """
+    original_tokens = estimate_tokens(text)
+    prepared = normalize_text(text) if normalize else text
+
+    truncated = False
+    if max_tokens:
+        shortened = truncate_to_budget(prepared, max_tokens)
+        truncated = shortened is not prepared
+        prepared = shortened
+
+    return PreparedText(prepared, estimate_tokens(prepared), original_tokens, truncated)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Token ve Maliyet Takibi - Türk Siyasi Lider Analiz Sistemi
+
+Gemini yanıtlarındaki usageMetadata (prompt/candidate token sayıları)
+aşama (classification, sentiment, multi_sentiment) ve lider bazında
+toplanır; rapora tahmini maliyetle birlikte eklenir. Böylece batch,
+önbellek ve ön filtre stratejileri yalnızca süreyle değil kayıt başına
+token ile de karşılaştırılabilir.
+"""
+
+import threading
+from typing import Dict, Iterable, Optional
+
+# gemini-1.5-flash (≤128K prompt) liste fiyatları, USD / 1M token
+DEFAULT_PRICING = {
+    'input_per_million': 0.075,
+    'output_per_million': 0.30,
+}
+
+
+def _empty_bucket() -> Dict:
+    return {'calls': 0, 'prompt_tokens': 0, 'output_tokens': 0}
+
+
+class UsageTracker:
+    """Thread-safe token sayacı"""
+
+    def __init__(self, pricing: Optional[Dict[str, float]] = None):
+        """
+        Sayaç başlatıcı
+
+        Args:
+            pricing: {'input_per_million', 'output_per_million'} (USD)
+        """
+        self.pricing = dict(DEFAULT_PRICING, **(pricing or {}))
+        self._lock = threading.Lock()
+        self._row = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Sayaçları sıfırla"""
+        with self._lock:
+            self.total = _empty_bucket()
+            self.by_stage: Dict[str, Dict] = {}
+            self.by_leader: Dict[str, Dict] = {}
+            self.rows = 0
+
+    def record(self, stage: str, usage: Optional[Dict], leaders: Iterable[str] = ()):
+        """
+        Bir API yanıtının kullanımını ekle
+
+        Çok hedefli çağrılarda lider payı eşit bölünür.
+
+        Args:
+            stage: Aşama adı
+            usage: Yanıttaki usageMetadata
+            leaders: Çağrının ilgili olduğu lider kodları
+        """
+        usage = usage or {}
+        prompt_tokens = int(usage.get('promptTokenCount', 0))
+        output_tokens = int(usage.get('candidatesTokenCount', 0))
+        leaders = list(leaders)
+
+        with self._lock:
+            buckets = [self.total, self.by_stage.setdefault(stage, _empty_bucket())]
+            for bucket in buckets:
+                bucket['calls'] += 1
+                bucket['prompt_tokens'] += prompt_tokens
+                bucket['output_tokens'] += output_tokens
+
+            for code in leaders:
+                bucket = self.by_leader.setdefault(code, _empty_bucket())
+                bucket['calls'] += 1
+                bucket['prompt_tokens'] += prompt_tokens / len(leaders)
+                bucket['output_tokens'] += output_tokens / len(leaders)
+
+        row_usage = getattr(self._row, 'usage', None)
+        if row_usage is not None:
+            row_usage['prompt_tokens'] += prompt_tokens
+            row_usage['output_tokens'] += output_tokens
+
+    def start_row(self):
+        """Bu thread'de yeni bir kayıt için sayaç başlat"""
+        self._row.usage = {'prompt_tokens': 0, 'output_tokens': 0}
+
+    def finish_row(self) -> Dict:
+        """Bu thread'deki kaydın kullanımını döndür ve kayıt sayısını artır"""
+        row_usage = getattr(self._row, 'usage', None) or {'prompt_tokens': 0, 'output_tokens': 0}
+        self._row.usage = None
+        with self._lock:
+            self.rows += 1
+        return row_usage
+
+    def cost(self, prompt_tokens: float, output_tokens: float) -> float:
+        """Token sayılarından tahmini maliyet (USD)"""
+        return (prompt_tokens * self.pricing['input_per_million']
+                + output_tokens * self.pricing['output_per_million']) / 1_000_000
+
+    def _summarize(self, bucket: Dict) -> Dict:
+        return {
+            'calls': bucket['calls'],
+            'prompt_tokens': round(bucket['prompt_tokens']),
+            'output_tokens': round(bucket['output_tokens']),
+            'estimated_cost_usd': round(self.cost(bucket['prompt_tokens'], bucket['output_tokens']), 6)
+        }
+
+    def to_dict(self) -> Dict:
+        """Rapor bölümü"""
+        with self._lock:
+            total = self._summarize(self.total)
+            rows = self.rows
+            per_row = {
+                'prompt_tokens': round(self.total['prompt_tokens'] / rows, 1) if rows else 0,
+                'output_tokens': round(self.total['output_tokens'] / rows, 1) if rows else 0,
+                'calls': round(self.total['calls'] / rows, 2) if rows else 0,
+                'estimated_cost_usd': round(total['estimated_cost_usd'] / rows, 8) if rows else 0
+            }
+            return {
+                'pricing_usd_per_million': self.pricing,
+                'total': total,
+                'per_row': per_row,
+                'by_stage': {stage: self._summarize(b) for stage, b in self.by_stage.items()},
+                'by_leader': {code: self._summarize(b) for code, b in self.by_leader.items()}
+            }
@@ -16,8 +16,9 @@ import pandas as pd
 import plotly.express as px
 import json
 import io
-import time
 import os
+import hashlib
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
@@ -31,10 +32,20 @@ except ImportError:
 # Ana sistem sınıfını import et
 try:
     from political_analyzer import PoliticalAnalysisSystem
+    from leaders import load_leaders
+    from aggregates import LeaderAggregator, TREND_COLUMNS, trend_table
+    from exporters import write_csv_stream, write_excel_stream
+    from file_readers import get_file_ext, iter_record_chunks, estimate_total_rows
 except ImportError:
     st.error("❌ political_analyzer.py dosyası bulunamadı!")
     st.stop()
 
+# Takip edilen liderler (ANALYSIS_LEADERS_FILE ile değiştirilebilir)
+LEADER_REGISTRY = load_leaders()
+
+# Zaman sütunu olarak önerilen yaygın sütun adları
+TIMESTAMP_COLUMN_HINTS = ('DATE', 'TIME', 'CREATED_AT', 'TARIH', 'TARİH', 'ZAMAN')
+
 # Sayfa konfigürasyonu
 st.set_page_config(
     page_title="🇹🇷 Siyasi Analiz",
@@ -400,68 +411,132 @@ def get_secure_api_key():
     return None
 
 
-def read_file(uploaded_file):
-    """CSV/Excel dosyası oku"""
-    try:
-        file_ext = uploaded_file.name.lower().split('.')[-1]
+@st.cache_resource(show_spinner=False)
+def get_analyzer(api_key, **config):
+    """API anahtarı ve konfigürasyon başına tek (sıcak) analizör örneği"""
+    return PoliticalAnalysisSystem(api_key, **config)
 
-        if file_ext == 'csv':
-            df = pd.read_csv(uploaded_file, encoding='utf-8')
-        elif file_ext in ['xlsx', 'xls']:
-            df = pd.read_excel(uploaded_file)
-        else:
-            raise ValueError(f"Desteklenmeyen format: {file_ext}")
 
-        # Temizlik
-        df.columns = df.columns.str.strip()
-        df = df.dropna(subset=['TEXT'])
-        df = df[df['TEXT'].str.strip() != '']
+@st.cache_resource(show_spinner=False)
+def get_job_queue():
+    """İş kuyruğu (ANALYSIS_QUEUE_DB tanımlıysa harici worker'larla paylaşılır)"""
+    from job_queue import JobQueue, DEFAULT_DB_PATH
+    return JobQueue(DEFAULT_DB_PATH)
 
-        return df, file_ext
-    except Exception as e:
-        raise Exception(f"Dosya okuma hatası: {str(e)}")
+
+def uses_external_workers():
+    """İşler harici worker daemon'u tarafından mı yürütülüyor?"""
+    return bool(os.getenv('ANALYSIS_QUEUE_DB'))
+
+
+def ensure_local_workers(queue, api_key):
+    """Harici daemon yoksa process içi arka plan worker'larını başlat"""
+    from job_queue import start_background_workers
+
+    start_background_workers(
+        queue,
+        api_key,
+        num_workers=int(os.getenv('ANALYSIS_WEB_WORKERS', '2')),
+        config={'max_workers': 2, 'save_progress': False}
+    )
 
 
-def create_excel_output(df):
-    """Excel çıktısı oluştur"""
-    output = io.BytesIO()
+def save_upload_for_queue(uploaded_file, queue, file_hash, file_ext):
+    """Yüklenen dosyayı worker'ların akıtarak okuyabileceği şekilde diske kaydet"""
+    upload_dir = Path(queue.db_path).resolve().parent / 'uploads'
+    upload_dir.mkdir(parents=True, exist_ok=True)
 
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        # Ana sonuçlar
-        df.to_excel(writer, sheet_name='Sonuçlar', index=False)
+    # Aynı dosya tekrar gönderildiğinde mevcut kopya kullanılır
+    file_path = upload_dir / f"upload_{file_hash[:16]}.{file_ext}"
+    if not file_path.exists():
+        file_path.write_bytes(uploaded_file.getvalue())
+    return str(file_path)
 
-        # Özet istatistikler
-        leaders = ['RTE', 'ÖÖ', 'MY', 'EI']
-        names = ['R.T. Erdoğan', 'Ö. Özel', 'M. Yavaş', 'E. İmamoğlu']
 
-        summary = []
-        for leader, name in zip(leaders, names):
-            mentions = len(df[df[f'IS_{leader}'] == 1])
-            if mentions > 0:
-                sentiments = df[df[f'IS_{leader}'] == 1][f'{leader}_SENTIMENT']
-                pos = len(sentiments[sentiments == 1])
-                neg = len(sentiments[sentiments == -1])
-                neu = len(sentiments[sentiments == 0])
+# Yükleme sonrası gösterilecek önizleme satırı sayısı
+PREVIEW_ROWS = 5
 
-                summary.append({
-                    'Lider': name,
-                    'Bahsetme': mentions,
-                    'Pozitif': pos,
-                    'Nötr': neu,
-                    'Negatif': neg,
-                    'Pozitif %': round(pos / mentions * 100, 1) if mentions > 0 else 0
-                })
 
-        if summary:
-            pd.DataFrame(summary).to_excel(writer, sheet_name='Özet', index=False)
+def get_upload_hash(uploaded_file):
+    """Yüklenen dosyanın içerik hash'i (yükleme başına bir kez hesaplanır)"""
+    hashes = st.session_state.setdefault('upload_hashes', {})
+    if uploaded_file.file_id not in hashes:
+        hashes[uploaded_file.file_id] = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    return hashes[uploaded_file.file_id]
 
-    return output.getvalue()
+
+def read_file(uploaded_file):
+    """CSV/Excel dosyasını incele (içerik hash'ine göre önbellekli)"""
+    file_ext = get_file_ext(uploaded_file.name)
+    return inspect_upload(get_upload_hash(uploaded_file), file_ext, uploaded_file)
+
+
+@st.cache_data(show_spinner="Dosya okunuyor...", max_entries=8)
+def inspect_upload(file_hash, file_ext, _uploaded_file):
+    """
+    Yüklenen dosyanın yalnızca başlığını ve ilk satırlarını oku
+
+    Dosyanın tamamı burada ayrıştırılmaz; worker'lar dosyayı parça parça
+    okuyarak işler. file_hash önbellek anahtarıdır.
+
+    Returns:
+        (önizleme DataFrame'i, tahmini kayıt sayısı, uzantı)
+    """
+    try:
+        _uploaded_file.seek(0)
+        chunks = iter_record_chunks(_uploaded_file, file_ext, chunksize=PREVIEW_ROWS)
+        try:
+            preview = pd.DataFrame(next(chunks, []))
+        finally:
+            chunks.close()
+
+        _uploaded_file.seek(0)
+        estimated_rows = estimate_total_rows(_uploaded_file, file_ext)
+        _uploaded_file.seek(0)
+
+        return preview, estimated_rows, file_ext
+    except Exception as e:
+        raise Exception(f"Dosya okuma hatası: {str(e)}")
+
+
+@st.cache_resource(show_spinner="Dosya hazırlanıyor...", max_entries=4)
+def build_job_export(job_id, version, file_format, granularity='day'):
+    """
+    İş sonuçlarını dışa aktar (iş, sonuç sürümü ve biçim başına bir kez üretilir)
+
+    Sonuçlar kuyruktan parça parça okunur ve geçici dosyaya akıtılır; Excel
+    sabit bellekli modda yazılır. Bellekte yalnızca döndürülen bayt dizisi
+    tutulur. Excel'in trend sayfası grafikte seçilen zaman dilimiyle yazılır.
+    """
+    queue = get_job_queue()
+    job = queue.get_job(job_id)
+    rows = queue.iter_results(job_id)
+
+    if file_format == 'csv':
+        with tempfile.TemporaryFile() as tmp:
+            text = io.TextIOWrapper(tmp, encoding='utf-8', newline='')
+            write_csv_stream(text, rows)
+            text.detach()
+            tmp.seek(0)
+            return tmp.read()
+
+    # Eski işlerde akan özet yoksa tek geçişte hesapla
+    aggregates = job['aggregates']
+    if aggregates is None:
+        aggregator = LeaderAggregator(LEADER_REGISTRY.sentiment_columns)
+        aggregator.add_many(queue.iter_results(job_id))
+        aggregates = aggregator.to_dict()
+
+    with tempfile.TemporaryFile() as tmp:
+        write_excel_stream(tmp, rows, aggregates, granularity=granularity)
+        tmp.seek(0)
+        return tmp.read()
 
 
 def render_leader_card(leader_code, leader_name, result):
     """Lider sonuç kartı"""
     is_relevant = result.get(f'IS_{leader_code}', 0)
-    sentiment = result.get(f'{leader_code}_SENTIMENT', 0)
+    sentiment = result.get(LEADER_REGISTRY.sentiment_columns[leader_code], 0)
 
     # Durum belirleme
     if is_relevant == 1:
@@ -491,6 +566,151 @@ def render_leader_card(leader_code, leader_name, result):
     """, unsafe_allow_html=True)
 
 
+def render_metric_cards(aggregates, leaders):
+    """Akan özetten lider metrik kartları"""
+    leader_counts = (aggregates or {}).get('leaders', {})
+
+    st.markdown('<div class="metric-grid">', unsafe_allow_html=True)
+
+    for code, name in leaders.items():
+        counts = leader_counts.get(code, {})
+        mentions = counts.get('mentions', 0)
+
+        if mentions > 0:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-number">{mentions}</div>
+                <div class="metric-label">{name}</div>
+                <div class="metric-detail">+{counts.get('positive', 0)} -{counts.get('negative', 0)}</div>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-number">0</div>
+                <div class="metric-label">{name}</div>
+                <div class="metric-detail">Bahsetme yok</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_mention_chart(aggregates, leaders):
+    """Akan özetten lider bahsetme grafiği"""
+    leader_counts = (aggregates or {}).get('leaders', {})
+    mention_counts = [leader_counts.get(code, {}).get('mentions', 0) for code in leaders]
+
+    if any(count > 0 for count in mention_counts):
+        fig = px.bar(
+            x=list(leaders.values()),
+            y=mention_counts,
+            title="Lider Bahsetme Sayıları",
+            color=mention_counts,
+            color_continuous_scale="viridis"
+        )
+        fig.update_layout(
+            title_font_size=16,
+            showlegend=False,
+            height=400
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def guess_timestamp_column(columns):
+    """Önizleme sütunlarından zaman sütununu tahmin et (bulunamazsa None)"""
+    for column in columns:
+        name = str(column).upper()
+        if any(hint in name for hint in TIMESTAMP_COLUMN_HINTS):
+            return column
+    return None
+
+
+def render_trend_chart(aggregates, leaders, key):
+    """
+    Akan özetteki trend sayaçlarından lider sentiment seyri (sonuçlar yeniden taranmaz)
+
+    Returns:
+        Seçilen zaman dilimi ('hour' / 'day') veya trend yoksa None
+    """
+    trends = (aggregates or {}).get('trends')
+    if not trends or not trends.get('buckets'):
+        return None
+
+    col1, col2 = st.columns(2)
+    with col1:
+        granularity = st.radio("Zaman dilimi:", ['hour', 'day'], index=1, horizontal=True,
+                               format_func=lambda value: 'Saatlik' if value == 'hour' else 'Günlük',
+                               key=f"trend_granularity_{key}")
+    with col2:
+        metric = st.radio("Gösterge:", ['net_sentiment', 'mentions'], horizontal=True,
+                          format_func=lambda value: 'Net sentiment' if value == 'net_sentiment' else 'Bahsetme',
+                          key=f"trend_metric_{key}")
+
+    table = pd.DataFrame(trend_table(trends, granularity, list(leaders)), columns=TREND_COLUMNS)
+    if table.empty:
+        return granularity
+    table['leader'] = table['leader'].map(lambda code: leaders.get(code, code))
+
+    fig = px.line(
+        table, x='bucket', y=metric, color='leader', markers=True,
+        title="Lider Sentiment Seyri" if metric == 'net_sentiment' else "Lider Bahsetme Seyri",
+        labels={'bucket': '', 'leader': 'Lider', 'net_sentiment': '(pozitif - negatif) / bahsetme',
+                'mentions': 'Bahsetme'}
+    )
+    fig.update_layout(title_font_size=16, height=400)
+    st.plotly_chart(fig, use_container_width=True)
+
+    if trends.get('unparsed'):
+        st.caption(f"Zamanı okunamayan {trends['unparsed']:,} kayıt trende dahil edilmedi.")
+    return granularity
+
+
+def build_trend_csv(aggregates, granularity='hour'):
+    """Akan özetteki trend sayaçlarından CSV (sonuçlar yeniden taranmaz)"""
+    buffer = io.StringIO()
+    write_csv_stream(buffer, trend_table(aggregates['trends'], granularity), columns=TREND_COLUMNS)
+    return buffer.getvalue().encode('utf-8')
+
+
+def render_results_page(queue, job, page_size=50):
+    """Sonuç tablosunun yalnızca seçili sayfasını getir ve göster"""
+    total = job['result_count']
+    if not total:
+        return
+
+    pages = (total + page_size - 1) // page_size
+    page = st.number_input(f"Sayfa (toplam {pages:,}):", min_value=1, max_value=pages,
+                           value=1, key=f"page_{job['id']}")
+
+    rows = queue.get_results(job['id'], offset=(page - 1) * page_size, limit=page_size)
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+
+@st.fragment(run_every=2)
+def render_live_job(queue, job_id, leaders):
+    """Çalışan iş için kısmi sonuçları periyodik olarak güncelle"""
+    job = queue.get_job(job_id)
+    if not job:
+        return
+
+    total = job['total'] or 0
+    st.progress(
+        min(job['processed'] / total, 1.0) if total else 0.0,
+        text=f"⏳ {job['id']} işleniyor: {job['processed']:,}/{total:,} "
+             f"(sayfayı kapatıp daha sonra dönebilirsiniz)"
+    )
+
+    render_metric_cards(job['aggregates'], leaders)
+    render_mention_chart(job['aggregates'], leaders)
+    render_trend_chart(job['aggregates'], leaders, key=f"live_{job_id}")
+    render_results_page(queue, job)
+
+    # İş bittiğinde indirme seçenekleri için tüm sayfayı yenile
+    if job['status'] not in ('queued', 'running'):
+        st.rerun()
+
+
 def main():
     """Ana uygulama"""
 
@@ -532,13 +752,14 @@ export GOOGLE_API_KEY="your_api_key_here"
     if not api_key:
         st.stop()
 
+    # İş kuyruğu: toplu analizler arka planda çalışır, sonuçlar sunucuda saklanır
+    queue = get_job_queue()
+    external_workers = uses_external_workers()
+    if not external_workers:
+        ensure_local_workers(queue, api_key)
+
     # Lider tanımları
-    leaders = {
-        'RTE': 'R.T. Erdoğan',
-        'ÖÖ': 'Ö. Özel',
-        'MY': 'M. Yavaş',
-        'EI': 'E. İmamoğlu'
-    }
+    leaders = LEADER_REGISTRY.short_names
 
     # İşlem modu seçimi
     st.markdown("### İşlem Türü Seçin:")
@@ -575,17 +796,26 @@ export GOOGLE_API_KEY="your_api_key_here"
             else:
                 with st.spinner("Analiz yapılıyor..."):
                     try:
-                        analyzer = PoliticalAnalysisSystem(
-                            api_key,
-                            batch_size=1,
-                            max_workers=1,
-                            rate_limit_sec=1.5
-                        )
+                        account_name = account.strip() if account.strip() else "@anonymous"
+
+                        if external_workers:
+                            # Paylaşılan worker'lar üzerinden (öncelikli iş)
+                            job_id = queue.submit_text(account_name, content)
+                            job = queue.wait(job_id, timeout=120)
+                            job_results = queue.get_results(job_id) if job else []
+                            result = job_results[0] if job_results else None
+                        else:
+                            analyzer = get_analyzer(
+                                api_key,
+                                batch_size=1,
+                                max_workers=1,
+                                rate_limit_sec=1.5,
+                                priority='interactive',
+                                speculative_sentiment=True
+                            )
 
-                        result = analyzer.process_single_content(
-                            account.strip() if account.strip() else "@anonymous",
-                            content
-                        )
+                            # Eşzamanlı oturumların istekleri tek prompt'ta birleştirilir
+                            result = analyzer.analyze_coalesced(account_name, content).result(timeout=120)
 
                         if result:
                             st.markdown("""
@@ -595,9 +825,9 @@ export GOOGLE_API_KEY="your_api_key_here"
                             """, unsafe_allow_html=True)
 
                             # Sonuçları göster
-                            cols = st.columns(4)
+                            cols = st.columns(min(len(leaders), 4))
                             for i, (code, name) in enumerate(leaders.items()):
-                                with cols[i]:
+                                with cols[i % len(cols)]:
                                     render_leader_card(code, name, result)
                         else:
                             st.error("❌ Analiz başarısız!")
@@ -619,172 +849,156 @@ export GOOGLE_API_KEY="your_api_key_here"
 
         if uploaded_file:
             try:
-                df, file_type = read_file(uploaded_file)
+                preview_df, estimated_rows, file_type = read_file(uploaded_file)
+                rows_label = f"~{estimated_rows:,} kayıt" if estimated_rows is not None else "Dosya"
 
                 st.markdown(f"""
                 <div class="alert alert-info">
-                    📄 <strong>{len(df):,} kayıt yüklendi</strong>
+                    📄 <strong>{rows_label} yüklendi</strong>
                     <span style="float: right;">Format: {file_type.upper()}</span>
                 </div>
                 """, unsafe_allow_html=True)
 
-                # Sütun kontrolü
-                required = ['ACCOUNT_NAME', 'TEXT']
-                missing = [col for col in required if col not in df.columns]
-
-                if missing:
-                    st.error(f"❌ Eksik sütunlar: {', '.join(missing)}")
-                else:
-                    # Önizleme
-                    with st.expander("👀 Veri Önizleme"):
-                        st.dataframe(df.head(5), use_container_width=True)
-
-                    # Ayarlar
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        batch_size = st.selectbox("Batch Boyutu:", [1, 3, 5], index=1)
-                    with col2:
-                        rate_limit = st.selectbox("Hız Limiti (s):", [1.0, 1.5, 2.0], index=1)
-
-                    # Analiz butonu
-                    if st.button("🚀 Analizi Başlat"):
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-
-                        try:
-                            analyzer = PoliticalAnalysisSystem(
-                                api_key,
-                                batch_size=batch_size,
-                                max_workers=2,
-                                rate_limit_sec=rate_limit
-                            )
-
-                            data_records = df.to_dict('records')
-                            results = []
-                            total = len(data_records)
+                # Önizleme (sütunlar başlık satırında doğrulandı)
+                with st.expander("👀 Veri Önizleme"):
+                    st.dataframe(preview_df, use_container_width=True)
+
+                # Ayarlar
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    batch_size = st.selectbox("Batch Boyutu:", [1, 3, 5], index=1)
+                with col2:
+                    rate_limit = st.selectbox("Hız Limiti (s):", [1.0, 1.5, 2.0], index=1)
+                with col3:
+                    time_columns = [None] + [col for col in preview_df.columns if col not in ('ACCOUNT_NAME', 'TEXT')]
+                    guessed = guess_timestamp_column(time_columns[1:])
+                    timestamp_column = st.selectbox(
+                        "Zaman Sütunu:", time_columns,
+                        index=time_columns.index(guessed) if guessed else 0,
+                        format_func=lambda col: "Yok" if col is None else col,
+                        help="Seçilirse saatlik/günlük lider trendleri hesaplanır"
+                    )
+
+                # Analiz butonu: iş arka planda çalışır, sayfa kapatılabilir
+                if st.button("🚀 Analizi Başlat"):
+                    try:
+                        input_path = save_upload_for_queue(
+                            uploaded_file, queue, get_upload_hash(uploaded_file), file_type
+                        )
+                        job_id = queue.submit_file(
+                            input_path,
+                            config={'batch_size': batch_size, 'rate_limit_sec': rate_limit,
+                                    'timestamp_column': timestamp_column}
+                        )
+                        st.query_params['job'] = job_id
+                        st.rerun()
 
-                            # Batch işleme
-                            for i in range(0, total, batch_size):
-                                batch = data_records[i:i + batch_size]
-                                current_end = min(i + batch_size, total)
+                    except Exception as e:
+                        st.error(f"❌ Analiz hatası: {str(e)}")
 
-                                status_text.text(f"İşleniyor: {i + 1}-{current_end}/{total}")
+            except Exception as e:
+                st.error(f"❌ Dosya hatası: {str(e)}")
 
-                                batch_results = analyzer.process_batch_parallel(batch)
-                                results.extend(batch_results)
+        st.markdown('</div>', unsafe_allow_html=True)
 
-                                progress_bar.progress(current_end / total)
+        # Arka plan işleri
+        jobs = [job for job in queue.list_jobs(limit=10) if job['kind'] == 'file']
+        selected_job_id = st.query_params.get('job')
 
-                            # Sonuçları kaydet
-                            st.session_state.results = results
-                            st.session_state.results_df = pd.DataFrame(results)
+        if jobs:
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            st.subheader("📋 İşler")
+
+            for job in jobs:
+                total = job['total'] or 0
+                created = datetime.fromtimestamp(job['created_at']).strftime('%d.%m %H:%M')
+                col1, col2, col3 = st.columns([6, 2, 2])
+
+                with col1:
+                    st.progress(
+                        min(job['processed'] / total, 1.0) if total else 0.0,
+                        text=f"{created} • {job['id']} • {job['status']} • {job['processed']:,}/{total:,}"
+                    )
+                with col2:
+                    if st.button("👁️ Görüntüle", key=f"view_{job['id']}"):
+                        st.query_params['job'] = job['id']
+                        st.rerun()
+                with col3:
+                    if job['status'] in ('queued', 'running') and st.button("🛑 İptal", key=f"cancel_{job['id']}"):
+                        queue.cancel(job['id'])
+                        st.rerun()
 
-                            status_text.success("✅ Analiz tamamlandı!")
-                            time.sleep(1)
-                            st.rerun()
+            st.markdown('</div>', unsafe_allow_html=True)
 
-                        except Exception as e:
-                            st.error(f"❌ Analiz hatası: {str(e)}")
+        selected_job = queue.get_job(selected_job_id) if selected_job_id else None
 
-            except Exception as e:
-                st.error(f"❌ Dosya hatası: {str(e)}")
+        # Çalışan iş: kısmi sonuçlar canlı güncellenir
+        if selected_job and selected_job['status'] in ('queued', 'running'):
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            st.subheader("📊 Kısmi Sonuçlar")
+            render_live_job(queue, selected_job['id'], leaders)
+            st.markdown('</div>', unsafe_allow_html=True)
 
-        st.markdown('</div>', unsafe_allow_html=True)
+        if selected_job and selected_job['status'] == 'failed':
+            st.error(f"❌ Analiz hatası: {selected_job['error']}")
 
         # Sonuçları göster
-        if 'results' in st.session_state and st.session_state.results:
+        if selected_job and selected_job['status'] == 'done' and selected_job['result_count']:
             st.markdown('<div class="card">', unsafe_allow_html=True)
             st.subheader("📊 Sonuçlar")
 
-            results = st.session_state.results
-
-            # Özet metrikler
-            st.markdown('<div class="metric-grid">', unsafe_allow_html=True)
-
-            for code, name in leaders.items():
-                mentions = sum(1 for r in results if r.get(f'IS_{code}') == 1)
-
-                if mentions > 0:
-                    sentiments = [r.get(f'{code}_SENTIMENT', 0)
-                                  for r in results if r.get(f'IS_{code}') == 1]
-                    pos = sum(1 for s in sentiments if s == 1)
-                    neg = sum(1 for s in sentiments if s == -1)
-
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-number">{mentions}</div>
-                        <div class="metric-label">{name}</div>
-                        <div class="metric-detail">+{pos} -{neg}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-number">0</div>
-                        <div class="metric-label">{name}</div>
-                        <div class="metric-detail">Bahsetme yok</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-            st.markdown('</div>', unsafe_allow_html=True)
-
-            # Görsel analiz
-            mention_counts = [sum(1 for r in results if r.get(f'IS_{code}') == 1)
-                              for code in leaders.keys()]
-
-            if any(count > 0 for count in mention_counts):
-                fig = px.bar(
-                    x=list(leaders.values()),
-                    y=mention_counts,
-                    title="Lider Bahsetme Sayıları",
-                    color=mention_counts,
-                    color_continuous_scale="viridis"
-                )
-                fig.update_layout(
-                    title_font_size=16,
-                    showlegend=False,
-                    height=400
-                )
-                st.plotly_chart(fig, use_container_width=True)
+            render_metric_cards(selected_job['aggregates'], leaders)
+            render_mention_chart(selected_job['aggregates'], leaders)
+            granularity = render_trend_chart(selected_job['aggregates'], leaders, key=selected_job['id'])
+            render_results_page(queue, selected_job)
 
             # İndirme seçenekleri
             st.subheader("💾 İndir")
 
-            df_results = st.session_state.results_df
+            export_version = (selected_job['result_count'], selected_job['finished_at'])
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
             col1, col2 = st.columns(2)
 
             with col1:
-                csv_data = df_results.to_csv(index=False, encoding='utf-8')
                 st.download_button(
                     "📄 CSV İndir",
-                    csv_data,
+                    build_job_export(selected_job['id'], export_version, 'csv'),
                     f"analiz_{timestamp}.csv",
                     "text/csv",
                     use_container_width=True
                 )
 
             with col2:
-                excel_data = create_excel_output(df_results)
                 st.download_button(
                     "📊 Excel İndir",
-                    excel_data,
+                    build_job_export(selected_job['id'], export_version, 'xlsx', granularity or 'day'),
                     f"analiz_{timestamp}.xlsx",
                     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                     use_container_width=True
                 )
 
+            if granularity is not None:
+                # Grafikte seçilen zaman dilimiyle
+                st.download_button(
+                    f"📈 Trend CSV İndir ({'saatlik' if granularity == 'hour' else 'günlük'})",
+                    build_trend_csv(selected_job['aggregates'], granularity),
+                    f"analiz_trend_{granularity}_{timestamp}.csv",
+                    "text/csv",
+                    use_container_width=True
+                )
+
             st.markdown('</div>', unsafe_allow_html=True)
 
     # Sistem bilgisi
     with st.expander("ℹ️ Sistem Bilgisi"):
-        st.markdown("""
+        leader_lines = "\n".join(
+            f"        - **{leader.code}**: {leader.name}" + (f" ({leader.description})" if leader.description else "")
+            for leader in LEADER_REGISTRY
+        )
+        st.markdown(f"""
         **Liderler:**
-        - **RTE**: Recep Tayyip Erdoğan (Cumhurbaşkanı)
-        - **ÖÖ**: Özgür Özel (CHP Genel Başkanı)
-        - **MY**: Mansur Yavaş (Ankara Büyükşehir Belediye Başkanı)
-        - **EI**: Ekrem İmamoğlu (İstanbul Büyükşehir Belediye Başkanı)
+{leader_lines}
 
         **Değerler:**
         - **Sınıflandırma**: 1 (İlgili), 0 (İlgisiz)